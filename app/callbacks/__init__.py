@@ -1,5 +1,7 @@
 # File: app/callbacks/__init__.py
 
+from app.utils.event_sequence import stamp_event
+
 def register_all_callbacks(app, socketio):
     """
     Register all callbacks for the application
@@ -60,7 +62,7 @@ def register_socketio_handlers(socketio):
             data (dict): Order data
         """
         # Broadcast the new order to all connected clients
-        socketio.emit('order_update', data)
+        socketio.emit('order_update', stamp_event('order_update', data))
     
     @socketio.on('order_status_change')
     def handle_status_change(data):
@@ -71,7 +73,7 @@ def register_socketio_handlers(socketio):
             data (dict): Status data
         """
         # Broadcast the status change to all connected clients
-        socketio.emit('order_update', data)
+        socketio.emit('order_update', stamp_event('order_update', data))
     
     @socketio.on('robot_location_update')
     def handle_robot_update(data):
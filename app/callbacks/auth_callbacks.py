@@ -69,13 +69,32 @@ def register_callbacks(app):
 
     @app.callback(
     Output("user-store", "data", allow_duplicate=True),
-    [Input("socket-order-update", "children")],
+    [Input("socket-order-update", "children"),
+     Input("socket-resync", "data")],
     [State("user-store", "data")],
     prevent_initial_call=True
 )
-    def update_user_active_order(socket_update, current_user):
+    def update_user_active_order(socket_update, resync, current_user):
         """Update user's active order when a new order is received"""
-        if not socket_update or not current_user:
+        if not current_user:
+            return dash.no_update
+        
+        # Socket events were lost, take the latest order from the database
+        trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0] if callback_context.triggered else None
+        if trigger_id == "socket-resync":
+            try:
+                from app.data.database import get_orders_by_username
+                orders = get_orders_by_username(current_user.get('username'))
+            except Exception as e:
+                print(f"Error reloading user's active order: {e}")
+                return dash.no_update
+            if not orders or orders[0] == current_user.get('active_order'):
+                return dash.no_update
+            updated_user = dict(current_user)
+            updated_user['active_order'] = orders[0]
+            return updated_user
+        
+        if not socket_update:
             return dash.no_update
         
         try:
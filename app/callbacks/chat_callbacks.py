@@ -499,13 +499,18 @@ def register_callbacks(app, socketio):
     Output('current-order-status', 'children'),
     [
         Input('refresh-order-btn', 'n_clicks'),
-        Input('status-update-interval', 'n_intervals'),
-        Input('socket-order-update', 'children')
+        Input('socket-order-update', 'children'),
+        Input('socket-resync', 'data')
     ],
     [State('user-store', 'data')]
 )
-    def update_order_status(n_clicks, n_intervals, socket_update, user_data):
-        """Update the current order status display"""
+    def update_order_status(n_clicks, socket_update, resync, user_data):
+        """
+        Update the current order status display
+        
+        The panel is on every page, so it is driven by pushed order updates
+        and the refresh button instead of a page polling interval.
+        """
         ctx = callback_context
         triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
         
@@ -533,8 +538,9 @@ def register_callbacks(app, socketio):
             except Exception as e:
                 print(f"Error parsing order socket data: {e}")
         
-        # If no active order from socket, check user data
-        if not active_order and user_data and 'active_order' in user_data:
+        # If no active order from socket, check user data; after lost socket
+        # events the copy in user data may be stale, so go to the database
+        if not active_order and triggered_id != 'socket-resync' and user_data and 'active_order' in user_data:
             active_order = user_data.get('active_order')
         
         # If still no active order, check the most recent order in the database
@@ -1,6 +1,6 @@
 # File: app/callbacks/dashboard_callbacks.py
 
-from dash import Input, Output, State, callback_context, html, dcc
+from dash import Input, Output, State, callback_context, html, dcc, no_update
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,6 +9,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 from app.components.cards import order_card
+from app.utils.event_sequence import stamp_event
 
 def register_callbacks(app, socketio):
     """
@@ -19,22 +20,34 @@ def register_callbacks(app, socketio):
         socketio: SocketIO instance for real-time communication
     """
     @app.callback(
-        Output("sales-chart", "figure"),
-        [Input("status-update-interval", "n_intervals")]
+        [Output("sales-chart", "figure"), Output("sales-chart-version", "data")],
+        [Input("status-update-interval", "n_intervals")],
+        [State("sales-chart-version", "data")]
     )
-    def update_sales_chart(n_intervals):
-        """Update the sales chart with latest data"""
-        from app.components.charts import create_sales_chart
-        return create_sales_chart()
+    def update_sales_chart(n_intervals, client_version):
+        """Update the sales chart when the order data has changed"""
+        from app.components.charts import cached_chart
+        version, figure = cached_chart("sales")
+        
+        # The client already shows this version, send nothing
+        if version == client_version:
+            return no_update, no_update
+        return figure, version
     
     @app.callback(
-        Output("orders-chart", "figure"),
-        [Input("status-update-interval", "n_intervals")]
+        [Output("orders-chart", "figure"), Output("orders-chart-version", "data")],
+        [Input("status-update-interval", "n_intervals")],
+        [State("orders-chart-version", "data")]
     )
-    def update_orders_chart(n_intervals):
-        """Update the orders distribution chart with latest data"""
-        from app.components.charts import create_orders_chart
-        return create_orders_chart()
+    def update_orders_chart(n_intervals, client_version):
+        """Update the orders distribution chart when the order data has changed"""
+        from app.components.charts import cached_chart
+        version, figure = cached_chart("orders")
+        
+        # The client already shows this version, send nothing
+        if version == client_version:
+            return no_update, no_update
+        return figure, version
     
     @app.callback(
         Output("recent-orders-container", "children"),
@@ -236,4 +249,4 @@ def register_callbacks(app, socketio):
         
         # If it's a new order, also send order update
         if data.get('type') == 'new_order':
-            socketio.emit('order_update', data.get('order', {}))
\ No newline at end of file
+            socketio.emit('order_update', stamp_event('order_update', data.get('order', {})))
\ No newline at end of file
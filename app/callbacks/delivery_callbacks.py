@@ -8,6 +8,7 @@ import numpy as np
 import json
 import time
 from datetime import datetime
+from app.utils.robot_telemetry import telemetry
 
 def register_callbacks(app, socketio):
     """
@@ -17,14 +18,19 @@ def register_callbacks(app, socketio):
         app: Dash application instance
         socketio: SocketIO instance for real-time communication
     """
+    # Robot status comes from the shared telemetry pollers, which broadcast
+    # changes as robot_telemetry events (bridged into socket-robot-update)
+    telemetry.attach(socketio)
+    
     @app.callback(
     Output("robot-location-map", "figure"),
     [Input("status-update-interval", "n_intervals"),
-     Input("socket-order-update", "children")],  # Added to update when new orders come in
+     Input("socket-order-update", "children"),  # Added to update when new orders come in
+     Input("socket-robot-update", "children")],
     [State("delivery-update-store", "data"),
      State("user-store", "data")]  # Added user_store to check active orders
 )
-    def update_robot_map(n_intervals, socket_update, delivery_data, user_data):
+    def update_robot_map(n_intervals, socket_update, robot_update, delivery_data, user_data):
         """Update the robot location map with enhanced robot delivery integration"""
         # Create base map
         fig = go.Figure(go.Scattermapbox())
@@ -71,12 +77,10 @@ def register_callbacks(app, socketio):
         # If we have delivery data, plot the robot and route
         if active_delivery:
             try:
-                # Try to get real-time robot location from API
-                from app.utils.robot_api_utils import get_robot_delivery_status
-                
+                # Latest robot location from the shared telemetry cache
                 order_id = active_delivery.get("id") or active_delivery.get("order_id")
                 if order_id:
-                    status_result = get_robot_delivery_status(order_id=order_id)
+                    status_result = telemetry.snapshot(order_id) or {}
                     
                     if status_result.get("status") == "success" and status_result.get("data"):
                         robot_data = status_result["data"]
@@ -90,8 +94,9 @@ def register_callbacks(app, socketio):
                                 lat=[robot_location.get("lat", 37.7749)],
                                 lon=[robot_location.get("lng", -122.4194)],
                                 mode="markers",
-                                marker=dict(size=15, color="red"),
-                                name="Robot"
+                                # Grey while the robot API is down and this is the last known position
+                                marker=dict(size=15, color="gray" if status_result.get("stale") else "red"),
+                                name="Robot (last known)" if status_result.get("stale") else "Robot"
                             ))
                             
                             # Center map on robot
@@ -155,10 +160,11 @@ def register_callbacks(app, socketio):
     @app.callback(
     Output("robot-status-indicators", "children"),
     [Input("status-update-interval", "n_intervals"),
-     Input("socket-order-update", "children")],  # Added to update when new orders come in
+     Input("socket-order-update", "children"),  # Added to update when new orders come in
+     Input("socket-robot-update", "children")],
     [State("user-store", "data")]  # Added to check active orders
 )
-    def update_robot_status_indicators(n_intervals, socket_update, user_data):
+    def update_robot_status_indicators(n_intervals, socket_update, robot_update, user_data):
         """Update the robot status indicators with real data when available"""
         
         # Try to get active delivery information
@@ -185,14 +191,12 @@ def register_callbacks(app, socketio):
                 active_delivery = active_order
                 print(f"Using active order for delivery status: {active_order.get('id')}")
         
-        # If we have delivery data, get real-time status from API
+        # If we have delivery data, get real-time status from the telemetry cache
         if active_delivery:
             try:
-                from app.utils.robot_api_utils import get_robot_delivery_status
-                
                 order_id = active_delivery.get("id") or active_delivery.get("order_id")
                 if order_id:
-                    status_result = get_robot_delivery_status(order_id=order_id)
+                    status_result = telemetry.snapshot(order_id) or {}
                     
                     if status_result.get("status") == "success" and status_result.get("data"):
                         robot_data = status_result["data"]
@@ -8,6 +8,7 @@ import time
 from datetime import datetime
 from app.utils.api_utils import place_order, update_order_status
 from app.components.tables import create_order_items_table
+from app.data.pagination import encode_cursor
 
 import logging
 import sys
@@ -26,6 +27,9 @@ logging.basicConfig(
 logger = logging.getLogger('neo_cafe')
 logger.setLevel(logging.DEBUG)
 
+# Number of orders shown per page in the orders table
+ORDERS_PAGE_SIZE = 25
+
 def register_callbacks(app, socketio):
     """
     Register callbacks for order management
@@ -804,32 +808,94 @@ def register_callbacks(app, socketio):
     # Update this in app/callbacks/order_callbacks.py
 
     @app.callback(
-        Output("orders-table-container", "children"),
+        Output("orders-page-store", "data"),
+        [
+            Input("orders-next-page-btn", "n_clicks"),
+            Input("orders-prev-page-btn", "n_clicks"),
+            Input("order-filter", "value"),
+            Input("order-date-range", "start_date"),
+            Input("order-date-range", "end_date")
+        ],
+        [
+            State("orders-page-store", "data"),
+            State("orders-next-cursor-store", "data")
+        ],
+        prevent_initial_call=True
+    )
+    def update_orders_page(next_clicks, prev_clicks, filter_value, start_date, end_date,
+                           page_data, next_cursor):
+        """Move between order pages, starting over when the filters change"""
+        ctx = callback_context
+        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
+        
+        # Cursors of the pages visited so far, the first page has none
+        cursors = (page_data or {}).get("cursors", [None])
+        
+        if trigger_id == "orders-next-page-btn":
+            if not next_cursor:
+                return no_update
+            cursors = cursors + [next_cursor]
+        elif trigger_id == "orders-prev-page-btn":
+            if len(cursors) <= 1:
+                return no_update
+            cursors = cursors[:-1]
+        else:
+            cursors = [None]
+        
+        return {"cursors": cursors}
+    
+    @app.callback(
+        [
+            Output("orders-table-container", "children"),
+            Output("orders-next-cursor-store", "data"),
+            Output("orders-prev-page-btn", "disabled"),
+            Output("orders-next-page-btn", "disabled")
+        ],
         [
             Input("orders-update-interval", "n_intervals"),
             Input("order-status-store", "data"),
-            Input("order-filter", "value"),
-            Input("socket-order-update", "children")  # Added input for Socket.IO updates
+            Input("orders-page-store", "data"),
+            Input("socket-order-update", "children"),  # Added input for Socket.IO updates
+            Input("socket-resync", "data")  # Socket events were lost, reload the page
         ],
-        [State("user-store", "data")]  # Added user data to get current user
+        [
+            State("order-filter", "value"),
+            State("order-date-range", "start_date"),
+            State("order-date-range", "end_date"),
+            State("user-store", "data")  # Added user data to get current user
+        ]
     )
-    def update_orders_table(n_intervals, status_update, filter_value, socket_update, user_data):
-        """Update the orders table with latest orders"""
+    def update_orders_table(n_intervals, status_update, page_data, socket_update, resync,
+                            filter_value, start_date, end_date, user_data):
+        """Update the orders table with one page of the latest orders"""
         ctx = callback_context
         trigger_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
         
-        # Get orders from the database instead of using static data
+        # Current page cursor, the first page has none
+        cursors = (page_data or {}).get("cursors", [None])
+        after_cursor = cursors[-1]
+        is_first_page = len(cursors) <= 1
+        next_cursor = None
+        
+        # Get one page of orders from the database
         try:
-            from app.data.database import get_orders, get_orders_by_username
+            from app.data.database import query_orders
             
-            # If user is logged in, show their orders
-            if user_data and 'username' in user_data:
-                orders = get_orders_by_username(user_data['username'])
-                print(f"Loaded {len(orders)} orders for user {user_data['username']}")
-            else:
-                # For admin or demo, show all orders
-                orders = get_orders()
-                print(f"Loaded {len(orders)} orders (all users)")
+            status = filter_value if filter_value and filter_value != "All" else None
+            
+            # If user is logged in, show their orders, otherwise all orders (admin or demo)
+            username = user_data['username'] if user_data and 'username' in user_data else None
+            page = query_orders(
+                username=username,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+                limit=ORDERS_PAGE_SIZE,
+                after_cursor=after_cursor
+            )
+            orders = page["orders"]
+            next_cursor = page["next_cursor"]
+            print(f"Loaded {len(orders)} orders for {username or 'all users'}")
         except Exception as e:
             print(f"Error loading orders from database: {e}")
             # Fallback to static demo data if database query fails
@@ -848,7 +914,7 @@ def register_callbacks(app, socketio):
             ]
         
         # Check if we have an order update from socket
-        if trigger_id == "socket-order-update" and socket_update:
+        if trigger_id == "socket-order-update" and socket_update and is_first_page:
             try:
                 new_order = json.loads(socket_update)
                 
@@ -899,6 +965,11 @@ def register_callbacks(app, socketio):
                     # Add to orders list
                     orders.insert(0, new_order)
                     print(f"Added new order {new_order['id']} to table")
+                    
+                    # Keep the page at its size; the next page resumes after the new last row
+                    if len(orders) > ORDERS_PAGE_SIZE:
+                        del orders[ORDERS_PAGE_SIZE:]
+                        next_cursor = encode_cursor(orders[-1])
             except Exception as e:
                 print(f"Error processing socket order update: {e}")
         
@@ -1010,12 +1081,12 @@ def register_callbacks(app, socketio):
                 striped=True
             )
             
-            return table
+            return table, next_cursor, is_first_page, not next_cursor
         else:
             return html.Div(
                 dbc.Alert("No orders found matching the current filter.", color="info"),
                 className="text-center p-4"
-            )
+            ), next_cursor, is_first_page, not next_cursor
     
     @app.callback(
         Output("order-status-store", "data"),
@@ -2,54 +2,49 @@
 
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import date
+from app.components.figure_cache import FigureCache
 
-def create_sales_chart():
+# Colors for chart series, cycled in order
+SERIES_COLORS = ["#8B5A2B", "#C4A484", "#4682B4", "#7F9172", "#A67B5B", "#992800", "#2C1B0F"]
+
+def create_sales_chart(frame=None, days=7):
     """
     Create a sales overview chart
     
+    Args:
+        frame (OrderRollups/OrderFrame, optional): Aggregate source, the shared rollups if not provided
+        days (int): Number of trailing days to show
+        
     Returns:
         go.Figure: Plotly figure for the sales chart
     """
-    # Generate sample data for the last 7 days
-    dates = [(datetime.now() - timedelta(days=i)).strftime("%a %d") for i in range(6, -1, -1)]
-    
-    # Create sales data with some randomness but trending upward
-    coffee_sales = [round(np.random.normal(80, 10) + i * 5) for i in range(7)]
-    food_sales = [round(np.random.normal(50, 8) + i * 3) for i in range(7)]
+    if frame is None:
+        from app.data.database import rollups
+        frame = rollups
     
-    # Create DataFrame
-    df = pd.DataFrame({
-        "Date": dates,
-        "Coffee Sales": coffee_sales,
-        "Food Sales": food_sales,
-        "Total": [c + f for c, f in zip(coffee_sales, food_sales)]
-    })
+    # Revenue per day and category
+    df = frame.sales_by_day_and_category(days=days)
+    df = df.loc[:, df.sum(axis=0) > 0]
+    dates = [d.strftime("%a %d") for d in df.index]
+    totals = df.sum(axis=1)
     
     # Create the figure
     fig = go.Figure()
     
-    # Add bar traces
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=df["Coffee Sales"],
-        name="Coffee",
-        marker_color="#8B5A2B"
-    ))
-    
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=df["Food Sales"],
-        name="Food",
-        marker_color="#C4A484"
-    ))
+    # Add one bar trace per category
+    for i, category in enumerate(df.columns):
+        fig.add_trace(go.Bar(
+            x=dates,
+            y=df[category].round(2),
+            name=category.title(),
+            marker_color=SERIES_COLORS[i % len(SERIES_COLORS)]
+        ))
     
     # Add line trace for total
     fig.add_trace(go.Scatter(
         x=dates,
-        y=df["Total"],
+        y=totals.round(2),
         mode="lines+markers",
         name="Total",
         line=dict(color="#4682B4", width=3),
@@ -74,24 +69,32 @@ def create_sales_chart():
     
     return fig
 
-def create_orders_chart():
+def create_orders_chart(frame=None, days=None):
     """
     Create an order distribution pie chart
     
+    Args:
+        frame (OrderRollups/OrderFrame, optional): Aggregate source, the shared rollups if not provided
+        days (int, optional): Number of trailing days, all time if omitted
+        
     Returns:
         go.Figure: Plotly figure for the orders chart
     """
-    # Create sample data
-    categories = ["Dine In", "Takeaway", "Delivery", "Mobile Order"]
-    values = [42, 28, 15, 15]
-    colors = ["#8B5A2B", "#C4A484", "#4682B4", "#7F9172"]
+    if frame is None:
+        from app.data.database import rollups
+        frame = rollups
+    
+    # Order counts per sales channel
+    by_channel = frame.orders_by_channel(days=days)
+    by_channel = by_channel[by_channel["orders"] > 0]
+    total_orders = int(by_channel["orders"].sum())
     
     # Create the figure
     fig = go.Figure(data=[go.Pie(
-        labels=categories,
-        values=values,
+        labels=list(by_channel.index),
+        values=by_channel["orders"].tolist(),
         hole=.4,
-        marker_colors=colors
+        marker_colors=SERIES_COLORS[:len(by_channel)]
     )])
     
     # Update layout
@@ -105,11 +108,44 @@ def create_orders_chart():
             x=1
         ),
         margin=dict(l=20, r=20, t=30, b=20),
-        annotations=[dict(text="100<br>Orders", x=0.5, y=0.5, font_size=14, showarrow=False)]
+        annotations=[dict(text=f"{total_orders}<br>Orders", x=0.5, y=0.5, font_size=14, showarrow=False)]
     )
     
     return fig
 
+# Dashboard figures shared by every session, rebuilt only when orders change
+figure_cache = FigureCache()
+
+CACHED_CHARTS = {
+    "sales": create_sales_chart,
+    "orders": create_orders_chart
+}
+
+def chart_data_version():
+    """
+    Version of the data behind the dashboard charts
+
+    Includes today's date because the sales chart shows a trailing window.
+
+    Returns:
+        str: Version string
+    """
+    from app.data.database import rollups
+    return f"{date.today().isoformat()}:{rollups.version}"
+
+def cached_chart(name):
+    """
+    Get a shared dashboard chart for the current data version
+
+    Args:
+        name (str): Chart name, a key of CACHED_CHARTS
+
+    Returns:
+        tuple: (version, serialized figure)
+    """
+    version = chart_data_version()
+    return version, figure_cache.get(name, version, CACHED_CHARTS[name])
+
 def create_robot_location_map(robot_location=None, destination=None, route=None):
     """
     Create a map for robot location tracking
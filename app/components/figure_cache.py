@@ -0,0 +1,73 @@
+# File: app/components/figure_cache.py
+
+"""
+Server-side cache for figures shared by every dashboard session
+
+Each entry holds the figure built for one data version. All sessions asking
+for the same version get the same serialized figure, and only one thread
+builds a figure when the version changes.
+"""
+import threading
+
+class FigureCache:
+    """Figures keyed by name and data version"""
+
+    def __init__(self):
+        """Initialize FigureCache"""
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def _build_lock(self, name):
+        """
+        Get the lock serializing builds of one figure
+
+        Args:
+            name (str): Figure name
+
+        Returns:
+            threading.Lock: Build lock
+        """
+        with self._lock:
+            return self._build_locks.setdefault(name, threading.Lock())
+
+    def get(self, name, version, build):
+        """
+        Get a figure, building it only if the cached one is for another version
+
+        Args:
+            name (str): Figure name
+            version (str): Version of the data the figure is built from
+            build (callable): Returns a go.Figure or figure dict
+
+        Returns:
+            dict: Serialized figure
+        """
+        entry = self._entries.get(name)
+        if entry and entry[0] == version:
+            return entry[1]
+
+        with self._build_lock(name):
+            # Another session may have built it while we waited
+            entry = self._entries.get(name)
+            if entry and entry[0] == version:
+                return entry[1]
+
+            figure = build()
+            if hasattr(figure, "to_plotly_json"):
+                figure = figure.to_plotly_json()
+            self._entries[name] = (version, figure)
+            return figure
+
+    def invalidate(self, name=None):
+        """
+        Drop cached figures
+
+        Args:
+            name (str, optional): Figure to drop, all figures if omitted
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
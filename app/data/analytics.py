@@ -0,0 +1,285 @@
+# File: app/data/analytics.py
+
+"""
+Sales analytics for the Neo Cafe dashboard
+
+OrderFrame holds orders as columnar NumPy arrays (one row per order and one
+row per order line). Every aggregate is a masked ``np.bincount`` over integer
+codes, so its cost depends on the number of rows but not on how many groups
+are asked for, and no Python loop runs per order.
+
+Building a frame from order dicts is not vectorized: from_orders() flattens
+the nested records in a Python loop, a few microseconds per order, so it is
+meant for one-off analysis and the benchmark, not for every chart refresh.
+The dashboard charts read the incrementally maintained OrderRollups instead
+(app/data/rollups.py), which share channel_for() and line_values() with this
+module.
+"""
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+
+# Sales channels derived from the order's delivery type
+CHANNELS = ["Dine In", "Takeaway", "Delivery", "Robot Delivery", "Other"]
+
+# Category used for order lines that cannot be matched to a menu item
+UNKNOWN_CATEGORY = "other"
+
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+def channel_for(order):
+    """
+    Map an order to a sales channel
+
+    Args:
+        order (dict): Order data
+
+    Returns:
+        str: One of CHANNELS
+    """
+    delivery_type = str(order.get("delivery_type") or "").lower()
+    if "robot" in delivery_type:
+        return "Robot Delivery"
+    if "delivery" in delivery_type:
+        return "Delivery"
+    if "pickup" in delivery_type or "take" in delivery_type:
+        return "Takeaway"
+    if "dine" in delivery_type or str(order.get("delivery_location") or "").lower().startswith("table"):
+        return "Dine In"
+    return "Other"
+
+def to_day_number(value):
+    """
+    Convert a date to days since 1970-01-01
+
+    Args:
+        value (date/datetime/str): Date to convert
+
+    Returns:
+        int: Day number
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return int((np.datetime64(value, "D") - _EPOCH_DAY).astype(np.int64))
+
+def line_values(item, by_id, by_name):
+    """
+    Resolve the menu category and revenue of one order line
+
+    Args:
+        item (dict/str): Order line, or just an item name for bot orders
+        by_id (dict): Menu items by id
+        by_name (dict): Menu items by lowercase name
+
+    Returns:
+        tuple: (category, revenue)
+    """
+    if not isinstance(item, dict):
+        menu_item = by_name.get(str(item).lower())
+        quantity = 1
+        price = None
+    else:
+        menu_item = by_id.get(item.get("item_id", item.get("id")))
+        if menu_item is None:
+            menu_item = by_name.get(str(item.get("name", "")).lower())
+        quantity = item.get("quantity", 1) or 1
+        price = item.get("price")
+
+    if price is None:
+        price = menu_item.get("price", 0) if menu_item else 0
+    category = str(menu_item.get("category") or UNKNOWN_CATEGORY).lower() if menu_item else UNKNOWN_CATEGORY
+
+    return category, float(price) * float(quantity)
+
+class OrderFrame:
+    """Columnar view of orders and order lines"""
+
+    def __init__(self, order_day, order_total, order_channel, line_day, line_category,
+                 line_revenue, categories):
+        """
+        Initialize OrderFrame
+
+        Args:
+            order_day (np.ndarray): Day number per order (int32, -1 if unknown)
+            order_total (np.ndarray): Order total (float64)
+            order_channel (np.ndarray): Index into CHANNELS per order (int8)
+            line_day (np.ndarray): Day number per order line (int32)
+            line_category (np.ndarray): Index into categories per line (int16)
+            line_revenue (np.ndarray): Revenue per line (float64)
+            categories (list): Category names
+        """
+        self.order_day = order_day
+        self.order_total = order_total
+        self.order_channel = order_channel
+        self.line_day = line_day
+        self.line_category = line_category
+        self.line_revenue = line_revenue
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.order_day)
+
+    @classmethod
+    def from_orders(cls, orders, menu_items):
+        """
+        Build the frame from order dicts and the menu
+
+        Costs a Python pass over every order and line; do not call it per
+        chart refresh.
+
+        Args:
+            orders (list): Order data
+            menu_items (list): Menu items, used for line categories and prices
+
+        Returns:
+            OrderFrame: Columnar orders
+        """
+        by_id = {item.get("id"): item for item in menu_items}
+        by_name = {str(item.get("name", "")).lower(): item for item in menu_items}
+        categories = sorted({str(item.get("category") or UNKNOWN_CATEGORY).lower() for item in menu_items}
+                            | {UNKNOWN_CATEGORY})
+        category_index = {name: i for i, name in enumerate(categories)}
+        channel_index = {name: i for i, name in enumerate(CHANNELS)}
+
+        created = []
+        totals = []
+        channels = []
+        line_order = []
+        line_category = []
+        line_revenue = []
+
+        # One pass to flatten the nested records; everything after is vectorized
+        for position, order in enumerate(orders):
+            created.append(order.get("created_at"))
+            channels.append(channel_index[channel_for(order)])
+
+            computed_total = 0.0
+            for item in order.get("items") or []:
+                category, revenue = line_values(item, by_id, by_name)
+                computed_total += revenue
+                line_order.append(position)
+                line_category.append(category_index.get(category, category_index[UNKNOWN_CATEGORY]))
+                line_revenue.append(revenue)
+
+            total = order.get("total")
+            totals.append(float(total) if isinstance(total, (int, float)) else computed_total)
+
+        order_day = cls._parse_days(created)
+        line_order = np.asarray(line_order, dtype=np.int64)
+
+        return cls(
+            order_day=order_day,
+            order_total=np.asarray(totals, dtype=np.float64),
+            order_channel=np.asarray(channels, dtype=np.int8),
+            line_day=order_day[line_order] if len(line_order) else np.empty(0, dtype=np.int32),
+            line_category=np.asarray(line_category, dtype=np.int16),
+            line_revenue=np.asarray(line_revenue, dtype=np.float64),
+            categories=categories
+        )
+
+    @staticmethod
+    def _parse_days(created):
+        """
+        Parse created_at strings into day numbers in one vectorized call
+
+        Args:
+            created (list): created_at values
+
+        Returns:
+            np.ndarray: Day numbers (int32), -1 where the date is missing
+        """
+        if not created:
+            return np.empty(0, dtype=np.int32)
+
+        # Only the date part matters, which also sidesteps mixed separators
+        # ("2025-04-13T19:11" from the dashboard, "2025-04-13 19:11" from the bot)
+        day_strings = pd.Series(created, dtype="object").astype(str).str.slice(0, 10)
+        parsed = pd.to_datetime(day_strings, format="%Y-%m-%d", errors="coerce")
+        days = parsed.to_numpy(dtype="datetime64[D]")
+        valid = ~np.isnat(days)
+
+        result = np.full(len(days), -1, dtype=np.int32)
+        result[valid] = (days[valid] - _EPOCH_DAY).astype(np.int32)
+        return result
+
+    def _day_window(self, days, end_date):
+        """
+        Resolve a trailing window of days
+
+        Args:
+            days (int): Number of days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            tuple: (first day number, number of days)
+        """
+        end = to_day_number(end_date or date.today())
+        return end - days + 1, days
+
+    def sales_by_day_and_category(self, days=7, end_date=None):
+        """
+        Revenue per day and menu category
+
+        Args:
+            days (int): Number of trailing days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: One row per day, one column per category
+        """
+        start, days = self._day_window(days, end_date)
+        offset = self.line_day.astype(np.int64) - start
+        mask = (offset >= 0) & (offset < days)
+
+        n_categories = len(self.categories)
+        flat = offset[mask] * n_categories + self.line_category[mask]
+        sums = np.bincount(flat, weights=self.line_revenue[mask], minlength=days * n_categories)
+
+        index = pd.date_range(_EPOCH_DAY + np.timedelta64(start, "D"), periods=days, freq="D")
+        return pd.DataFrame(sums.reshape(days, n_categories), index=index, columns=self.categories)
+
+    def sales_by_day(self, days=7, end_date=None):
+        """
+        Revenue and order count per day
+
+        Args:
+            days (int): Number of trailing days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: Columns "revenue" and "orders", one row per day
+        """
+        start, days = self._day_window(days, end_date)
+        offset = self.order_day.astype(np.int64) - start
+        mask = (offset >= 0) & (offset < days)
+
+        revenue = np.bincount(offset[mask], weights=self.order_total[mask], minlength=days)
+        counts = np.bincount(offset[mask], minlength=days)
+
+        index = pd.date_range(_EPOCH_DAY + np.timedelta64(start, "D"), periods=days, freq="D")
+        return pd.DataFrame({"revenue": revenue, "orders": counts}, index=index)
+
+    def orders_by_channel(self, days=None, end_date=None):
+        """
+        Order count and revenue per sales channel
+
+        Args:
+            days (int, optional): Number of trailing days, all time if omitted
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: Columns "orders" and "revenue", indexed by channel
+        """
+        if days is None:
+            mask = slice(None)
+        else:
+            start, days = self._day_window(days, end_date)
+            offset = self.order_day.astype(np.int64) - start
+            mask = (offset >= 0) & (offset < days)
+
+        channel = self.order_channel[mask]
+        counts = np.bincount(channel, minlength=len(CHANNELS))
+        revenue = np.bincount(channel, weights=self.order_total[mask], minlength=len(CHANNELS))
+        return pd.DataFrame({"orders": counts, "revenue": revenue}, index=CHANNELS)
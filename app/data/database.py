@@ -6,10 +6,40 @@ import json
 import time
 from datetime import datetime
 from pathlib import Path
+from app.data.repository import Repository
+from app.data.order_store import OrderStore
+from app.data.order_journal import OrderJournal
+from app.data.pagination import DEFAULT_PAGE_SIZE
+from app.data.rollups import OrderRollups
+from app.utils.ids import new_order_id
 
 # Define data directory path
 DATA_DIR = Path(os.path.dirname(os.path.abspath(__file__))) / "seed_data"
 
+# Process-wide indexed cache of the JSON collections
+repository = Repository(DATA_DIR)
+repository.register("users.json", unique_keys=("id", "username"))
+repository.register("menu.json", unique_keys=("id",))
+repository.register("orders.json", unique_keys=("id",), group_keys=("username", "status"), keyset=True)
+
+# Order backend: "sqlite" (shared neo_cafe.db, default), "journal"
+# (orders.json snapshot plus append-only journal) or "json" (orders.json)
+ORDER_BACKEND = os.environ.get('ORDER_BACKEND', 'sqlite').lower()
+if ORDER_BACKEND == "sqlite":
+    order_store = OrderStore(seed_file=DATA_DIR / "orders.json")
+elif ORDER_BACKEND == "journal":
+    order_store = OrderJournal(DATA_DIR / "orders.json")
+else:
+    order_store = None
+
+# Dashboard aggregates, kept current by create_order/update_order and, for the
+# shared SQLite store, by triggers covering order_history writes from elsewhere
+rollups = OrderRollups(
+    load_orders=lambda: get_orders(),
+    load_menu=lambda: get_menu_items(),
+    load_order=(lambda order_id: get_order_by_id(order_id)) if ORDER_BACKEND == "sqlite" else None
+)
+
 def load_json_data(filename):
     """
     Load data from a JSON file
@@ -20,17 +50,7 @@ def load_json_data(filename):
     Returns:
         list/dict: The loaded data
     """
-    file_path = DATA_DIR / filename
-    
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Warning: {filename} not found in {DATA_DIR}")
-        return []
-    except json.JSONDecodeError:
-        print(f"Error: {filename} is not valid JSON")
-        return []
+    return repository.collection(filename).all()
 
 def save_json_data(data, filename):
     """
@@ -53,6 +73,9 @@ def save_json_data(data, filename):
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=2)
         
+        # Refresh the cached collection without re-reading the file
+        repository.collection(filename).replace(data)
+        
         return True
     except Exception as e:
         print(f"Error saving {filename}: {e}")
@@ -78,9 +101,7 @@ def get_user_by_username(username):
     Returns:
         dict/None: User data or None if not found
     """
-    users = get_users()
-    user = next((u for u in users if u["username"] == username), None)
-    return user
+    return repository.collection("users.json").get("username", username)
 
 def create_user(user_data):
     """
@@ -95,7 +116,7 @@ def create_user(user_data):
     users = get_users()
     
     # Check if username already exists
-    if any(u["username"] == user_data["username"] for u in users):
+    if repository.collection("users.json").contains("username", user_data["username"]):
         return False
     
     # Generate ID if not provided
@@ -161,8 +182,6 @@ def get_menu_item_by_id(item_id):
     Returns:
         dict/None: Item data or None if not found
     """
-    items = get_menu_items()
-    
     # Convert item_id to correct type
     try:
         if isinstance(item_id, str) and item_id.isdigit():
@@ -171,8 +190,7 @@ def get_menu_item_by_id(item_id):
         pass
     
     # Find item by ID
-    item = next((i for i in items if i["id"] == item_id), None)
-    return item
+    return repository.collection("menu.json").get("id", item_id)
 
 def create_menu_item(item_data):
     """
@@ -188,8 +206,8 @@ def create_menu_item(item_data):
     
     # Generate ID if not provided
     if "id" not in item_data:
-        # Find highest existing ID and increment
-        max_id = max([i["id"] for i in items], default=0)
+        # Find highest existing numeric ID and increment
+        max_id = max([i["id"] for i in items if isinstance(i["id"], int)], default=0)
         item_data["id"] = max_id + 1
     
     # Add to items list
@@ -240,6 +258,9 @@ def get_orders():
     Returns:
         list: List of orders
     """
+    if order_store is not None:
+        return order_store.get_all()
+    
     return load_json_data("orders.json")
 
 def get_order_by_id(order_id):
@@ -252,9 +273,10 @@ def get_order_by_id(order_id):
     Returns:
         dict/None: Order data or None if not found
     """
-    orders = get_orders()
-    order = next((o for o in orders if o["id"] == order_id), None)
-    return order
+    if order_store is not None:
+        return order_store.get(order_id)
+    
+    return repository.collection("orders.json").get("id", order_id)
 
 def create_order(order_data):
     """
@@ -266,12 +288,9 @@ def create_order(order_data):
     Returns:
         dict/None: Created order data or None if failed
     """
-    orders = get_orders()
-    
     # Generate ID if not provided
     if "id" not in order_data:
-        timestamp = int(time.time())
-        order_data["id"] = f"ORD-{timestamp}"
+        order_data["id"] = new_order_id()
     
     # Add created_at timestamp
     order_data["created_at"] = datetime.now().isoformat()
@@ -280,14 +299,19 @@ def create_order(order_data):
     if "status" not in order_data:
         order_data["status"] = "New"
     
-    # Add to orders list
-    orders.append(order_data)
-    
-    # Save updated orders list
-    if save_json_data(orders, "orders.json"):
-        return order_data
+    if order_store is not None:
+        created = order_data if order_store.insert(order_data) else None
+    else:
+        # Add to orders list
+        orders = get_orders()
+        orders.append(order_data)
+        
+        # Save updated orders list
+        created = order_data if save_json_data(orders, "orders.json") else None
     
-    return None
+    if created:
+        _update_rollups(created)
+    return created
 
 def update_order(order_id, updated_data):
     """
@@ -300,6 +324,12 @@ def update_order(order_id, updated_data):
     Returns:
         dict/None: Updated order data or None if failed
     """
+    if order_store is not None:
+        updated = order_store.update(order_id, updated_data)
+        if updated:
+            _update_rollups(updated)
+        return updated
+    
     orders = get_orders()
     
     # Find order by ID
@@ -313,11 +343,26 @@ def update_order(order_id, updated_data):
             
             # Save updated orders list
             if save_json_data(orders, "orders.json"):
+                _update_rollups(orders[i])
                 return orders[i]
     
     # Order not found
     return None
 
+def _update_rollups(order):
+    """
+    Fold a stored order into the dashboard rollups
+    
+    A rollup failure must never fail the order write itself.
+    
+    Args:
+        order (dict): Stored order data
+    """
+    try:
+        rollups.apply(order)
+    except Exception as e:
+        print(f"Error updating order rollups: {e}")
+
 def get_orders_by_username(username):
     """
     Get orders for a specific user
@@ -328,12 +373,56 @@ def get_orders_by_username(username):
     Returns:
         list: List of matching orders
     """
-    orders = get_orders()
+    if order_store is not None:
+        return order_store.get_by_username(username)
     
     # Filter orders by username
-    user_orders = [o for o in orders if o.get("username") == username]
+    user_orders = repository.collection("orders.json").filter("username", username)
     
     # Sort by date descending (newest first)
     user_orders.sort(key=lambda o: o.get("created_at", ""), reverse=True)
     
-    return user_orders
\ No newline at end of file
+    return user_orders
+
+def get_orders_by_status(status):
+    """
+    Get orders with a specific status
+    
+    Args:
+        status (str): Status to filter by
+        
+    Returns:
+        list: List of matching orders
+    """
+    if order_store is not None:
+        return order_store.get_by_status(status)
+    
+    return repository.collection("orders.json").filter("status", status)
+
+def query_orders(username=None, status=None, start_date=None, end_date=None,
+                 limit=DEFAULT_PAGE_SIZE, after_cursor=None):
+    """
+    Get one page of orders, newest first
+    
+    Uses keyset pagination: pass the returned next_cursor as after_cursor
+    to fetch the following page.
+    
+    Args:
+        username (str, optional): Only this user's orders
+        status (str, optional): Only orders with this status
+        start_date (str, optional): First day to include (YYYY-MM-DD)
+        end_date (str, optional): Last day to include (YYYY-MM-DD)
+        limit (int): Page size
+        after_cursor (str, optional): Cursor returned with the previous page
+        
+    Returns:
+        dict: {"orders": [...], "next_cursor": str or None}
+    """
+    if order_store is not None:
+        return order_store.query(username=username, status=status, start_date=start_date,
+                                 end_date=end_date, limit=limit, after_cursor=after_cursor)
+    
+    return repository.collection("orders.json").query(
+        username=username, status=status, start_date=start_date,
+        end_date=end_date, limit=limit, after_cursor=after_cursor
+    )
@@ -4,9 +4,9 @@
 Data models for Neo Cafe
 """
 from datetime import datetime
-import time
 import uuid
 from app.utils.auth_utils import hash_password
+from app.utils.ids import new_id, new_order_id
 
 class User:
     """User model"""
@@ -87,7 +87,7 @@ class MenuItem:
             category (str): Item category
             **kwargs: Additional item attributes
         """
-        self.id = kwargs.get("id", int(time.time()))
+        self.id = kwargs.get("id") or new_id("ITEM")
         self.name = name
         self.price = price
         self.description = description
@@ -155,7 +155,7 @@ class Order:
             username (str): Customer username
             **kwargs: Additional order attributes
         """
-        self.id = kwargs.get("id", f"ORD-{int(time.time())}")
+        self.id = kwargs.get("id") or new_order_id()
         self.items = items
         self.username = username
         self.total = kwargs.get("total", sum(item.get("price", 0) * item.get("quantity", 1) for item in items))
@@ -218,7 +218,7 @@ class Delivery:
             destination (dict): Destination coordinates
             **kwargs: Additional delivery attributes
         """
-        self.id = kwargs.get("id", f"DEL-{int(time.time())}")
+        self.id = kwargs.get("id") or new_id("DEL")
         self.order_id = order_id
         self.robot_id = robot_id
         self.destination = destination
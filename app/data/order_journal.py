@@ -0,0 +1,395 @@
+# File: app/data/order_journal.py
+
+"""
+Append-only order journal for Neo Cafe
+
+Each create/update appends one small JSON line to ``orders.journal.jsonl`` and
+fsyncs it, instead of rewriting the whole ``orders.json``. A background thread
+folds the journal into the ``orders.json`` snapshot once the journal passes a
+size threshold. State is always snapshot + replayed journal, so recovery after
+a crash is deterministic; a torn last line is ignored.
+
+The journal assumes a single writing process (the dashboard server). Other
+processes can read: new journal lines are tailed on every read.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from app.data.pagination import DEFAULT_PAGE_SIZE, KeysetIndex
+
+# Journal size that triggers a compaction
+COMPACT_THRESHOLD_BYTES = int(os.environ.get('ORDER_JOURNAL_COMPACT_BYTES', 1024 * 1024))
+
+class OrderJournal:
+    """Order persistence as a JSON snapshot plus an append-only journal"""
+
+    def __init__(self, snapshot_path, journal_path=None, compact_threshold=COMPACT_THRESHOLD_BYTES):
+        """
+        Initialize OrderJournal
+
+        Args:
+            snapshot_path (Path/str): Path to the orders.json snapshot
+            journal_path (Path/str, optional): Path to the journal file
+            compact_threshold (int): Journal size in bytes that triggers compaction
+        """
+        self.snapshot_path = str(snapshot_path)
+        self.journal_path = str(journal_path or os.path.splitext(self.snapshot_path)[0] + ".journal.jsonl")
+        self.rotated_path = self.journal_path + ".compacting"
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._orders = {}
+        self._by_username = {}
+        self._by_status = {}
+        self._keyset = KeysetIndex()
+        self._journal_inode = None
+        self._journal_offset = 0
+
+        self._compact_requested = threading.Event()
+        self._compactor = None
+
+    # ----- State -----
+
+    def _reset(self):
+        """Clear the in-memory state"""
+        self._orders = {}
+        self._by_username = {}
+        self._by_status = {}
+        self._keyset = KeysetIndex()
+
+    def _unindex(self, order):
+        """Remove an order from the secondary indexes"""
+        self._keyset.remove(order)
+        for index, key in ((self._by_username, "username"), (self._by_status, "status")):
+            ids = index.get(order.get(key))
+            if ids is not None:
+                ids.discard(order["id"])
+
+    def _index(self, order):
+        """Add an order to the secondary indexes"""
+        self._keyset.add(order)
+        self._by_username.setdefault(order.get("username"), set()).add(order["id"])
+        self._by_status.setdefault(order.get("status"), set()).add(order["id"])
+
+    def _apply(self, record):
+        """
+        Apply one journal record to the in-memory state
+
+        Args:
+            record (dict): Journal record
+        """
+        op = record.get("op")
+        if op == "create":
+            order = record["order"]
+        elif op == "update":
+            current = self._orders.get(record["id"])
+            if current is None:
+                return
+            order = {**current, **record["changes"]}
+            order["id"] = record["id"]
+        else:
+            return
+
+        previous = self._orders.get(order["id"])
+        if previous is not None:
+            self._unindex(previous)
+        self._orders[order["id"]] = order
+        self._index(order)
+
+    def _replay_file(self, path, start=0):
+        """
+        Replay journal lines from a file
+
+        Args:
+            path (str): Journal file
+            start (int): Byte offset to start from
+
+        Returns:
+            int: Offset just past the last complete line
+        """
+        try:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn write at the tail
+                        break
+                    offset += len(line)
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        print(f"Skipping invalid journal line in {path}")
+                return offset
+        except FileNotFoundError:
+            return start
+
+    def _load(self):
+        """Rebuild the in-memory state from snapshot and journals"""
+        self._reset()
+
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            snapshot = []
+
+        for order in snapshot if isinstance(snapshot, list) else []:
+            if isinstance(order, dict) and "id" in order:
+                self._apply({"op": "create", "order": order})
+
+        # A compaction that did not finish leaves its rotated journal behind
+        self._replay_file(self.rotated_path)
+
+        self._journal_inode = self._inode(self.journal_path)
+        self._journal_offset = self._replay_file(self.journal_path)
+        self._loaded = True
+
+        # Drop a torn tail so the next append starts on a clean line
+        try:
+            if os.path.getsize(self.journal_path) > self._journal_offset:
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(self._journal_offset)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _inode(path):
+        """Return the inode of a file, or None if missing"""
+        try:
+            return os.stat(path).st_ino
+        except OSError:
+            return None
+
+    def _catch_up(self):
+        """Load on first use, then tail any journal lines not seen yet"""
+        if not self._loaded:
+            self._load()
+            return
+
+        try:
+            stat = os.stat(self.journal_path)
+        except OSError:
+            stat = None
+
+        if stat is None:
+            if self._journal_inode is not None:
+                # Journal removed behind our back, start over
+                self._load()
+            return
+
+        if self._journal_inode is None and self._journal_offset == 0:
+            # First writes after a rotation created a fresh journal
+            self._journal_inode = stat.st_ino
+
+        if stat.st_ino != self._journal_inode or stat.st_size < self._journal_offset:
+            # Journal was rotated or replaced elsewhere, start over
+            self._load()
+        elif stat.st_size > self._journal_offset:
+            self._journal_offset = self._replay_file(self.journal_path, self._journal_offset)
+
+    # ----- Writes -----
+
+    def _append(self, record):
+        """
+        Append one record to the journal and fsync it
+
+        Args:
+            record (dict): Journal record
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+
+        with open(self.journal_path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        # Read the line back through the same path as recovery
+        self._catch_up()
+
+        if size >= self.compact_threshold:
+            self._request_compaction()
+
+    def insert(self, order):
+        """
+        Insert a new order
+
+        Args:
+            order (dict): Order data with id, status, and created_at set
+
+        Returns:
+            bool: Success status
+        """
+        with self._lock:
+            self._catch_up()
+            if order["id"] in self._orders:
+                print(f"Order {order['id']} already exists")
+                return False
+
+            self._append({"op": "create", "order": order})
+            return True
+
+    def update(self, order_id, updated_data):
+        """
+        Merge changes into an existing order
+
+        Args:
+            order_id (str): ID of order to update
+            updated_data (dict): Fields to change
+
+        Returns:
+            dict/None: Updated order data or None if not found
+        """
+        with self._lock:
+            self._catch_up()
+            if order_id not in self._orders:
+                return None
+
+            changes = {k: v for k, v in updated_data.items() if k != "id"}
+            changes["updated_at"] = datetime.now().isoformat()
+
+            self._append({"op": "update", "id": order_id, "changes": changes})
+            return dict(self._orders[order_id])
+
+    # ----- Reads -----
+
+    def get_all(self):
+        """
+        Get all orders in insertion order
+
+        Returns:
+            list: List of orders
+        """
+        with self._lock:
+            self._catch_up()
+            return [dict(o) for o in self._orders.values()]
+
+    def get(self, order_id):
+        """
+        Get an order by ID
+
+        Args:
+            order_id (str): Order ID
+
+        Returns:
+            dict/None: Order data or None if not found
+        """
+        with self._lock:
+            self._catch_up()
+            order = self._orders.get(order_id)
+            return dict(order) if order is not None else None
+
+    def get_by_username(self, username):
+        """
+        Get a user's orders, newest first
+
+        Args:
+            username (str): Username to filter by
+
+        Returns:
+            list: List of matching orders
+        """
+        with self._lock:
+            self._catch_up()
+            orders = [dict(self._orders[i]) for i in self._by_username.get(username, ())]
+
+        orders.sort(key=lambda o: o.get("created_at", ""), reverse=True)
+        return orders
+
+    def get_by_status(self, status):
+        """
+        Get orders with a given status
+
+        Args:
+            status (str): Status to filter by
+
+        Returns:
+            list: List of matching orders
+        """
+        with self._lock:
+            self._catch_up()
+            orders = [dict(self._orders[i]) for i in self._by_status.get(status, ())]
+
+        orders.sort(key=lambda o: o.get("created_at", ""))
+        return orders
+
+    def query(self, username=None, status=None, start_date=None, end_date=None,
+              limit=DEFAULT_PAGE_SIZE, after_cursor=None):
+        """
+        Get one page of orders, newest first, using keyset pagination
+
+        Args:
+            username (str, optional): Only this user's orders
+            status (str, optional): Only orders with this status
+            start_date (str, optional): First day to include (YYYY-MM-DD)
+            end_date (str, optional): Last day to include (YYYY-MM-DD)
+            limit (int): Page size
+            after_cursor (str, optional): Cursor returned with the previous page
+
+        Returns:
+            dict: {"orders": [...], "next_cursor": str or None}
+        """
+        with self._lock:
+            self._catch_up()
+            page = self._keyset.query(username=username, status=status, start_date=start_date,
+                                      end_date=end_date, limit=limit, after_cursor=after_cursor)
+            page["orders"] = [dict(o) for o in page["orders"]]
+        return page
+
+    # ----- Compaction -----
+
+    def _request_compaction(self):
+        """Wake the compactor thread, starting it on first use"""
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(target=self._compactor_loop, daemon=True)
+            self._compactor.start()
+        self._compact_requested.set()
+
+    def _compactor_loop(self):
+        """Background loop that compacts whenever it is woken"""
+        while True:
+            self._compact_requested.wait()
+            self._compact_requested.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Error compacting order journal: {e}")
+
+    def compact(self):
+        """
+        Fold the journal into the snapshot
+
+        The active journal is renamed aside under the lock so writers can keep
+        appending to a fresh file while the snapshot is written.
+
+        Returns:
+            bool: True if a compaction ran
+        """
+        with self._lock:
+            self._catch_up()
+
+            # A rotated journal left by an interrupted run is already in memory
+            if not os.path.exists(self.rotated_path):
+                if not os.path.exists(self.journal_path):
+                    return False
+                os.replace(self.journal_path, self.rotated_path)
+
+            snapshot = [dict(o) for o in self._orders.values()]
+            self._journal_inode = None
+            self._journal_offset = 0
+
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        with self._lock:
+            os.remove(self.rotated_path)
+
+        return True
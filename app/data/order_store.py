@@ -0,0 +1,403 @@
+# File: app/data/order_store.py
+
+"""
+SQLite-backed order store for Neo Cafe
+
+Orders live in the ``order_history`` table of the shared ``neo_cafe.db`` so the
+dashboard and the Chainlit bot read and write the same records. The Chainlit
+side only knows the original columns (order_id, user_id, items, status,
+created_at); the full dashboard record is kept in the ``data`` column and the
+shared columns always win when a row is read back.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from app.data.pagination import (
+    DEFAULT_PAGE_SIZE, clamp_limit, date_bounds, decode_cursor, encode_cursor
+)
+
+# Shared database at the project root, same default as chainlit_app/app.py
+DB_PATH = os.environ.get(
+    'DB_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'neo_cafe.db')
+)
+
+# Columns added on top of the original order_history schema
+EXTRA_COLUMNS = {
+    "username": "TEXT",
+    "delivery_location": "TEXT",
+    "updated_at": "TIMESTAMP",
+    "data": "TEXT"
+}
+
+class OrderStore:
+    """Order persistence on top of the shared SQLite database"""
+
+    def __init__(self, db_path=DB_PATH, seed_file=None):
+        """
+        Initialize OrderStore
+
+        Args:
+            db_path (str): Path to the SQLite database
+            seed_file (Path/str, optional): orders.json to import on first use
+        """
+        self.db_path = str(db_path)
+        self.seed_file = seed_file
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        """
+        Get the connection for the current thread
+
+        Returns:
+            sqlite3.Connection: Open connection
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+
+        if not self._schema_ready:
+            self._ensure_schema(conn)
+
+        return conn
+
+    def _ensure_schema(self, conn):
+        """Create the table, extra columns, and indexes if needed"""
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS order_history
+                            (order_id TEXT PRIMARY KEY,
+                             user_id TEXT,
+                             items TEXT,
+                             status TEXT,
+                             created_at TIMESTAMP)''')
+
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(order_history)")}
+            for column, column_type in EXTRA_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE order_history ADD COLUMN {column} {column_type}")
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_order_history_username ON order_history (username)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_order_history_user_id ON order_history (user_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_order_history_status ON order_history (status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_order_history_created_at ON order_history (created_at)")
+
+            # Composite indexes backing keyset pagination (newest first)
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_order_history_owner_created
+                            ON order_history (COALESCE(username, user_id), created_at, order_id)''')
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_order_history_status_created
+                            ON order_history (status, created_at, order_id)''')
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_order_history_created_id
+                            ON order_history (created_at, order_id)''')
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS store_meta
+                            (key TEXT PRIMARY KEY,
+                             value TEXT)''')
+
+            self._schema_ready = True
+
+        if self.seed_file:
+            self.import_from_json(self.seed_file)
+
+    @staticmethod
+    def _row_to_order(row):
+        """
+        Convert a database row to an order dict
+
+        Args:
+            row (sqlite3.Row): Row from order_history
+
+        Returns:
+            dict: Order data
+        """
+        order = {}
+        if row["data"]:
+            try:
+                order = json.loads(row["data"])
+            except json.JSONDecodeError:
+                order = {}
+
+        # Shared columns are authoritative, the bot only updates these
+        order["id"] = row["order_id"]
+        try:
+            order["items"] = json.loads(row["items"]) if row["items"] else []
+        except json.JSONDecodeError:
+            order["items"] = []
+        order["status"] = row["status"]
+
+        if row["created_at"] is not None:
+            order["created_at"] = str(row["created_at"])
+        if row["updated_at"] is not None:
+            order["updated_at"] = str(row["updated_at"])
+        if row["delivery_location"] and not order.get("delivery_location"):
+            order["delivery_location"] = row["delivery_location"]
+
+        username = row["username"] or row["user_id"]
+        if username and not order.get("username"):
+            order["username"] = username
+
+        return order
+
+    @staticmethod
+    def _order_params(order):
+        """
+        Build the column values for an order
+
+        Args:
+            order (dict): Order data
+
+        Returns:
+            tuple: Values in column order
+        """
+        username = order.get("username")
+        return (
+            order["id"],
+            order.get("user_id", username),
+            json.dumps(order.get("items", [])),
+            order.get("status"),
+            order.get("created_at"),
+            username,
+            order.get("delivery_location") if isinstance(order.get("delivery_location"), str) else None,
+            order.get("updated_at"),
+            json.dumps(order)
+        )
+
+    def get_all(self):
+        """
+        Get all orders in insertion order
+
+        Returns:
+            list: List of orders
+        """
+        rows = self._connect().execute("SELECT * FROM order_history ORDER BY rowid").fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def get(self, order_id):
+        """
+        Get an order by ID
+
+        Args:
+            order_id (str): Order ID
+
+        Returns:
+            dict/None: Order data or None if not found
+        """
+        row = self._connect().execute(
+            "SELECT * FROM order_history WHERE order_id = ?", (order_id,)
+        ).fetchone()
+        return self._row_to_order(row) if row else None
+
+    def get_by_username(self, username):
+        """
+        Get a user's orders, newest first
+
+        Args:
+            username (str): Username to filter by
+
+        Returns:
+            list: List of matching orders
+        """
+        rows = self._connect().execute(
+            '''SELECT * FROM order_history
+               WHERE COALESCE(username, user_id) = ?
+               ORDER BY created_at DESC, order_id DESC''',
+            (username,)
+        ).fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def get_by_status(self, status):
+        """
+        Get orders with a given status
+
+        Args:
+            status (str): Status to filter by
+
+        Returns:
+            list: List of matching orders
+        """
+        rows = self._connect().execute(
+            "SELECT * FROM order_history WHERE status = ? ORDER BY rowid", (status,)
+        ).fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def query(self, username=None, status=None, start_date=None, end_date=None,
+              limit=DEFAULT_PAGE_SIZE, after_cursor=None):
+        """
+        Get one page of orders, newest first, using keyset pagination
+
+        Args:
+            username (str, optional): Only this user's orders
+            status (str, optional): Only orders with this status
+            start_date (str, optional): First day to include (YYYY-MM-DD)
+            end_date (str, optional): Last day to include (YYYY-MM-DD)
+            limit (int): Page size
+            after_cursor (str, optional): Cursor returned with the previous page
+
+        Returns:
+            dict: {"orders": [...], "next_cursor": str or None}
+        """
+        limit = clamp_limit(limit)
+        lower, upper = date_bounds(start_date, end_date)
+        after = decode_cursor(after_cursor)
+
+        clauses = []
+        params = []
+        if username:
+            clauses.append("COALESCE(username, user_id) = ?")
+            params.append(username)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if lower:
+            clauses.append("created_at >= ?")
+            params.append(lower)
+        if upper:
+            clauses.append("created_at < ?")
+            params.append(upper)
+        if after:
+            clauses.append("(created_at < ? OR (created_at = ? AND order_id < ?))")
+            params.extend([after[0], after[0], after[1]])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f'''SELECT * FROM order_history {where}
+                ORDER BY created_at DESC, order_id DESC
+                LIMIT ?''',
+            params + [limit + 1]
+        ).fetchall()
+
+        orders = [self._row_to_order(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(orders[-1])
+
+        return {"orders": orders, "next_cursor": next_cursor}
+
+    def insert(self, order):
+        """
+        Insert a new order
+
+        Args:
+            order (dict): Order data with id, status, and created_at set
+
+        Returns:
+            bool: Success status
+        """
+        try:
+            self._connect().execute(
+                '''INSERT INTO order_history
+                   (order_id, user_id, items, status, created_at,
+                    username, delivery_location, updated_at, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                self._order_params(order)
+            )
+            return True
+        except sqlite3.IntegrityError:
+            print(f"Order {order['id']} already exists")
+            return False
+
+    def update(self, order_id, updated_data):
+        """
+        Merge changes into an existing order
+
+        The read-modify-write runs inside one write transaction so concurrent
+        writers cannot drop each other's changes.
+
+        Args:
+            order_id (str): ID of order to update
+            updated_data (dict): Fields to change
+
+        Returns:
+            dict/None: Updated order data or None if not found
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM order_history WHERE order_id = ?", (order_id,)
+            ).fetchone()
+            if not row:
+                conn.execute("ROLLBACK")
+                return None
+
+            order = {**self._row_to_order(row), **updated_data}
+            order["id"] = row["order_id"]  # Ensure ID doesn't change
+            order["updated_at"] = datetime.now().isoformat()
+
+            params = self._order_params(order)
+            conn.execute(
+                '''UPDATE order_history
+                   SET user_id = ?, items = ?, status = ?, created_at = ?,
+                       username = ?, delivery_location = ?, updated_at = ?, data = ?
+                   WHERE order_id = ?''',
+                params[1:] + (order_id,)
+            )
+            conn.execute("COMMIT")
+            return order
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def import_from_json(self, file_path):
+        """
+        Import orders from a JSON file once
+
+        The import is recorded in store_meta so later calls are no-ops, and
+        existing rows are never overwritten.
+
+        Args:
+            file_path (Path/str): Path to an orders.json file
+
+        Returns:
+            int: Number of orders imported
+        """
+        conn = self._connect()
+        marker = f"imported:{Path(file_path).resolve()}"
+        if conn.execute("SELECT 1 FROM store_meta WHERE key = ?", (marker,)).fetchone():
+            return 0
+
+        try:
+            with open(file_path, 'r') as f:
+                orders = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            orders = []
+
+        imported = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for order in orders if isinstance(orders, list) else []:
+                if not isinstance(order, dict) or "id" not in order:
+                    continue
+                cursor = conn.execute(
+                    '''INSERT OR IGNORE INTO order_history
+                       (order_id, user_id, items, status, created_at,
+                        username, delivery_location, updated_at, data)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    self._order_params(order)
+                )
+                imported += cursor.rowcount
+
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                (marker, datetime.now().isoformat())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if imported:
+            print(f"Imported {imported} orders from {file_path}")
+        return imported
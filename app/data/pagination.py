@@ -0,0 +1,233 @@
+# File: app/data/pagination.py
+
+"""
+Keyset pagination helpers for order queries
+
+Pages are ordered newest first by (created_at, id). A cursor is the key of
+the last order on a page, so the next page starts strictly after it no matter
+how many orders were added in the meantime.
+
+The in-memory backends keep their orders in a KeysetIndex, sorted by that
+key, so a page is a binary search plus a walk over the page itself instead
+of a scan of every order.
+"""
+import base64
+import bisect
+import json
+from datetime import date, datetime, timedelta
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(order):
+    """
+    Build the cursor pointing just past an order
+
+    Args:
+        order (dict): Last order of a page
+
+    Returns:
+        str: Opaque cursor
+    """
+    key = [str(order.get("created_at") or ""), str(order.get("id") or "")]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor (str): Opaque cursor
+
+    Returns:
+        tuple/None: (created_at, id) or None if the cursor is empty or invalid
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, order_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(order_id)
+    except (ValueError, TypeError):
+        print(f"Ignoring invalid order cursor: {cursor}")
+        return None
+
+def clamp_limit(limit):
+    """
+    Keep a page size within sane bounds
+
+    Args:
+        limit (int): Requested page size
+
+    Returns:
+        int: Page size between 1 and MAX_PAGE_SIZE
+    """
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def date_bounds(start_date=None, end_date=None):
+    """
+    Turn an inclusive date range into created_at string bounds
+
+    Args:
+        start_date (str/date, optional): First day to include (YYYY-MM-DD)
+        end_date (str/date, optional): Last day to include (YYYY-MM-DD)
+
+    Returns:
+        tuple: (lower bound or None, exclusive upper bound or None)
+    """
+    def to_date(value):
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.fromisoformat(str(value)[:10]).date()
+
+    lower = to_date(start_date)
+    upper = to_date(end_date)
+    return (
+        lower.isoformat() if lower else None,
+        (upper + timedelta(days=1)).isoformat() if upper else None
+    )
+
+def order_key(order):
+    """
+    Sort key used for pagination
+
+    Orders are ranked by created_at. The ID only breaks ties, since legacy
+    and snowflake IDs share the store and do not sort chronologically
+    against each other.
+
+    Args:
+        order (dict): Order data
+
+    Returns:
+        tuple: (created_at, id) as strings
+    """
+    return (str(order.get("created_at") or ""), str(order.get("id") or ""))
+
+class KeysetIndex:
+    """
+    Orders kept sorted by order_key, overall and per username and status
+
+    Not thread-safe; the owning store serializes access.
+    """
+
+    def __init__(self, group_keys=("username", "status")):
+        """
+        Initialize KeysetIndex
+
+        Args:
+            group_keys (tuple): Fields with their own sorted list
+        """
+        self.group_keys = tuple(group_keys)
+        self._keys = {None: []}  # None (all orders) or (field, value) -> sorted keys
+        self._orders = {}  # key -> order
+
+    def _lists(self, order):
+        """Sorted key lists an order belongs to"""
+        yield self._keys[None]
+        for field in self.group_keys:
+            try:
+                yield self._keys.setdefault((field, order.get(field)), [])
+            except TypeError:
+                continue
+
+    def rebuild(self, orders):
+        """
+        Replace the contents with a list of orders
+
+        Args:
+            orders (iterable): Orders to index
+        """
+        self._keys = {None: []}
+        self._orders = {}
+        for order in orders:
+            if isinstance(order, dict):
+                key = order_key(order)
+                self._orders[key] = order
+                for keys in self._lists(order):
+                    keys.append(key)
+        for keys in self._keys.values():
+            keys.sort()
+
+    def add(self, order):
+        """
+        Index an order; remove() its previous version first
+
+        Args:
+            order (dict): Order data
+        """
+        key = order_key(order)
+        self._orders[key] = order
+        for keys in self._lists(order):
+            bisect.insort(keys, key)
+
+    def remove(self, order):
+        """
+        Remove an order as it was indexed
+
+        Args:
+            order (dict): Order data as passed to add()
+        """
+        key = order_key(order)
+        if self._orders.pop(key, None) is None:
+            return
+        for keys in self._lists(order):
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    def query(self, username=None, status=None, start_date=None, end_date=None,
+              limit=DEFAULT_PAGE_SIZE, after_cursor=None):
+        """
+        Get one page of orders, newest first
+
+        Args:
+            username (str, optional): Only this user's orders
+            status (str, optional): Only orders with this status
+            start_date (str, optional): First day to include (YYYY-MM-DD)
+            end_date (str, optional): Last day to include (YYYY-MM-DD)
+            limit (int): Page size
+            after_cursor (str, optional): Cursor returned with the previous page
+
+        Returns:
+            dict: {"orders": [...], "next_cursor": str or None}, orders are
+                the indexed dicts themselves
+        """
+        limit = clamp_limit(limit)
+        lower, upper = date_bounds(start_date, end_date)
+        after = decode_cursor(after_cursor)
+
+        if username:
+            keys = self._keys.get(("username", username), [])
+        elif status:
+            keys = self._keys.get(("status", status), [])
+        else:
+            keys = self._keys[None]
+        check_status = bool(username and status)
+
+        # Walk down from just below the cursor and the end of the date range
+        position = len(keys)
+        if upper:
+            position = bisect.bisect_left(keys, (upper,))
+        if after:
+            position = min(position, bisect.bisect_left(keys, after))
+
+        page = []
+        while position > 0 and len(page) <= limit:
+            position -= 1
+            key = keys[position]
+            if lower and key[0] < lower:
+                break
+            order = self._orders[key]
+            if check_status and order.get("status") != status:
+                continue
+            page.append(order)
+
+        next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return {"orders": page[:limit], "next_cursor": next_cursor}
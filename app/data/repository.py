@@ -0,0 +1,265 @@
+# File: app/data/repository.py
+
+"""
+Indexed in-memory repository for the Neo Cafe JSON collections
+"""
+import json
+import os
+import threading
+from app.data.pagination import KeysetIndex
+
+# Signature marking a collection that has not been read yet
+_UNLOADED = object()
+
+def _copy_records(records):
+    """
+    Copy records one level deep so callers can modify the returned dicts
+    without touching the cached ones
+
+    Args:
+        records (list/dict): Records to copy
+
+    Returns:
+        list/dict: Copied records
+    """
+    if isinstance(records, list):
+        return [dict(r) if isinstance(r, dict) else r for r in records]
+    if isinstance(records, dict):
+        return dict(records)
+    return records
+
+class Collection:
+    """
+    A JSON collection loaded once and kept in memory with hash indexes.
+
+    The collection is reloaded whenever the file's mtime or size changes,
+    so edits made outside this process are still picked up.
+    """
+
+    def __init__(self, file_path, unique_keys=(), group_keys=(), keyset=False):
+        """
+        Initialize Collection
+
+        Args:
+            file_path (Path/str): Path to the JSON file
+            unique_keys (tuple): Fields indexed as key -> record
+            group_keys (tuple): Fields indexed as key -> list of records
+            keyset (bool): Also keep the records sorted for keyset pagination
+        """
+        self.file_path = file_path
+        self.unique_keys = tuple(unique_keys)
+        self.group_keys = tuple(group_keys)
+        self._lock = threading.RLock()
+        self._signature = _UNLOADED
+        self._records = []
+        self._unique = {key: {} for key in self.unique_keys}
+        self._groups = {key: {} for key in self.group_keys}
+        self._keyset = KeysetIndex(self.group_keys) if keyset else None
+
+    def _stat_signature(self):
+        """Return (mtime_ns, size) for the backing file, or None if missing"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_file(self):
+        """Read and parse the backing file"""
+        filename = os.path.basename(str(self.file_path))
+        try:
+            with open(self.file_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            print(f"Warning: {filename} not found in {os.path.dirname(str(self.file_path))}")
+            return []
+        except json.JSONDecodeError:
+            print(f"Error: {filename} is not valid JSON")
+            return []
+
+    def _rebuild(self, records, signature):
+        """Replace the cached records and rebuild every index"""
+        self._records = records
+        self._unique = {key: {} for key in self.unique_keys}
+        self._groups = {key: {} for key in self.group_keys}
+
+        if isinstance(records, list):
+            for record in records:
+                self._index_record(record)
+
+        if self._keyset is not None:
+            self._keyset.rebuild(records if isinstance(records, list) else [])
+
+        self._signature = signature
+
+    def _index_record(self, record):
+        """Add one record to the indexes"""
+        if not isinstance(record, dict):
+            return
+
+        for key in self.unique_keys:
+            if key in record:
+                self._unique[key][record[key]] = record
+
+        for key in self.group_keys:
+            if key in record:
+                self._groups[key].setdefault(record[key], []).append(record)
+
+    def _ensure_fresh(self):
+        """Reload the collection if the backing file has changed"""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+
+        records = self._read_file()
+        self._rebuild(records, signature)
+
+    def all(self):
+        """
+        Get every record in the collection
+
+        Returns:
+            list/dict: Copy of the loaded data
+        """
+        with self._lock:
+            self._ensure_fresh()
+            return _copy_records(self._records)
+
+    def get(self, key, value):
+        """
+        Look up a single record through a unique index
+
+        Args:
+            key (str): Indexed field name
+            value: Value to look for
+
+        Returns:
+            dict/None: Copy of the record or None if not found
+        """
+        with self._lock:
+            self._ensure_fresh()
+            try:
+                record = self._unique[key].get(value)
+            except TypeError:
+                return None
+            return dict(record) if record is not None else None
+
+    def filter(self, key, value):
+        """
+        Look up all records sharing a value through a group index
+
+        Args:
+            key (str): Indexed field name
+            value: Value to look for
+
+        Returns:
+            list: Copies of the matching records
+        """
+        with self._lock:
+            self._ensure_fresh()
+            try:
+                records = self._groups[key].get(value, [])
+            except TypeError:
+                return []
+            return _copy_records(records)
+
+    def contains(self, key, value):
+        """
+        Check whether a unique index contains a value
+
+        Args:
+            key (str): Indexed field name
+            value: Value to look for
+
+        Returns:
+            bool: True if a record exists
+        """
+        with self._lock:
+            self._ensure_fresh()
+            try:
+                return value in self._unique[key]
+            except TypeError:
+                return False
+
+    def query(self, **filters):
+        """
+        Get one keyset page of the records, newest first
+
+        Args:
+            **filters: Arguments of KeysetIndex.query()
+
+        Returns:
+            dict: {"orders": [...], "next_cursor": str or None} with copied records
+        """
+        with self._lock:
+            self._ensure_fresh()
+            if self._keyset is None:
+                raise ValueError(f"{os.path.basename(str(self.file_path))} has no keyset index")
+            page = self._keyset.query(**filters)
+            page["orders"] = _copy_records(page["orders"])
+            return page
+
+    def replace(self, records):
+        """
+        Replace the cached data after the backing file has been rewritten
+
+        Args:
+            records (list): Data that was just saved
+        """
+        with self._lock:
+            self._rebuild(_copy_records(records), self._stat_signature())
+
+    def invalidate(self):
+        """Force the next read to reload from disk"""
+        with self._lock:
+            self._signature = _UNLOADED
+
+class Repository:
+    """Process-wide registry of indexed JSON collections"""
+
+    def __init__(self, data_dir):
+        """
+        Initialize Repository
+
+        Args:
+            data_dir (Path): Directory holding the JSON files
+        """
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._collections = {}
+        self._index_specs = {}
+
+    def register(self, filename, unique_keys=(), group_keys=(), keyset=False):
+        """
+        Declare the indexes for a collection
+
+        Args:
+            filename (str): Name of the JSON file (without path)
+            unique_keys (tuple): Fields indexed as key -> record
+            group_keys (tuple): Fields indexed as key -> list of records
+            keyset (bool): Keep the records sorted for keyset pagination
+        """
+        with self._lock:
+            self._index_specs[filename] = (tuple(unique_keys), tuple(group_keys), keyset)
+            self._collections.pop(filename, None)
+
+    def collection(self, filename):
+        """
+        Get the collection for a file, creating it on first use
+
+        Args:
+            filename (str): Name of the JSON file (without path)
+
+        Returns:
+            Collection: The cached collection
+        """
+        with self._lock:
+            if filename not in self._collections:
+                unique_keys, group_keys, keyset = self._index_specs.get(filename, ((), (), False))
+                self._collections[filename] = Collection(
+                    self.data_dir / filename,
+                    unique_keys=unique_keys,
+                    group_keys=group_keys,
+                    keyset=keyset
+                )
+            return self._collections[filename]
@@ -0,0 +1,535 @@
+# File: app/data/rollups.py
+
+"""
+Incrementally maintained order rollups for the dashboard
+
+Every order contributes a handful of (bucket, key, value) entries: revenue and
+order count for its day and hour, one count for its status, delivery type and
+sales channel, and revenue per menu category for its day. When an order is
+created or changed only the difference between its previous and current
+contribution is applied, so an event costs a constant amount of work no matter
+how many orders exist. Counters and per-order contributions are persisted in
+the shared SQLite database, so a restart reloads the counters instead of
+rescanning every order.
+
+Orders also reach the shared ``order_history`` table without going through
+app.data.database: the Chainlit bot inserts and updates rows directly, and
+several processes share the file. When a single-order loader is given,
+triggers on ``order_history`` record every changed order id in
+``order_rollup_pending``. Reads fold those orders in first, and reload the
+counters when another process has changed them (the persisted change
+counter moved), so the dashboard does not drift from the table.
+"""
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import pandas as pd
+from app.data.analytics import CHANNELS, UNKNOWN_CATEGORY, channel_for, line_values
+from app.data.order_store import DB_PATH
+
+# Bump when the contribution format changes so persisted rollups are rebuilt
+ROLLUP_VERSION = "1"
+
+# Minimum seconds between menu reloads triggered by unknown order lines
+MENU_REFRESH_SECONDS = 30
+
+# Minimum seconds between checks for orders written outside this process
+SYNC_SECONDS = float(os.environ.get('ORDER_ROLLUPS_SYNC_SECONDS', '1'))
+
+# Triggers queueing every order_history change for the rollups
+PENDING_TRIGGERS = {
+    "order_rollup_pending_insert": "AFTER INSERT ON order_history BEGIN "
+                                   "INSERT INTO order_rollup_pending (order_id) VALUES (NEW.order_id); END",
+    "order_rollup_pending_update": "AFTER UPDATE ON order_history BEGIN "
+                                   "INSERT INTO order_rollup_pending (order_id) VALUES (NEW.order_id); END",
+    "order_rollup_pending_delete": "AFTER DELETE ON order_history BEGIN "
+                                   "INSERT INTO order_rollup_pending (order_id) VALUES (OLD.order_id); END"
+}
+
+class OrderRollups:
+    """Running aggregates over all orders"""
+
+    def __init__(self, db_path=DB_PATH, load_orders=None, load_menu=None, load_order=None,
+                 sync_seconds=SYNC_SECONDS):
+        """
+        Initialize OrderRollups
+
+        Args:
+            db_path (str): Path to the SQLite database used for persistence
+            load_orders (callable, optional): Returns all orders, used for a full rebuild
+            load_menu (callable, optional): Returns menu items, used for line categories
+            load_order (callable, optional): Returns one order by id or None; enables
+                tracking order_history writes made outside this process
+            sync_seconds (float): Minimum seconds between those checks
+        """
+        self.db_path = str(db_path)
+        self.load_orders = load_orders
+        self.load_menu = load_menu
+        self.load_order = load_order
+        self.sync_seconds = sync_seconds
+        self._lock = threading.RLock()
+        self._conn = None
+        self._counters = None
+        self._triggers_ready = False
+        self._synced_at = 0.0
+        self._menu_by_id = {}
+        self._menu_by_name = {}
+        self._menu_loaded_at = 0.0
+
+    def _connect(self):
+        """
+        Open the database and load the counters on first use
+
+        Returns:
+            sqlite3.Connection: Open connection (guarded by self._lock)
+        """
+        if self._conn is None:
+            conn = self._open()
+            if self._counters.get("meta", {}).get("version") != float(ROLLUP_VERSION):
+                self._rebuild(conn)
+        return self._conn
+
+    def _open(self):
+        """
+        Open the database, create the tables, and load the persisted counters
+
+        Returns:
+            sqlite3.Connection: Open connection
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        conn.execute('''CREATE TABLE IF NOT EXISTS order_rollups
+                        (bucket TEXT NOT NULL,
+                         key TEXT NOT NULL,
+                         value REAL NOT NULL,
+                         PRIMARY KEY (bucket, key))''')
+        conn.execute('''CREATE TABLE IF NOT EXISTS order_rollup_contributions
+                        (order_id TEXT PRIMARY KEY,
+                         data TEXT NOT NULL)''')
+
+        self._conn = conn
+        self._load_counters(conn)
+        return conn
+
+    def _load_counters(self, conn):
+        """Replace the in-memory counters with the persisted ones"""
+        counters = defaultdict(dict)
+        for bucket, key, value in conn.execute("SELECT bucket, key, value FROM order_rollups"):
+            counters[bucket][key] = value
+        self._counters = counters
+
+    def _ensure_triggers(self, conn):
+        """
+        Queue order_history changes for the rollups once the table exists
+
+        Args:
+            conn (sqlite3.Connection): Open connection
+
+        Returns:
+            bool: True if the triggers are in place
+        """
+        if self._triggers_ready:
+            return True
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'order_history'"
+        ).fetchone()
+        if not exists:
+            return False
+
+        conn.execute('''CREATE TABLE IF NOT EXISTS order_rollup_pending
+                        (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                         order_id TEXT NOT NULL)''')
+        for name, body in PENDING_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        self._triggers_ready = True
+        return True
+
+    def _sync(self, conn):
+        """
+        Catch up with order_history writes made elsewhere (caller holds self._lock)
+
+        Args:
+            conn (sqlite3.Connection): Open connection
+        """
+        if not self.load_order or time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        self._synced_at = time.monotonic()
+        if not self._ensure_triggers(conn):
+            return
+
+        # Another process applied changes, take its counters
+        row = conn.execute(
+            "SELECT value FROM order_rollups WHERE bucket = 'meta' AND key = 'changes'"
+        ).fetchone()
+        if row and row[0] != self._counters.get("meta", {}).get("changes"):
+            self._load_counters(conn)
+
+        pending = conn.execute("SELECT seq, order_id FROM order_rollup_pending ORDER BY seq").fetchall()
+        if not pending:
+            return
+        for order_id in dict.fromkeys(order_id for _, order_id in pending):
+            order = self.load_order(order_id)
+            self._apply_contribution(order_id, self._contribution(order) if order else {})
+        conn.execute("DELETE FROM order_rollup_pending WHERE seq <= ?", (pending[-1][0],))
+
+    def _refresh_menu(self):
+        """Rebuild the menu lookups used to categorize order lines"""
+        menu_items = self.load_menu() if self.load_menu else []
+        self._menu_by_id = {item.get("id"): item for item in menu_items}
+        self._menu_by_name = {str(item.get("name", "")).lower(): item for item in menu_items}
+        self._menu_loaded_at = time.monotonic()
+
+    def _line_values(self, item):
+        """
+        Categorize one order line, reloading the menu if the item is unknown
+
+        Args:
+            item (dict/str): Order line
+
+        Returns:
+            tuple: (category, revenue)
+        """
+        category, revenue = line_values(item, self._menu_by_id, self._menu_by_name)
+        stale = time.monotonic() - self._menu_loaded_at > MENU_REFRESH_SECONDS
+        if category == UNKNOWN_CATEGORY and self.load_menu and stale:
+            self._refresh_menu()
+            category, revenue = line_values(item, self._menu_by_id, self._menu_by_name)
+        return category, revenue
+
+    def _contribution(self, order):
+        """
+        Compute what one order adds to the rollups
+
+        Args:
+            order (dict): Order data
+
+        Returns:
+            dict: {"bucket|key": value}
+        """
+        created_at = str(order.get("created_at") or "")
+        day = created_at[:10]
+        hour = created_at[:13].replace(" ", "T")
+
+        computed_total = 0.0
+        category_revenue = defaultdict(float)
+        for item in order.get("items") or []:
+            category, revenue = self._line_values(item)
+            category_revenue[category] += revenue
+            computed_total += revenue
+
+        total = order.get("total")
+        total = float(total) if isinstance(total, (int, float)) else computed_total
+        channel = channel_for(order)
+
+        contribution = {
+            f"status|{order.get('status') or 'Unknown'}": 1,
+            f"delivery_type|{order.get('delivery_type') or 'unknown'}": 1,
+            f"channel|{channel}": 1,
+            "orders|all": 1,
+            "revenue|all": total
+        }
+        if day:
+            contribution[f"orders_day|{day}"] = 1
+            contribution[f"revenue_day|{day}"] = total
+            contribution[f"channel_day|{day}|{channel}"] = 1
+            for category, revenue in category_revenue.items():
+                contribution[f"category_day|{day}|{category}"] = revenue
+        if len(hour) == 13:
+            contribution[f"orders_hour|{hour}"] = 1
+            contribution[f"revenue_hour|{hour}"] = total
+
+        return contribution
+
+    def apply(self, order):
+        """
+        Fold a created or updated order into the rollups
+
+        Applying the same order twice is a no-op, so every write path can
+        call this without coordinating with the others.
+
+        Args:
+            order (dict): Full order data (must include id)
+
+        Returns:
+            bool: True if any counter changed
+        """
+        if not order or "id" not in order:
+            return False
+
+        with self._lock:
+            self._connect()
+            return self._apply_contribution(order["id"], self._contribution(order))
+
+    def _apply_contribution(self, order_id, new):
+        """
+        Replace an order's stored contribution (caller holds self._lock)
+
+        The previous contribution is read inside the write transaction, so
+        processes applying the same order concurrently count it once.
+
+        Args:
+            order_id (str): Order ID
+            new (dict): Contribution from _contribution(), empty for a deleted order
+
+        Returns:
+            bool: True if any counter changed
+        """
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM order_rollup_contributions WHERE order_id = ?", (order_id,)
+            ).fetchone()
+            old = json.loads(row[0]) if row else {}
+            if old == new:
+                conn.execute("COMMIT")
+                return False
+
+            delta = defaultdict(float)
+            for entry, value in old.items():
+                delta[entry] -= value
+            for entry, value in new.items():
+                delta[entry] += value
+            delta["meta|changes"] = 1
+
+            for entry, value in delta.items():
+                if value:
+                    self._add(conn, entry, value)
+            if new:
+                conn.execute(
+                    "INSERT OR REPLACE INTO order_rollup_contributions (order_id, data) VALUES (?, ?)",
+                    (order_id, json.dumps(new))
+                )
+            else:
+                conn.execute("DELETE FROM order_rollup_contributions WHERE order_id = ?", (order_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            # Memory may be ahead of the database now, reload from disk
+            self._conn = None
+            conn.close()
+            raise
+
+        return True
+
+    def _add(self, conn, entry, value):
+        """Add value to one counter in memory and in the database"""
+        bucket, key = entry.split("|", 1)
+        counter = self._counters[bucket]
+        counter[key] = counter.get(key, 0) + value
+        conn.execute(
+            '''INSERT INTO order_rollups (bucket, key, value) VALUES (?, ?, ?)
+               ON CONFLICT(bucket, key) DO UPDATE SET value = value + excluded.value''',
+            (bucket, key, value)
+        )
+
+    def rebuild(self):
+        """
+        Recompute the rollups from every order
+
+        Only needed on first start, after a format change, or if orders were
+        written to a backend the order_history triggers do not cover.
+
+        Returns:
+            int: Number of orders scanned
+        """
+        with self._lock:
+            conn = self._conn or self._open()
+            return self._rebuild(conn)
+
+    def _rebuild(self, conn):
+        """
+        Recompute and persist the rollups (caller holds self._lock)
+
+        Args:
+            conn (sqlite3.Connection): Open connection
+
+        Returns:
+            int: Number of orders scanned
+        """
+        orders = self.load_orders() if self.load_orders else []
+        self._refresh_menu()
+
+        changes = self._counters.get("meta", {}).get("changes", 0) if self._counters else 0
+        counters = defaultdict(dict)
+        contributions = []
+        for order in orders:
+            if "id" not in order:
+                continue
+            contribution = self._contribution(order)
+            contributions.append((order["id"], json.dumps(contribution)))
+            for entry, value in contribution.items():
+                bucket, key = entry.split("|", 1)
+                counters[bucket][key] = counters[bucket].get(key, 0) + value
+        counters["meta"]["version"] = float(ROLLUP_VERSION)
+        counters["meta"]["changes"] = changes + 1
+
+        pending_table = self._ensure_triggers(conn) if self.load_order else False
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM order_rollups")
+            conn.execute("DELETE FROM order_rollup_contributions")
+            if pending_table:
+                # The scan covers every queued change
+                conn.execute("DELETE FROM order_rollup_pending")
+            conn.executemany(
+                "INSERT INTO order_rollups (bucket, key, value) VALUES (?, ?, ?)",
+                [(bucket, key, value) for bucket, values in counters.items() for key, value in values.items()]
+            )
+            conn.executemany(
+                "INSERT INTO order_rollup_contributions (order_id, data) VALUES (?, ?)",
+                contributions
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._counters = counters
+        print(f"Rebuilt order rollups from {len(contributions)} orders")
+        return len(contributions)
+
+    @property
+    def version(self):
+        """
+        Data version, incremented whenever any counter changes
+
+        Returns:
+            int: Version number (survives restarts)
+        """
+        with self._lock:
+            self._sync(self._connect())
+            return int(self._counters.get("meta", {}).get("changes", 0))
+
+    def _bucket(self, bucket):
+        """
+        Get a snapshot of one bucket
+
+        Args:
+            bucket (str): Bucket name
+
+        Returns:
+            dict: {key: value}
+        """
+        with self._lock:
+            self._sync(self._connect())
+            return dict(self._counters.get(bucket, {}))
+
+    @staticmethod
+    def _days(days, end_date):
+        """
+        List the ISO dates of a trailing window
+
+        Args:
+            days (int): Number of days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            list: Dates as YYYY-MM-DD strings, oldest first
+        """
+        end = end_date or date.today()
+        if isinstance(end, datetime):
+            end = end.date()
+        return [(end - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+
+    def status_counts(self):
+        """
+        Order count per status
+
+        Returns:
+            dict: {status: count}
+        """
+        return {key: int(value) for key, value in self._bucket("status").items() if round(value)}
+
+    def delivery_type_counts(self):
+        """
+        Order count per delivery type
+
+        Returns:
+            dict: {delivery type: count}
+        """
+        return {key: int(value) for key, value in self._bucket("delivery_type").items() if round(value)}
+
+    def revenue_by_hour(self, day=None):
+        """
+        Revenue and order count per hour of one day
+
+        Args:
+            day (date/str, optional): Day to report, defaults to today
+
+        Returns:
+            pd.DataFrame: Columns "revenue" and "orders", one row per hour 0-23
+        """
+        day = str(day or date.today())[:10]
+        revenue = self._bucket("revenue_hour")
+        orders = self._bucket("orders_hour")
+        hours = [f"{day}T{hour:02d}" for hour in range(24)]
+        return pd.DataFrame({
+            "revenue": [round(revenue.get(hour, 0.0), 2) for hour in hours],
+            "orders": [int(orders.get(hour, 0)) for hour in hours]
+        }, index=range(24))
+
+    def sales_by_day(self, days=7, end_date=None):
+        """
+        Revenue and order count per day
+
+        Args:
+            days (int): Number of trailing days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: Columns "revenue" and "orders", one row per day
+        """
+        dates = self._days(days, end_date)
+        revenue = self._bucket("revenue_day")
+        orders = self._bucket("orders_day")
+        return pd.DataFrame({
+            "revenue": [revenue.get(day, 0.0) for day in dates],
+            "orders": [int(orders.get(day, 0)) for day in dates]
+        }, index=pd.to_datetime(dates))
+
+    def sales_by_day_and_category(self, days=7, end_date=None):
+        """
+        Revenue per day and menu category
+
+        Args:
+            days (int): Number of trailing days
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: One row per day, one column per category
+        """
+        dates = self._days(days, end_date)
+        by_day = self._bucket("category_day")
+        categories = sorted({key.split("|", 1)[1] for key in by_day} | {UNKNOWN_CATEGORY})
+        data = {
+            category: [by_day.get(f"{day}|{category}", 0.0) for day in dates]
+            for category in categories
+        }
+        return pd.DataFrame(data, index=pd.to_datetime(dates), columns=categories)
+
+    def orders_by_channel(self, days=None, end_date=None):
+        """
+        Order count per sales channel
+
+        Args:
+            days (int, optional): Number of trailing days, all time if omitted
+            end_date (date, optional): Last day, defaults to today
+
+        Returns:
+            pd.DataFrame: Column "orders", indexed by channel
+        """
+        if days is None:
+            channels = self._bucket("channel")
+            counts = [int(channels.get(channel, 0)) for channel in CHANNELS]
+        else:
+            by_day = self._bucket("channel_day")
+            dates = self._days(days, end_date)
+            counts = [int(sum(by_day.get(f"{day}|{channel}", 0) for day in dates)) for channel in CHANNELS]
+        return pd.DataFrame({"orders": counts}, index=CHANNELS)
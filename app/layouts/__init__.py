@@ -6,6 +6,9 @@ from app.layouts.footer import create_footer
 from app.components.modals import login_modal, signup_modal, signup_success_modal
 from app.components.floating_chat import create_floating_chat
 
+# Intervals defined by page layouts (dashboard, delivery, orders)
+PAGE_INTERVAL_IDS = ["status-update-interval", "orders-update-interval"]
+
 def create_main_layout():
     """
     Create the main layout structure for the app
@@ -24,31 +27,15 @@ def create_main_layout():
         dcc.Store(id='chat-auth-update', storage_type='memory'),
         # Add the following new elements:
         dcc.Store(id='socket-chat-update', storage_type='memory'),  # For socket updates
+        # Bumped by assets/js/socket_bridge.js when socket events may have been lost
+        dcc.Store(id='socket-resync', storage_type='memory'),
 
         dcc.Store(id='chat-auth-trigger', storage_type='memory'),
+        # Whether the browser tab is visible, set by assets/js/page_visibility.js
+        dcc.Store(id='page-visibility-store', storage_type='memory', data=True),
         html.Div(id='auth-status-listener', style={'display': 'none'}),
     ]
 
-    # Define an interval for periodic updates
-    intervals = [
-        dcc.Interval(
-            id='status-update-interval',
-            interval=5000,  # 5 seconds
-            n_intervals=0
-        ),
-        dcc.Interval(
-            id='orders-update-interval',
-            interval=10000,  # 10 seconds
-            n_intervals=0
-        ),
-        # Add client interval for checking navigation messages
-        dcc.Interval(
-            id='client-interval',
-            interval=1000,  # 1 second
-            n_intervals=0
-        )
-    ]
-
     # Create the floating chat component
     floating_chat = create_floating_chat()
 
@@ -89,64 +76,36 @@ def create_main_layout():
         
         
         
-        # Add stores and intervals
+        # Add stores (polling intervals belong to the page layouts)
         *stores,
-        *hidden_divs,
-        *intervals
+        *hidden_divs
     ])
     
     return layout
 
 def register_order_update_callback(app):
     """
-    Register the clientside callback for order updates
+    Register the clientside callbacks shared by every page
     This function should be called after the app is created
     
+    Order and cart updates from Socket.IO are written into
+    socket-order-update and socket-cart-update by assets/js/socket_bridge.js
+    when an event arrives, without any polling.
+    
     Args:
         app: The Dash app instance
     """
-    app.clientside_callback(
-        """
-        function(n) {
-            if (!window._orderUpdateListenerInitialized) {
-                window._orderUpdateListenerInitialized = true;
-                
-                // Listen for order updates from socket.io
-                if (window.socket) {
-                    window.socket.on('order_update', function(data) {
-                        console.log('Order update received:', data);
-                        window._lastOrderUpdate = JSON.stringify(data);
-                        
-                        // Trigger callback by returning data
-                        if (window._dashCallbacks) {
-                            window._dashCallbacks.forEach(callback => callback());
-                        }
-                    });
-                } else {
-                    // Wait for socket to be available
-                    window._socketInitInterval = setInterval(function() {
-                        if (window.socket) {
-                            window.socket.on('order_update', function(data) {
-                                console.log('Order update received:', data);
-                                window._lastOrderUpdate = JSON.stringify(data);
-                                
-                                // Trigger callback by returning data
-                                if (window._dashCallbacks) {
-                                    window._dashCallbacks.forEach(callback => callback());
-                                }
-                            });
-                            clearInterval(window._socketInitInterval);
-                        }
-                    }, 1000);
-                }
+    # Pause the polling intervals of the current page while the tab is hidden
+    for interval_id in PAGE_INTERVAL_IDS:
+        app.clientside_callback(
+            """
+            function(visible) {
+                return visible === false;
             }
-            
-            return window._lastOrderUpdate || null;
-        }
-        """,
-        Output("socket-order-update", "children"),
-        [Input("client-interval", "n_intervals")]
-    )
+            """,
+            Output(interval_id, "disabled"),
+            [Input("page-visibility-store", "data")]
+        )
 
     # Chat-auth listener: uses data property instead of className
     app.clientside_callback(
@@ -159,46 +118,3 @@ def register_order_update_callback(app):
         [Input("user-store", "data")],
         prevent_initial_call=True
     )
-
-    app.clientside_callback(
-    """
-    function(n) {
-        if (!window._cartUpdateListenerInitialized) {
-            window._cartUpdateListenerInitialized = true;
-            
-            // Listen for cart updates from socket.io
-            if (window.socket) {
-                window.socket.on('cart_update', function(data) {
-                    console.log('Cart update received:', data);
-                    window._lastCartUpdate = JSON.stringify(data);
-                    
-                    // Trigger callback by returning data
-                    if (window._dashCallbacks) {
-                        window._dashCallbacks.forEach(callback => callback());
-                    }
-                });
-            } else {
-                // Wait for socket to be available
-                window._socketCartInterval = setInterval(function() {
-                    if (window.socket) {
-                        window.socket.on('cart_update', function(data) {
-                            console.log('Cart update received:', data);
-                            window._lastCartUpdate = JSON.stringify(data);
-                            
-                            // Trigger callback by returning data
-                            if (window._dashCallbacks) {
-                                window._dashCallbacks.forEach(callback => callback());
-                            }
-                        });
-                        clearInterval(window._socketCartInterval);
-                    }
-                }, 1000);
-            }
-        }
-        
-        return window._lastCartUpdate || null;
-    }
-    """,
-    Output("socket-cart-update", "children"),
-    [Input("client-interval", "n_intervals")]
-)
\ No newline at end of file
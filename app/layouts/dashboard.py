@@ -6,7 +6,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from app.components.cards import summary_card, order_card
-from app.components.charts import create_sales_chart, create_orders_chart
+from app.components.charts import cached_chart
 
 def layout():
     """
@@ -53,7 +53,10 @@ def layout():
         ), md=3),
     ], className="mb-4")
     
-    # Charts row
+    # Charts row (figures come from the shared cache, versions let the
+    # update callbacks skip clients that are already current)
+    sales_version, sales_figure = cached_chart("sales")
+    orders_version, orders_figure = cached_chart("orders")
     charts_row = dbc.Row([
         dbc.Col([
             dbc.Card([
@@ -61,9 +64,10 @@ def layout():
                 dbc.CardBody([
                     dcc.Graph(
                         id='sales-chart',
-                        figure=create_sales_chart(),
+                        figure=sales_figure,
                         config={'displayModeBar': False}
-                    )
+                    ),
+                    dcc.Store(id='sales-chart-version', data=sales_version)
                 ])
             ])
         ], md=8),
@@ -73,9 +77,10 @@ def layout():
                 dbc.CardBody([
                     dcc.Graph(
                         id='orders-chart',
-                        figure=create_orders_chart(),
+                        figure=orders_figure,
                         config={'displayModeBar': False}
-                    )
+                    ),
+                    dcc.Store(id='orders-chart-version', data=orders_version)
                 ])
             ])
         ], md=4),
@@ -127,7 +132,19 @@ def layout():
         header,
         summary_row,
         charts_row,
-        bottom_row
+        bottom_row,
+        
+        # Polling for this page only (paused while the tab is hidden)
+        dcc.Interval(
+            id='status-update-interval',
+            interval=5000,  # 5 seconds
+            n_intervals=0
+        ),
+        dcc.Interval(
+            id='orders-update-interval',
+            interval=10000,  # 10 seconds
+            n_intervals=0
+        )
     ])
     
     return layout
\ No newline at end of file
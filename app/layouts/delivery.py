@@ -115,7 +115,17 @@ def layout():
         
         # Hidden stores for delivery data
         dcc.Store(id="delivery-data-store", storage_type="memory"),
-        dcc.Store(id="delivery-update-store", storage_type="memory")
+        dcc.Store(id="delivery-update-store", storage_type="memory"),
+        
+        # Robot telemetry pushed over Socket.IO (assets/js/socket_bridge.js)
+        html.Div(id="socket-robot-update", style={"display": "none"}),
+        
+        # Polling for this page only (paused while the tab is hidden)
+        dcc.Interval(
+            id="status-update-interval",
+            interval=5000,  # 5 seconds
+            n_intervals=0
+        )
     ])
     
     return layout
\ No newline at end of file
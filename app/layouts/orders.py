@@ -180,7 +180,26 @@ def layout():
                                 )
                             ], md=4)
                         ], className="mb-3"),
-                        html.Div(id="orders-table-container")
+                        html.Div(id="orders-table-container"),
+                        html.Div([
+                            dbc.Button(
+                                [html.I(className="fas fa-chevron-left me-1"), "Newer"],
+                                id="orders-prev-page-btn",
+                                color="secondary",
+                                size="sm",
+                                outline=True,
+                                className="me-2",
+                                disabled=True
+                            ),
+                            dbc.Button(
+                                ["Older", html.I(className="fas fa-chevron-right ms-1")],
+                                id="orders-next-page-btn",
+                                color="secondary",
+                                size="sm",
+                                outline=True,
+                                disabled=True
+                            )
+                        ], className="d-flex justify-content-end mt-2")
                     ])
                 ])
             ])
@@ -203,12 +222,19 @@ def layout():
         # Hidden stores
         dcc.Store(id="order-data-store", storage_type="session"),
         dcc.Store(id="order-status-store", storage_type="memory"),
+        dcc.Store(id="orders-page-store", storage_type="memory", data={"cursors": [None]}),
+        dcc.Store(id="orders-next-cursor-store", storage_type="memory"),
         
         # Hidden div for callback triggers
         html.Div(id="order-action-trigger", style={"display": "none"}),
         
-        # Hidden div for Socket.IO updates
-        html.Div(id="socket-order-update", style={"display": "none"})
+        # Polling for this page only (paused while the tab is hidden);
+        # Socket.IO order updates arrive in socket-order-update (main layout)
+        dcc.Interval(
+            id="orders-update-interval",
+            interval=10000,  # 10 seconds
+            n_intervals=0
+        )
     ])
     
     return layout
\ No newline at end of file
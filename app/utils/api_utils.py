@@ -1,58 +1,30 @@
 #  File: app/utils/api_utils.py
 
-import requests
 import json
 import os
-from functools import wraps
-import time
 import uuid
+from app.utils import http_client
 
 # Base URLs for APIs
 CHAINLIT_URL = os.environ.get('CHAINLIT_URL', 'http://localhost:8000')
 ROBOT_SIMULATOR_URL = os.environ.get('ROBOT_SIMULATOR_URL', 'http://localhost:8001')
 
-def retry_request(max_retries=3, backoff_factor=0.5):
-    """
-    Decorator to retry API requests with exponential backoff
-    
-    Args:
-        max_retries (int): Maximum number of retry attempts
-        backoff_factor (float): Backoff factor for retry timing
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            retries = 0
-            while retries < max_retries:
-                try:
-                    return func(*args, **kwargs)
-                except (requests.RequestException, ConnectionError) as e:
-                    retries += 1
-                    if retries >= max_retries:
-                        raise e
-                    # Calculate backoff time based on retry number
-                    backoff_time = backoff_factor * (2 ** (retries - 1))
-                    time.sleep(backoff_time)
-        return wrapper
-    return decorator
-
-@retry_request()
 def get_robot_status(order_id=None):
     """Get robot status for an order or general status"""
     try:
         if order_id:
-            response = requests.get(
+            response = http_client.get(
                 f"{ROBOT_SIMULATOR_URL}/api/delivery/{order_id}",
-                timeout=3
+                endpoint="robot.simulator"
             )
             
             if response.status_code == 200:
                 return response.json()
         
         # Get general robot status
-        response = requests.get(
+        response = http_client.get(
             f"{ROBOT_SIMULATOR_URL}/api/status",
-            timeout=3
+            endpoint="robot.simulator"
         )
         
         if response.status_code == 200:
@@ -69,14 +41,13 @@ def get_robot_status(order_id=None):
             "error": str(e)
         }
 
-@retry_request()
 def place_order(order_data):
     """Place an order via the API"""
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{ROBOT_SIMULATOR_URL}/api/place-order",
-            json=order_data,
-            timeout=5
+            endpoint="robot.simulator.order",
+            json=order_data
         )
         
         if response.status_code == 200:
@@ -93,14 +64,13 @@ def place_order(order_data):
             "error": str(e)
         }
 
-@retry_request()
 def update_order_status(order_id, new_status):
     """Update order status via the API"""
     try:
-        response = requests.put(
+        response = http_client.put(
             f"{ROBOT_SIMULATOR_URL}/api/orders/{order_id}/status",
-            json={"status": new_status},
-            timeout=3
+            endpoint="robot.simulator",
+            json={"status": new_status}
         )
         
         if response.status_code == 200:
@@ -117,7 +87,6 @@ def update_order_status(order_id, new_status):
             "error": str(e)
         }
 
-@retry_request()
 def send_message_to_chainlit(message, session_id=None):
     """
     Send a message to the Chainlit chatbot
@@ -0,0 +1,163 @@
+# File: app/utils/async_http_client.py
+
+"""
+asyncio counterpart of app/utils/http_client.py
+
+For code running on an event loop (the Chainlit app), where a blocking
+``requests`` call would stall every other session in the process. Calls
+use the same endpoint names, timeouts, retry policies, retry budgets and
+hooks as the sync client; connections are pooled by one
+``httpx.AsyncClient`` per event loop.
+"""
+import asyncio
+import httpx
+from app.utils.http_client import (ENDPOINT_TIMEOUTS, ENDPOINT_POLICIES, DEFAULT_TIMEOUT,
+                                   DEFAULT_POLICY, POOL_SIZE, RETRY_BUDGET_RATIO)
+from app.utils.resilience import RetryBudget, call_async
+
+def classify_httpx_error(error):
+    """
+    Say how far a failed httpx attempt got
+
+    Same rule as resilience.classify_requests_error(): refused connections,
+    failed name lookups and connect or pool timeouts never sent the request.
+
+    Args:
+        error (Exception): Error raised by the attempt
+
+    Returns:
+        str/None: "connect" if the connection never opened, "transport" if the
+            request may have reached the server, None if not worth retrying
+    """
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return "connect"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return None
+
+def to_httpx_timeout(timeout):
+    """
+    Convert a requests-style timeout to an httpx.Timeout
+
+    Args:
+        timeout (float/tuple): Seconds, or (connect, read)
+
+    Returns:
+        httpx.Timeout: Timeout
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+class AsyncHttpClient:
+    """Keep-alive asyncio HTTP client sharing the sync client's policies"""
+
+    def __init__(self, pool_size=POOL_SIZE, timeouts=None, policies=None):
+        """
+        Initialize AsyncHttpClient
+
+        Args:
+            pool_size (int): Connections kept alive per event loop
+            timeouts (dict, optional): Endpoint name -> (connect, read) timeout
+            policies (dict, optional): Endpoint name -> RetryPolicy
+        """
+        self.pool_size = pool_size
+        self.timeouts = dict(ENDPOINT_TIMEOUTS if timeouts is None else timeouts)
+        self.policies = dict(ENDPOINT_POLICIES if policies is None else policies)
+        self._budgets = {}
+        self._clients = {}
+
+    @property
+    def session(self):
+        """
+        Get the pooled client for the running event loop, creating it on first use
+
+        httpx connections belong to the loop that opened them, so each loop
+        gets its own client.
+
+        Returns:
+            httpx.AsyncClient: Shared client
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Forget clients of loops that have been closed
+            self._clients = {l: c for l, c in self._clients.items() if not l.is_closed()}
+            client = httpx.AsyncClient(limits=httpx.Limits(max_connections=self.pool_size,
+                                                           max_keepalive_connections=self.pool_size))
+            self._clients[loop] = client
+        return client
+
+    def timeout_for(self, endpoint):
+        """Get the (connect, read) timeout for an endpoint"""
+        return self.timeouts.get(endpoint, DEFAULT_TIMEOUT)
+
+    def policy_for(self, endpoint):
+        """Get the retry policy for an endpoint"""
+        return self.policies.get(endpoint, DEFAULT_POLICY)
+
+    def budget_for(self, endpoint):
+        """Get the retry budget for an endpoint, creating it on first use"""
+        budget = self._budgets.get(endpoint)
+        if budget is None:
+            budget = self._budgets.setdefault(endpoint, RetryBudget(ratio=RETRY_BUDGET_RATIO))
+        return budget
+
+    async def request(self, method, url, endpoint=None, **kwargs):
+        """
+        Send a request over a pooled connection, retrying per the endpoint policy
+
+        Args:
+            method (str): HTTP method
+            url (str): Full URL
+            endpoint (str, optional): Endpoint name used to pick the timeout and policy
+            **kwargs: Passed to httpx (params, json, headers, timeout, ...)
+
+        Returns:
+            httpx.Response: Response
+        """
+        timeout = kwargs.pop("timeout", None) or self.timeout_for(endpoint)
+        session = self.session
+
+        async def send(attempt_timeout):
+            return await session.request(method, url, timeout=to_httpx_timeout(attempt_timeout), **kwargs)
+
+        return await call_async(send, method, endpoint, timeout,
+                                policy=self.policy_for(endpoint),
+                                budget=self.budget_for(endpoint),
+                                errors=httpx.HTTPError,
+                                classify=classify_httpx_error)
+
+    async def get(self, url, endpoint=None, **kwargs):
+        """Send a GET request, see request()"""
+        return await self.request("GET", url, endpoint=endpoint, **kwargs)
+
+    async def post(self, url, endpoint=None, **kwargs):
+        """Send a POST request, see request()"""
+        return await self.request("POST", url, endpoint=endpoint, **kwargs)
+
+    async def put(self, url, endpoint=None, **kwargs):
+        """Send a PUT request, see request()"""
+        return await self.request("PUT", url, endpoint=endpoint, **kwargs)
+
+    async def close(self):
+        """Close the pooled connections of the running event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+# Process-wide client
+client = AsyncHttpClient()
+
+async def get(url, endpoint=None, **kwargs):
+    """Send a GET request with the shared client"""
+    return await client.get(url, endpoint=endpoint, **kwargs)
+
+async def post(url, endpoint=None, **kwargs):
+    """Send a POST request with the shared client"""
+    return await client.post(url, endpoint=endpoint, **kwargs)
+
+async def put(url, endpoint=None, **kwargs):
+    """Send a PUT request with the shared client"""
+    return await client.put(url, endpoint=endpoint, **kwargs)
@@ -0,0 +1,151 @@
+# File: app/utils/async_robot_client.py
+
+"""
+asyncio client for the robot delivery API, used by the Chainlit app
+
+Covers the robot operations the chatbot makes (start, status, cancel and
+the connection check) on top of app/utils/async_http_client.py, so they
+keep the endpoint timeouts and retry semantics of the sync code without
+blocking the event loop. Methods return the httpx response and leave the
+interpretation to the caller, like the sync call sites do.
+
+Calls go through the same circuit breaker as the sync robot API code
+(robot_api_utils.robot_breaker): while it is open they raise
+CircuitOpenError without touching the network.
+"""
+from app.utils import async_http_client
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.robot_api_utils import robot_breaker
+
+class AsyncRobotClient:
+    """Robot API operations as coroutines"""
+
+    def __init__(self, base_url, http=None, breaker=None):
+        """
+        Initialize AsyncRobotClient
+
+        Args:
+            base_url (str): Robot API root, e.g. http://localhost:8001
+            http (AsyncHttpClient, optional): HTTP client, the shared one by default
+            breaker (CircuitBreaker, optional): Breaker, the robot API one by default
+        """
+        self.base_url = base_url.rstrip("/")
+        self.http = http or async_http_client.client
+        self.breaker = breaker or robot_breaker
+
+    async def _request(self, method, url, **kwargs):
+        """
+        Send a request through the circuit breaker
+
+        Server errors and exceptions count as failures, any other response
+        as a success, the same as robot_api_utils._record_response().
+
+        Args:
+            method (str): HTTP method
+            url (str): Full URL
+            **kwargs: Passed to AsyncHttpClient.request()
+
+        Returns:
+            httpx.Response: Response
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.name, self.breaker.retry_in())
+        try:
+            response = await self.http.request(method, url, **kwargs)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def start_delivery(self, order_id, delivery_location, interface_name="en7",
+                             endpoint="robot.start", timeout=None):
+        """
+        Dispatch the robot for an order
+
+        Args:
+            order_id (str): Order ID
+            delivery_location (str): Delivery destination
+            interface_name (str): Network interface name for the robot
+            endpoint (str): Endpoint name; "robot.ping" for connection checks
+            timeout (float/tuple, optional): Override of the endpoint timeout
+
+        Returns:
+            httpx.Response: Response
+        """
+        payload = {
+            "interface_name": interface_name,
+            "order_id": order_id,
+            "delivery_location": delivery_location
+        }
+        return await self._request(
+            "POST",
+            f"{self.base_url}/api/delivery/start",
+            endpoint=endpoint,
+            headers={'Content-Type': 'application/json'},
+            json=payload,
+            timeout=timeout
+        )
+
+    async def get_status(self, endpoint="robot.simulator"):
+        """
+        Get the general robot status
+
+        Args:
+            endpoint (str): Endpoint name; "robot.ping" for connection checks
+
+        Returns:
+            httpx.Response: Response
+        """
+        return await self._request("GET", f"{self.base_url}/api/status", endpoint=endpoint)
+
+    async def get_delivery(self, order_id):
+        """
+        Get the delivery status of an order
+
+        Args:
+            order_id (str): Order ID
+
+        Returns:
+            httpx.Response: Response
+        """
+        return await self._request("GET", f"{self.base_url}/api/delivery/{order_id}", endpoint="robot.simulator")
+
+    async def cancel_delivery(self, order_id=None, delivery_id=None):
+        """
+        Cancel a delivery
+
+        Args:
+            order_id (str, optional): Order ID
+            delivery_id (str, optional): Delivery ID
+
+        Returns:
+            httpx.Response: Response
+        """
+        payload = {}
+        if delivery_id:
+            payload["delivery_id"] = delivery_id
+        if order_id:
+            payload["order_id"] = order_id
+        return await self._request(
+            "POST",
+            f"{self.base_url}/api/delivery/cancel",
+            endpoint="robot.cancel",
+            headers={'Content-Type': 'application/json'},
+            json=payload
+        )
+
+    async def ping(self):
+        """
+        Request the API root, the last resort of the connection check
+
+        Returns:
+            httpx.Response: Response
+        """
+        return await self._request("GET", self.base_url, endpoint="robot.ping")
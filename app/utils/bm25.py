@@ -0,0 +1,152 @@
+# File: app/utils/bm25.py
+
+"""
+In-process BM25 retriever for the chatbot knowledge base
+
+Works without network or embeddings, so it serves as the fallback when
+FAISS or the embedding backend fail, and as a standalone retriever offline.
+BM25 term weights do not depend on the query, so each posting stores its
+final weight at build time and a query only sums postings and picks the
+top k.
+"""
+import copy
+import heapq
+import math
+import re
+
+# Words too common in the documents to help ranking
+STOPWORDS = frozenset("""
+a an and are as at be by can do for from have how i if in is it its me my of on or our please
+so that the their there this to us was we what when where which with you your
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """
+    Split text into lowercase terms without stopwords
+
+    Args:
+        text (str): Text
+
+    Returns:
+        list: Terms
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+class Document:
+    """Search result with the attributes LangChain documents have"""
+
+    def __init__(self, page_content, metadata=None):
+        self.page_content = page_content
+        self.metadata = metadata or {}
+
+    def __repr__(self):
+        return f"Document({self.page_content[:40]!r}, {self.metadata})"
+
+class BM25Retriever:
+    """Okapi BM25 over a fixed list of documents"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        """
+        Initialize BM25Retriever and precompute the term weights
+
+        Args:
+            documents (list): Document texts
+            k1 (float): Term frequency saturation
+            b (float): Length normalization
+        """
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self.default_k = 4
+
+        term_counts = []
+        doc_freq = {}
+        for text in self.documents:
+            counts = {}
+            for term in tokenize(text):
+                counts[term] = counts.get(term, 0) + 1
+            term_counts.append(counts)
+            for term in counts:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+        n = len(self.documents)
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(lengths) / n) if n else 0.0
+
+        # term -> [(doc index, weight)], weight = idf * saturated tf
+        self.postings = {}
+        for index, counts in enumerate(term_counts):
+            norm = k1 * (1 - b + b * lengths[index] / avg_length) if avg_length else k1
+            for term, tf in counts.items():
+                df = doc_freq[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                weight = idf * tf * (k1 + 1) / (tf + norm)
+                self.postings.setdefault(term, []).append((index, weight))
+
+    def scores(self, query):
+        """
+        Score the documents matching any query term
+
+        Args:
+            query (str): Query text
+
+        Returns:
+            dict: Document index -> BM25 score
+        """
+        totals = {}
+        for term in tokenize(query):
+            for index, weight in self.postings.get(term, ()):
+                totals[index] = totals.get(index, 0.0) + weight
+        return totals
+
+    def similarity_search_with_score(self, query, k=4):
+        """
+        Get the best matching documents with their scores
+
+        Args:
+            query (str): Query text
+            k (int): Number of results
+
+        Returns:
+            list: (Document, score) pairs, best first; empty if nothing matches
+        """
+        top = heapq.nlargest(k, self.scores(query).items(), key=lambda item: item[1])
+        return [(Document(self.documents[index], {"index": index, "score": score}), score)
+                for index, score in top]
+
+    def similarity_search(self, query, k=4):
+        """
+        Get the best matching documents, same interface as a LangChain vector store
+
+        Args:
+            query (str): Query text
+            k (int): Number of results
+
+        Returns:
+            list: Documents, best first
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def get_relevant_documents(self, query):
+        """Retriever interface, returns default_k documents"""
+        return self.similarity_search(query, self.default_k)
+
+    def invoke(self, query, **kwargs):
+        """Runnable retriever interface, returns default_k documents"""
+        return self.similarity_search(query, self.default_k)
+
+    def as_retriever(self, **kwargs):
+        """
+        Use the index as a retriever
+
+        Args:
+            **kwargs: search_kwargs={"k": n} sets the result count, like LangChain
+
+        Returns:
+            BM25Retriever: Retriever sharing this index
+        """
+        retriever = copy.copy(self)
+        retriever.default_k = kwargs.get("search_kwargs", {}).get("k", self.default_k)
+        return retriever
@@ -0,0 +1,202 @@
+# File: app/utils/circuit_breaker.py
+
+"""
+Circuit breaker for calls to external services
+
+A breaker starts closed. After ``failure_threshold`` consecutive failures it
+opens and callers fail fast without touching the network. Once
+``reset_timeout`` seconds have passed it lets a single probe through
+(half-open): a success closes it again, a failure re-opens it for another
+``reset_timeout``.
+"""
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Every breaker by name, for the status endpoint
+_registry = {}
+_registry_lock = threading.Lock()
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        """
+        Initialize CircuitBreaker
+
+        Args:
+            name (str): Breaker name, shown by the status endpoint
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds to stay open before probing
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._last_failure = None
+        self._last_success_at = None
+        self._rejected = 0
+
+        with _registry_lock:
+            _registry[name] = self
+
+    @property
+    def state(self):
+        """
+        Current state, moving from open to half-open once the timeout passed
+
+        Returns:
+            str: "closed", "open" or "half_open"
+        """
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        """Current state (caller holds self._lock)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self):
+        """
+        Check whether a call may go ahead
+
+        In the half-open state only one caller gets through as the probe.
+
+        Returns:
+            bool: True if the call may be made
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def retry_in(self):
+        """
+        Seconds until the breaker will let a probe through
+
+        Returns:
+            float: Seconds, 0 if calls are allowed now
+        """
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        """Record a successful call, closing the breaker"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self._last_success_at = time.time()
+
+    def record_failure(self, error=None):
+        """
+        Record a failed call, opening the breaker at the threshold
+
+        Args:
+            error (str/Exception, optional): What went wrong, kept for the status endpoint
+        """
+        with self._lock:
+            self._failures += 1
+            self._last_failure = {"error": str(error) if error else None, "at": time.time()}
+            state = self._current_state()
+            if state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func through the breaker
+
+        Exceptions count as failures and are re-raised.
+
+        Args:
+            func (callable): Function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Result of func
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self):
+        """
+        Describe the breaker for monitoring
+
+        Returns:
+            dict: State, counters and timings
+        """
+        with self._lock:
+            state = self._current_state()
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0
+            return {
+                "name": self.name,
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": round(retry_in, 1),
+                "rejected_calls": self._rejected,
+                "last_failure": self._last_failure,
+                "last_success_at": self._last_success_at
+            }
+
+def get_breaker(name):
+    """
+    Look up a breaker by name
+
+    Args:
+        name (str): Breaker name
+
+    Returns:
+        CircuitBreaker/None: Breaker or None if not registered
+    """
+    with _registry_lock:
+        return _registry.get(name)
+
+def all_breakers():
+    """
+    Describe every registered breaker
+
+    Returns:
+        list: Breaker snapshots sorted by name
+    """
+    with _registry_lock:
+        breakers = list(_registry.values())
+    return [breaker.snapshot() for breaker in sorted(breakers, key=lambda b: b.name)]
@@ -0,0 +1,289 @@
+# File: app/utils/embedding_cache.py
+
+"""
+Content-addressed cache for document embeddings
+
+Vectors are stored in SQLite under the SHA-256 of the embedding model name
+and the document text, so rebuilding the knowledge base only sends new or
+changed documents to the embedding backend. Entries that no current
+document uses are evicted after a grace period, and the cache is capped by
+least recent use.
+
+Nothing here imports LangChain: CachedEmbeddings wraps any object with
+``embed_documents``/``embed_query`` and can stand in for one, and
+HashingEmbeddings is a deterministic offline embedder for tests and
+development without an API key.
+"""
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+# Default location, next to the other chatbot data
+CACHE_PATH = os.environ.get('EMBEDDING_CACHE_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'chainlit_app', 'data', 'embedding_cache.db'))
+
+# Keep vectors of documents that disappeared for this long, so reverting a
+# menu edit does not pay for the embedding again
+ORPHAN_GRACE_SECONDS = float(os.environ.get('EMBEDDING_CACHE_ORPHAN_GRACE', str(7 * 24 * 3600)))
+
+# Upper bound on cached vectors
+MAX_ENTRIES = int(os.environ.get('EMBEDDING_CACHE_MAX_ENTRIES', '20000'))
+
+def model_name_of(embedder):
+    """
+    Name an embedding model for cache keys
+
+    Args:
+        embedder (object): Embedding model
+
+    Returns:
+        str: Class name plus model/model_name attribute if there is one
+    """
+    model = getattr(embedder, "model", None) or getattr(embedder, "model_name", None) or ""
+    return f"{type(embedder).__name__}:{model}"
+
+def content_key(model_name, text):
+    """
+    Cache key of one document
+
+    Args:
+        model_name (str): Embedding model name, see model_name_of()
+        text (str): Document text
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(f"{model_name}\0{text}".encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """SQLite store of vectors by content key"""
+
+    def __init__(self, path=CACHE_PATH):
+        """
+        Initialize EmbeddingCache
+
+        Args:
+            path (str): SQLite file, ":memory:" for a throwaway cache
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        """Open the database on first use (caller holds self._lock)"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('''CREATE TABLE IF NOT EXISTS embeddings
+                            (key TEXT PRIMARY KEY, model TEXT, vector BLOB, last_used REAL)''')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys):
+        """
+        Look up vectors and mark them as used
+
+        Args:
+            keys (list): Content keys
+
+        Returns:
+            dict: key -> list of floats, for the keys that are cached
+        """
+        if not keys:
+            return {}
+        found = {}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            unique = list(dict.fromkeys(keys))
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk)
+                for key, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+                conn.execute(f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})", [now] + chunk)
+            conn.commit()
+        return found
+
+    def put_many(self, model_name, items):
+        """
+        Store vectors
+
+        Args:
+            model_name (str): Embedding model name
+            items (dict): key -> list of floats
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                             [(key, model_name, array('f', vector).tobytes(), now) for key, vector in items.items()])
+            conn.commit()
+
+    def evict(self, keep_keys=(), orphan_grace=ORPHAN_GRACE_SECONDS, max_entries=MAX_ENTRIES):
+        """
+        Drop orphaned entries and cap the cache size
+
+        Args:
+            keep_keys (iterable): Keys of the documents in use, never evicted as orphans
+            orphan_grace (float): Seconds an unused entry is kept
+            max_entries (int): Entries kept at most, least recently used go first
+
+        Returns:
+            int: Number of entries removed
+        """
+        cutoff = time.time() - orphan_grace
+        keep = set(keep_keys)
+        with self._lock:
+            conn = self._connect()
+            stale = [key for (key,) in conn.execute("SELECT key FROM embeddings WHERE last_used < ?", (cutoff,))
+                     if key not in keep]
+            conn.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key in stale])
+            removed = len(stale)
+
+            total = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if total > max_entries:
+                cursor = conn.execute('''DELETE FROM embeddings WHERE key IN
+                                         (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)''',
+                                      (total - max_entries,))
+                removed += cursor.rowcount
+            conn.commit()
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class CachedEmbeddings:
+    """Embedding model wrapper that only embeds documents missing from the cache"""
+
+    def __init__(self, embedder, cache=None):
+        """
+        Initialize CachedEmbeddings
+
+        Args:
+            embedder (object): Model with embed_documents(texts) and embed_query(text)
+            cache (EmbeddingCache, optional): Vector store, the default file if omitted
+        """
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.model = model_name_of(embedder)
+        self.hits = 0
+        self.misses = 0
+
+    def keys_for(self, texts):
+        """
+        Content keys of documents
+
+        Args:
+            texts (list): Document texts
+
+        Returns:
+            list: Content keys in the same order
+        """
+        return [content_key(self.model, text) for text in texts]
+
+    def embed_documents(self, texts):
+        """
+        Embed documents, calling the backend only for uncached texts
+
+        Args:
+            texts (list): Document texts
+
+        Returns:
+            list: One vector per text
+        """
+        keys = self.keys_for(texts)
+        vectors = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            fresh = self.embedder.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), fresh))
+            self.cache.put_many(self.model, new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        """
+        Embed a query; queries are not cached
+
+        Args:
+            text (str): Query text
+
+        Returns:
+            list: Vector
+        """
+        return self.embedder.embed_query(text)
+
+    def __call__(self, text):
+        # Older vector stores call the embedding function directly
+        return self.embed_query(text)
+
+class HashingEmbeddings:
+    """
+    Deterministic offline embedder
+
+    Hashes word unigrams and bigrams into a fixed number of signed buckets and
+    normalizes the result, so texts sharing words get similar vectors. No
+    network, no API key, same output on every run.
+    """
+
+    def __init__(self, dimensions=256):
+        """
+        Initialize HashingEmbeddings
+
+        Args:
+            dimensions (int): Vector length
+        """
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+        self.calls = 0
+
+    def _embed(self, text):
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vector = [0.0] * self.dimensions
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts):
+        """Embed documents, see _embed()"""
+        self.calls += 1
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        """Embed a query, see _embed()"""
+        return self._embed(text)
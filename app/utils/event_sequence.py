@@ -0,0 +1,63 @@
+# File: app/utils/event_sequence.py
+
+"""
+Sequence numbers for Socket.IO broadcasts to the dashboard
+
+Every broadcast of a bridged event carries ``_seq`` (increasing per event
+name) and ``_epoch`` (changes on every server start). The browser bridge in
+assets/js/socket_bridge.js uses them to drop duplicates and to notice gaps,
+so each event reaches the Dash callbacks exactly once.
+"""
+import threading
+import uuid
+
+# Changes on every server start so clients can tell a restart from a gap
+EPOCH = uuid.uuid4().hex[:8]
+
+# Keys added to broadcast payloads
+STAMP_KEYS = ("_seq", "_epoch")
+
+_sequences = {}
+_lock = threading.Lock()
+
+def next_sequence(event):
+    """
+    Get the next sequence number for an event name
+
+    Args:
+        event (str): Socket.IO event name
+
+    Returns:
+        int: Sequence number, starting at 1
+    """
+    with _lock:
+        _sequences[event] = _sequences.get(event, 0) + 1
+        return _sequences[event]
+
+def stamp_event(event, data):
+    """
+    Copy a payload and add its sequence number and server epoch
+
+    Args:
+        event (str): Socket.IO event name
+        data (dict): Event payload
+
+    Returns:
+        dict: Stamped copy of the payload
+    """
+    stamped = strip_event_stamp(data)
+    stamped["_seq"] = next_sequence(event)
+    stamped["_epoch"] = EPOCH
+    return stamped
+
+def strip_event_stamp(data):
+    """
+    Copy a payload without the keys added by stamp_event
+
+    Args:
+        data (dict): Event payload, possibly stamped
+
+    Returns:
+        dict: Unstamped copy
+    """
+    return {key: value for key, value in (data or {}).items() if key not in STAMP_KEYS}
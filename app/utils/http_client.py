@@ -0,0 +1,199 @@
+# File: app/utils/http_client.py
+
+"""
+Shared HTTP client for outbound integrations (robot API, Chainlit, dashboard)
+
+All calls go through one ``requests.Session`` per process, so connections
+are kept alive and reused from a per-host pool instead of paying a new TCP
+(and TLS) handshake on every call. Timeouts are looked up by endpoint name,
+so each integration point has its own connect/read budget in one place.
+Retries, deadlines and retry budgets come from app/utils/resilience.py, also
+picked by endpoint name.
+"""
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from app.utils.resilience import RetryBudget, RetryPolicy, call
+
+# Number of hosts with a cached connection pool
+POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', '10'))
+
+# Connections kept alive per host
+POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '20'))
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+ENDPOINT_TIMEOUTS = {
+    "robot.start": (3.05, 10),
+    "robot.status": (2, 5),
+    "robot.cancel": (2, 5),
+    "robot.ping": (2, 5),
+    "robot.simulator": (2, 3),
+    "robot.simulator.order": (2, 5),
+    "chainlit.ping": (1, 2),
+    "chainlit.api": (2, 5),
+    "dashboard.api": (2, 5)
+}
+
+DEFAULT_POLICY = RetryPolicy(max_attempts=3, base_delay=0.2, max_delay=2.0, deadline=15.0)
+
+ENDPOINT_POLICIES = {
+    # Polled every few seconds, a late answer is worth less than the next poll
+    "robot.status": RetryPolicy(max_attempts=2, base_delay=0.2, deadline=6.0),
+    "robot.simulator": RetryPolicy(max_attempts=2, base_delay=0.2, deadline=4.0),
+    # Health checks should report what they see, not retry it away
+    "robot.ping": RetryPolicy(max_attempts=1, deadline=6.0),
+    "chainlit.ping": RetryPolicy(max_attempts=1, deadline=3.0)
+}
+
+# Share of recent calls per endpoint that may be retried
+RETRY_BUDGET_RATIO = float(os.environ.get('HTTP_RETRY_BUDGET', '0.1'))
+
+class HttpClient:
+    """Keep-alive HTTP client with per-host connection pools"""
+
+    def __init__(self, pool_hosts=POOL_HOSTS, pool_size=POOL_SIZE, timeouts=None, policies=None):
+        """
+        Initialize HttpClient
+
+        Args:
+            pool_hosts (int): Number of hosts with a cached connection pool
+            pool_size (int): Connections kept alive per host
+            timeouts (dict, optional): Endpoint name -> (connect, read) timeout
+            policies (dict, optional): Endpoint name -> RetryPolicy
+        """
+        self.pool_hosts = pool_hosts
+        self.pool_size = pool_size
+        self.timeouts = dict(ENDPOINT_TIMEOUTS if timeouts is None else timeouts)
+        self.policies = dict(ENDPOINT_POLICIES if policies is None else policies)
+        self._budgets = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Get the pooled session, creating it on first use
+
+        Returns:
+            requests.Session: Shared session
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # Retries are handled by the callers, never inside the pool
+                    adapter = HTTPAdapter(pool_connections=self.pool_hosts,
+                                          pool_maxsize=self.pool_size,
+                                          max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def timeout_for(self, endpoint):
+        """
+        Get the timeout for an endpoint
+
+        Args:
+            endpoint (str): Endpoint name, a key of ENDPOINT_TIMEOUTS
+
+        Returns:
+            tuple: (connect, read) timeout in seconds
+        """
+        return self.timeouts.get(endpoint, DEFAULT_TIMEOUT)
+
+    def policy_for(self, endpoint):
+        """
+        Get the retry policy for an endpoint
+
+        Args:
+            endpoint (str): Endpoint name, a key of ENDPOINT_POLICIES
+
+        Returns:
+            RetryPolicy: Retry policy
+        """
+        return self.policies.get(endpoint, DEFAULT_POLICY)
+
+    def budget_for(self, endpoint):
+        """
+        Get the retry budget for an endpoint, creating it on first use
+
+        Args:
+            endpoint (str): Endpoint name
+
+        Returns:
+            RetryBudget: Retry budget
+        """
+        budget = self._budgets.get(endpoint)
+        if budget is None:
+            with self._lock:
+                budget = self._budgets.setdefault(endpoint, RetryBudget(ratio=RETRY_BUDGET_RATIO))
+        return budget
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        """
+        Send a request over a pooled connection, retrying per the endpoint policy
+
+        Args:
+            method (str): HTTP method
+            url (str): Full URL
+            endpoint (str, optional): Endpoint name used to pick the timeout and policy
+            **kwargs: Passed to requests (params, json, headers, timeout, ...)
+
+        Returns:
+            requests.Response: Response
+        """
+        timeout = kwargs.pop("timeout", None) or self.timeout_for(endpoint)
+        session = self.session
+
+        def send(attempt_timeout):
+            return session.request(method, url, timeout=attempt_timeout, **kwargs)
+
+        return call(send, method, endpoint, timeout,
+                    policy=self.policy_for(endpoint),
+                    budget=self.budget_for(endpoint))
+
+    def get(self, url, endpoint=None, **kwargs):
+        """Send a GET request, see request()"""
+        return self.request("GET", url, endpoint=endpoint, **kwargs)
+
+    def post(self, url, endpoint=None, **kwargs):
+        """Send a POST request, see request()"""
+        return self.request("POST", url, endpoint=endpoint, **kwargs)
+
+    def put(self, url, endpoint=None, **kwargs):
+        """Send a PUT request, see request()"""
+        return self.request("PUT", url, endpoint=endpoint, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+# Process-wide client
+client = HttpClient()
+
+def _reset_after_fork():
+    """Give a forked child its own connections instead of the parent's sockets"""
+    client._session = None
+    client._lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get(url, endpoint=None, **kwargs):
+    """Send a GET request with the shared client"""
+    return client.get(url, endpoint=endpoint, **kwargs)
+
+def post(url, endpoint=None, **kwargs):
+    """Send a POST request with the shared client"""
+    return client.post(url, endpoint=endpoint, **kwargs)
+
+def put(url, endpoint=None, **kwargs):
+    """Send a PUT request with the shared client"""
+    return client.put(url, endpoint=endpoint, **kwargs)
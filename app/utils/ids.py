@@ -0,0 +1,227 @@
+# File: app/utils/ids.py
+
+"""
+Collision-free ID generation for Neo Cafe
+
+IDs are snowflake-style 63-bit integers: milliseconds since ``EPOCH_MS``
+(41 bits), a worker id (10 bits), and a per-millisecond sequence (12 bits).
+String IDs render that integer as fixed-width upper-case base 36 behind a
+prefix (``ORD-0KX3Q9Z7H2A1B``), so they stay alphanumeric for the order-ID
+patterns the chatbot matches and sort by creation time as plain strings.
+
+Orders written before this scheme keep their legacy IDs (``ORD-1712345678``,
+``ORD-1A2B3C4D``) in the same ``order_history`` table, and those do not sort
+chronologically against the new ones. Listings and pagination therefore
+order by ``created_at`` and use the ID only as a tie-breaker; never sort or
+page orders by ID alone.
+
+The worker id is taken from ``NEO_CAFE_WORKER_ID`` when set (needed when
+several hosts write to the same data). Otherwise each process claims a free
+slot by locking ``worker-<n>.lock`` in a shared directory, so processes on the
+same machine never share a worker id.
+"""
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 2024-01-01T00:00:00Z
+EPOCH_MS = 1704067200000
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Fixed width keeps string order equal to numeric order
+_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_WIDTH = 13
+
+LOCK_DIR = os.environ.get('NEO_CAFE_ID_LOCK_DIR', os.path.join(tempfile.gettempdir(), 'neo_cafe_ids'))
+
+def _claim_worker_id():
+    """
+    Pick a worker id that no other live process on this machine holds
+
+    Returns:
+        tuple: (worker_id, open lock file or None)
+    """
+    env_worker = os.environ.get('NEO_CAFE_WORKER_ID')
+    if env_worker is not None:
+        return int(env_worker) & MAX_WORKER_ID, None
+
+    if fcntl is not None:
+        try:
+            os.makedirs(LOCK_DIR, exist_ok=True)
+            start = os.getpid() & MAX_WORKER_ID
+            for offset in range(MAX_WORKER_ID + 1):
+                worker_id = (start + offset) & MAX_WORKER_ID
+                lock_file = open(os.path.join(LOCK_DIR, f"worker-{worker_id}.lock"), 'a')
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    # Held until the process exits
+                    return worker_id, lock_file
+                except OSError:
+                    lock_file.close()
+        except OSError as e:
+            print(f"Could not claim an ID worker slot: {e}")
+
+    return os.getpid() & MAX_WORKER_ID, None
+
+class IdGenerator:
+    """Thread-safe, monotonic snowflake ID generator"""
+
+    def __init__(self, worker_id=None):
+        """
+        Initialize IdGenerator
+
+        Args:
+            worker_id (int, optional): Worker id, claimed automatically if omitted
+        """
+        if worker_id is None:
+            worker_id, self._lock_file = _claim_worker_id()
+        else:
+            self._lock_file = None
+
+        self.worker_id = worker_id & MAX_WORKER_ID
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_int(self):
+        """
+        Get the next ID as an integer
+
+        Returns:
+            int: Unique, strictly increasing ID
+        """
+        with self._lock:
+            now_ms = int(time.time() * 1000) - EPOCH_MS
+
+            # Never go backwards if the wall clock is adjusted
+            if now_ms < self._last_ms:
+                now_ms = self._last_ms
+
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted for this millisecond, move to the next
+                    now_ms = self._last_ms + 1
+                    while int(time.time() * 1000) - EPOCH_MS < now_ms:
+                        time.sleep(0.0001)
+            else:
+                self._sequence = 0
+
+            self._last_ms = now_ms
+            return (now_ms << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+    def next_id(self, prefix):
+        """
+        Get the next ID as a prefixed string
+
+        Args:
+            prefix (str): Prefix such as "ORD"
+
+        Returns:
+            str: ID like "ORD-0KX3Q9Z7H2A1B"
+        """
+        return f"{prefix}-{encode_id(self.next_int())}"
+
+def encode_id(value):
+    """
+    Encode an integer ID as fixed-width base 36
+
+    Args:
+        value (int): Integer ID
+
+    Returns:
+        str: Encoded ID
+    """
+    chars = []
+    for _ in range(_WIDTH):
+        value, remainder = divmod(value, 36)
+        chars.append(_ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+def decode_id(encoded):
+    """
+    Decode an ID produced by this module
+
+    Args:
+        encoded (str): ID with or without its prefix
+
+    Returns:
+        int/None: Integer ID or None if it is not one of ours
+    """
+    body = encoded.rsplit("-", 1)[-1].upper()
+    if len(body) != _WIDTH or any(c not in _ALPHABET for c in body):
+        return None
+    return int(body, 36)
+
+def id_timestamp(encoded):
+    """
+    Get the creation time embedded in an ID
+
+    Args:
+        encoded (str/int): Prefixed string ID or integer ID
+
+    Returns:
+        float/None: Unix timestamp in seconds or None if not one of ours
+    """
+    value = encoded if isinstance(encoded, int) else decode_id(encoded)
+    if value is None:
+        return None
+    return ((value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS) / 1000.0
+
+# Process-wide generator
+_generator = None
+_generator_lock = threading.Lock()
+
+def _reset_after_fork():
+    """Make a forked child claim its own worker id"""
+    global _generator, _generator_lock
+    _generator = None
+    _generator_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_generator():
+    """
+    Get the process-wide generator, creating it on first use
+
+    Returns:
+        IdGenerator: Shared generator
+    """
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = IdGenerator()
+    return _generator
+
+def new_id(prefix):
+    """
+    Generate a new prefixed ID
+
+    Args:
+        prefix (str): Prefix such as "ORD", "DEL", or "ITEM"
+
+    Returns:
+        str: Unique, time-sortable ID
+    """
+    return get_generator().next_id(prefix)
+
+def new_order_id():
+    """
+    Generate a new order ID
+
+    Returns:
+        str: ID like "ORD-0KX3Q9Z7H2A1B"
+    """
+    return new_id("ORD")
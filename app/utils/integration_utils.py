@@ -3,11 +3,11 @@
 """
 Utilities for integrating Dash and Chainlit
 """
-import requests
 import json
 import os
 from urllib.parse import urlencode
 import uuid
+from app.utils import http_client
 
 # Get Chainlit URL from environment
 CHAINLIT_URL = os.environ.get('CHAINLIT_URL', 'http://localhost:8000')
@@ -49,10 +49,10 @@ def send_message_to_chainlit(message, session_id=None):
         if session_id:
             data["session_id"] = session_id
         
-        response = requests.post(
+        response = http_client.post(
             f"{CHAINLIT_URL}/api/chat",
-            json=data,
-            timeout=5
+            endpoint="chainlit.api",
+            json=data
         )
         
         if response.status_code == 200:
@@ -100,10 +100,10 @@ def sync_order_with_chainlit(order_data, session_id=None):
         if session_id:
             data["session_id"] = session_id
         
-        response = requests.post(
+        response = http_client.post(
             f"{CHAINLIT_URL}/api/custom",
-            json=data,
-            timeout=5
+            endpoint="chainlit.api",
+            json=data
         )
         
         return response.status_code == 200
@@ -0,0 +1,145 @@
+# File: app/utils/intent_router.py
+
+"""
+Deterministic fast path in front of the chatbot agent
+
+Routes are tried in order. The first one whose matcher accepts the message
+answers it with a local function, in milliseconds and without an LLM call.
+Messages no route accepts go on to the agent. Every path a message takes,
+fast or not, is counted so the hit rate of each one can be reported.
+"""
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger('neo_cafe')
+
+# Log the path hit rates every this many routed messages (0 disables)
+REPORT_EVERY = int(os.environ.get('INTENT_ROUTER_REPORT_EVERY', '50'))
+
+class IntentRouter:
+    """Ordered list of deterministic routes with per-path hit counters"""
+
+    def __init__(self, report_every=REPORT_EVERY):
+        """
+        Initialize IntentRouter
+
+        Args:
+            report_every (int): Log the hit rates every this many messages, 0 to disable
+        """
+        self.routes = []
+        self.report_every = report_every
+        self._lock = threading.Lock()
+        self._paths = {}
+        self._total = 0
+
+    def add(self, name, match, handler):
+        """
+        Register a route
+
+        Args:
+            name (str): Path name used in the statistics
+            match (callable): match(text) returns a dict of handler arguments,
+                or None if the route does not apply
+            handler (callable): handler(**arguments) returns the response text
+
+        Returns:
+            IntentRouter: self, for chaining
+        """
+        self.routes.append((name, match, handler))
+        return self
+
+    def match(self, text):
+        """
+        Find the route that would answer a message, without answering it
+
+        Args:
+            text (str): User message
+
+        Returns:
+            str: Name of the first route whose matcher accepts the message, or None
+        """
+        for name, match, handler in self.routes:
+            if match(text) is not None:
+                return name
+        return None
+
+    def route(self, text):
+        """
+        Answer a message on the fast path if a route accepts it
+
+        A route whose handler fails or returns nothing falls through to the
+        next one; the caller records the path it takes instead.
+
+        Args:
+            text (str): User message
+
+        Returns:
+            tuple: (path name, response), or (None, None) when the agent is needed
+        """
+        start = time.perf_counter()
+        for name, match, handler in self.routes:
+            arguments = match(text)
+            if arguments is None:
+                continue
+            try:
+                response = handler(**arguments)
+            except Exception as e:
+                logger.error(f"Fast path '{name}' failed: {e}")
+                continue
+            if response:
+                self.record(name, time.perf_counter() - start)
+                return name, response
+        return None, None
+
+    def record(self, name, elapsed=None):
+        """
+        Count a message handled by a path
+
+        Args:
+            name (str): Path name, a route or e.g. "agent"
+            elapsed (float, optional): Seconds it took
+        """
+        with self._lock:
+            self._total += 1
+            path = self._paths.setdefault(name, {"hits": 0, "timed": 0, "seconds": 0.0})
+            path["hits"] += 1
+            if elapsed is not None:
+                path["timed"] += 1
+                path["seconds"] += elapsed
+            report = self.report_every and self._total % self.report_every == 0
+        if report:
+            logger.info(f"Intent router: {self.summary()}")
+
+    def snapshot(self):
+        """
+        Get the per-path statistics
+
+        Returns:
+            dict: total messages and, per path, hits, rate and average milliseconds
+        """
+        with self._lock:
+            total = self._total
+            paths = {}
+            for name, path in self._paths.items():
+                paths[name] = {
+                    "hits": path["hits"],
+                    "rate": path["hits"] / total if total else 0.0,
+                    "avg_ms": (path["seconds"] / path["timed"] * 1000) if path["timed"] else None
+                }
+        return {"total": total, "paths": paths}
+
+    def summary(self):
+        """
+        One-line hit rate report
+
+        Returns:
+            str: e.g. "120 messages, store_hours 12.5% (0.1 ms), agent 60.0%"
+        """
+        snapshot = self.snapshot()
+        parts = []
+        for name, path in sorted(snapshot["paths"].items(), key=lambda item: -item[1]["hits"]):
+            timing = f" ({path['avg_ms']:.2f} ms)" if path["avg_ms"] is not None else ""
+            parts.append(f"{name} {path['rate'] * 100:.1f}%{timing}")
+        return f"{snapshot['total']} messages, " + ", ".join(parts)
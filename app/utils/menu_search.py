@@ -0,0 +1,320 @@
+# File: app/utils/menu_search.py
+
+"""
+Precomputed menu search index
+
+Built once per menu version. Item sets are Python ints used as bitsets
+(bit i = item i), so combining matches is a handful of integer operations
+however large the catalog:
+
+- a trigram index per field (name, description, category) narrows a
+  substring search to the few items that contain every trigram of the term
+- a token index answers terms too short for trigrams
+- dietary, category, store and popularity facets are bitsets
+- name-token trigrams give typo-tolerant fuzzy matches when nothing else hits
+
+search() ranks items by how many terms they match and where, and says why
+each one matched.
+"""
+import heapq
+import re
+
+# Multi-word terms kept together when a query is split into terms
+COMMON_PHRASES = ["gluten free", "dairy free", "sugar free",
+                  "almond milk", "soy milk", "oat milk",
+                  "avocado toast", "ice coffee", "iced coffee"]
+
+# Query words that select a dietary facet
+DIETARY_SYNONYMS = [
+    (("vegetarian", "vegetable", "veggie"), "vegetarian", "Vegetarian option"),
+    (("vegan", "plant", "dairy-free"), "vegan", "Vegan option"),
+    (("gluten", "gluten-free", "gluten free", "gf"), "gluten_free", "Gluten-free option")
+]
+
+# Query words that select whole categories
+CATEGORY_SYNONYMS = [
+    (("coffee", "drink", "drinks", "beverage", "beverages"), ("coffee",), "Coffee beverage"),
+    (("food", "eat", "meal", "snack"), ("food", "pastries"), "Food item"),
+    (("pastry", "pastries", "bakery", "baked"), ("pastries",), "Pastry item")
+]
+
+# Score per kind of match, so name hits outrank description hits
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.5, "category": 1.0}
+FACET_WEIGHT = 1.0
+SYNONYM_WEIGHT = 0.5
+
+# Minimum trigram overlap (Dice coefficient) for a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+def parse_query(query):
+    """
+    Split a query into search terms
+
+    Comma-separated parts are terms as they are; otherwise common phrases
+    such as "gluten free" stay together and the rest is split on spaces.
+
+    Args:
+        query (str): Query text
+
+    Returns:
+        list: Lowercase terms
+    """
+    query_lower = query.lower().strip()
+    if ',' in query_lower:
+        return [term.strip() for term in query_lower.split(',') if term.strip()]
+
+    terms = []
+    remaining = query_lower
+    for phrase in COMMON_PHRASES:
+        if phrase in remaining:
+            terms.append(phrase)
+            remaining = remaining.replace(phrase, "")
+    terms.extend(term.strip() for term in remaining.split() if term.strip())
+    return terms
+
+def trigrams(text):
+    """
+    Character trigrams of a string
+
+    Args:
+        text (str): Lowercase text
+
+    Returns:
+        set: Trigrams
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def bits(bitset):
+    """
+    Item positions in a bitset, lowest first
+
+    Args:
+        bitset (int): Bitset
+
+    Returns:
+        generator: Positions
+    """
+    # One pass over the binary digits instead of big-int arithmetic per bit
+    binary = bin(bitset)[:1:-1]
+    position = binary.find('1')
+    while position != -1:
+        yield position
+        position = binary.find('1', position + 1)
+
+class MenuSearchIndex:
+    """Inverted, trigram and facet indexes over a list of menu items"""
+
+    def __init__(self, items):
+        """
+        Initialize MenuSearchIndex and build every index
+
+        Args:
+            items (list): Menu item dicts with name, category and optional
+                description, dietary flags, popular and store_id
+        """
+        self.items = list(items)
+        self.all = (1 << len(self.items)) - 1
+        self.fields = {field: [] for field in FIELD_WEIGHTS}
+        self.trigram_index = {field: {} for field in FIELD_WEIGHTS}
+        self.token_index = {field: {} for field in FIELD_WEIGHTS}
+        self.name_token_trigrams = {}
+        self.trigram_name_tokens = {}
+        self.dietary = {"vegetarian": 0, "vegan": 0, "gluten_free": 0}
+        self.categories = {}
+        self.stores = {}
+        self.popular = 0
+
+        for position, item in enumerate(self.items):
+            bit = 1 << position
+            values = {
+                "name": str(item.get("name", "")).lower(),
+                "description": str(item.get("description") or "").lower(),
+                "category": str(item.get("category", "")).lower()
+            }
+            for field, value in values.items():
+                self.fields[field].append(value)
+                for gram in trigrams(value):
+                    index = self.trigram_index[field]
+                    index[gram] = index.get(gram, 0) | bit
+                for token in TOKEN_PATTERN.findall(value):
+                    index = self.token_index[field]
+                    index[token] = index.get(token, 0) | bit
+
+            for token in TOKEN_PATTERN.findall(values["name"]):
+                if token not in self.name_token_trigrams:
+                    grams = trigrams(f" {token} ")
+                    self.name_token_trigrams[token] = grams
+                    for gram in grams:
+                        self.trigram_name_tokens.setdefault(gram, []).append(token)
+
+            for flag in self.dietary:
+                if item.get(flag):
+                    self.dietary[flag] |= bit
+            self.categories[values["category"]] = self.categories.get(values["category"], 0) | bit
+            if item.get("store_id") is not None:
+                self.stores[item["store_id"]] = self.stores.get(item["store_id"], 0) | bit
+            if item.get("popular"):
+                self.popular |= bit
+
+        self.popular_positions = frozenset(bits(self.popular))
+
+    def field_matches(self, field, term):
+        """
+        Items whose field contains the term as a substring
+
+        Args:
+            field (str): "name", "description" or "category"
+            term (str): Lowercase term
+
+        Returns:
+            int: Bitset
+        """
+        if len(term) < 3:
+            # Too short for trigrams; whole tokens only
+            return self.token_index[field].get(term, 0)
+
+        index = self.trigram_index[field]
+        candidates = self.all
+        for gram in trigrams(term):
+            candidates &= index.get(gram, 0)
+            if not candidates:
+                return 0
+
+        # Trigrams can all appear without the whole term; drop those candidates
+        values = self.fields[field]
+        matches = candidates
+        for position in bits(candidates):
+            if term not in values[position]:
+                matches &= ~(1 << position)
+        return matches
+
+    def fuzzy_matches(self, term):
+        """
+        Items with a name word close to the term, for typos
+
+        Args:
+            term (str): Lowercase term of more than 3 characters
+
+        Returns:
+            dict: Position -> similarity between 0 and 1
+        """
+        wanted = trigrams(f" {term} ")
+        shared = {}
+        for gram in wanted:
+            for token in self.trigram_name_tokens.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        scores = {}
+        for token, count in shared.items():
+            similarity = 2 * count / (len(wanted) + len(self.name_token_trigrams[token]))
+            if similarity < FUZZY_THRESHOLD:
+                continue
+            for position in bits(self.token_index["name"].get(token, 0)):
+                scores[position] = max(scores.get(position, 0.0), similarity)
+        return scores
+
+    def category_bits(self, names):
+        """
+        Items in any of the categories
+
+        Args:
+            names (tuple): Lowercase category names
+
+        Returns:
+            int: Bitset
+        """
+        result = 0
+        for name in names:
+            result |= self.categories.get(name, 0)
+        return result
+
+    def search(self, query, limit=None, store_id=None):
+        """
+        Rank menu items for a query
+
+        Args:
+            query (str): Query text
+            limit (int, optional): Maximum number of results
+            store_id (optional): Only items of this store
+
+        Returns:
+            list: (item, score, reasons) tuples, best first
+        """
+        scope = self.stores.get(store_id, 0) if store_id is not None else self.all
+        scores = {}
+        # (bitset, reason) per match; reasons are only resolved for returned items
+        contributions = []
+
+        def add(bitset, weight, reason):
+            bitset &= scope
+            if not bitset:
+                return
+            contributions.append((bitset, reason))
+            for position in bits(bitset):
+                scores[position] = scores.get(position, 0.0) + weight
+
+        terms = parse_query(query)
+        for term in terms:
+            # Text matches; an item counts once per term, for its best field
+            remaining = scope
+            for field, label in (("name", "Name contains"),
+                                 ("description", "Description mentions"),
+                                 ("category", "Category matches")):
+                matched = self.field_matches(field, term) & remaining
+                add(matched, FIELD_WEIGHTS[field], f"{label} '{term}'")
+                remaining &= ~matched
+
+            for words, flag, reason in DIETARY_SYNONYMS:
+                if any(word in term for word in words):
+                    add(self.dietary[flag], FACET_WEIGHT, reason)
+
+            for words, category_names, reason in CATEGORY_SYNONYMS:
+                if term in words:
+                    add(self.category_bits(category_names), SYNONYM_WEIGHT, reason)
+
+        if not scores:
+            for term in terms:
+                for part in term.split():
+                    if len(part) <= 3:
+                        continue
+                    similar = 0
+                    for position, similarity in self.fuzzy_matches(part).items():
+                        if (scope >> position) & 1:
+                            scores[position] = max(scores.get(position, 0.0), similarity)
+                            similar |= 1 << position
+                    if similar:
+                        contributions.append((similar, f"Similar to '{term}'"))
+
+        popular = self.popular_positions
+        rank = lambda position: (-scores[position], position not in popular, position)
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, scores, key=rank)
+        else:
+            ranked = sorted(scores, key=rank)
+        results = []
+        for position in ranked:
+            reasons = []
+            for bitset, reason in contributions:
+                if (bitset >> position) & 1 and reason not in reasons:
+                    reasons.append(reason)
+            results.append((self.items[position], scores[position], reasons))
+        return results
+
+    def popular_items(self, limit=5):
+        """
+        Popular items in menu order
+
+        Args:
+            limit (int): Maximum number of items
+
+        Returns:
+            list: Menu items
+        """
+        result = []
+        for position in bits(self.popular):
+            if len(result) >= limit:
+                break
+            result.append(self.items[position])
+        return result
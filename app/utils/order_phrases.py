@@ -0,0 +1,182 @@
+# File: app/utils/order_phrases.py
+
+"""
+Phrases the chatbot recognizes in order messages
+
+The phrase lists used to be rebuilt inside the order handlers on every
+message. They live here once, and build_order_matcher() compiles them,
+together with the menu item names, into one PhraseMatcher so a message is
+scanned a single time for every intent, delivery type, payment method,
+table number and menu item.
+
+Lists are in precedence order: where several phrases match, the handlers
+use the first one listed.
+"""
+from app.utils.phrase_matcher import PhraseMatcher
+
+# Message is only confirming the order as it stands
+CONFIRMATION_PHRASES = [
+    "that's all", "thats all", "nothing else", "finalize", "place order",
+    "confirm", "that is all", "looks good", "proceed", "yes", "complete",
+    "finish", "done", "good to go", "fine", "perfect", "correct", "ok",
+    "okay", "sure", "yeah", "yep", "sounds good", "just that", "that's it",
+    "that looks right", "place my order", "go ahead", "that's correct",
+    "that will be it", "that will be all", "finalize it", "that'll be it"
+]
+
+# Finalizing an order under verification also accepts these
+FINALIZE_PHRASES = CONFIRMATION_PHRASES + [
+    "confirm it", "confirmation", "order it", "submit", "send it", "order now"
+]
+
+# User wants to add more items to an order under verification
+ADD_MORE_PHRASES = [
+    "add", "also", "more", "another", "additional", "extra", "include",
+    "plus", "and", "with", "get", "want", "like", "would like", "i'd like",
+    "put in", "throw in", "add on", "as well"
+]
+
+# User wants to cancel an order under verification
+CANCEL_PHRASES = [
+    "cancel", "never mind", "nevermind", "stop", "forget it", "don't want",
+    "dont want", "remove", "delete", "clear", "no", "nope", "cancel order",
+    "abandon", "scrap", "discard", "start over", "start again", "reset"
+]
+
+# User wants to drop an order while details are still being asked for;
+# matched as whole words, and without "no", "clear" or "remove", which also
+# occur in answers ("now", "Clearview Drive")
+SLOT_CANCEL_PHRASES = [
+    "cancel", "cancel order", "cancel my order", "cancel the order",
+    "never mind", "nevermind", "forget it", "forget the order",
+    "don't want it", "dont want it", "start over", "start again", "scrap it", "abandon"
+]
+
+# Robot delivery requests, checked before the other delivery types
+ROBOT_DELIVERY_TERMS = [
+    "robot", "robot delivery", "delivery robot", "automated delivery",
+    "robot courier", "robotic delivery", "drone", "automated", "autonomous delivery",
+    "robot bring", "robot send", "send robot", "deliver with robot", "deliver by robot",
+    "robot-delivery", "delivery-robot", "robot delivery service", "autonomous",
+    "robo delivery", "robo", "ai delivery", "have a robot", "send a robot",
+    "automatic", "automatic delivery", "auto delivery", "robotic", "bot",
+    "delivery bot", "smart delivery", "tech delivery", "high tech"
+]
+
+# Other delivery types
+DELIVERY_TERMS = {
+    "dine in": "dine-in",
+    "dine-in": "dine-in",
+    "dinein": "dine-in",
+    "table": "dine-in",
+    "sit": "dine-in",
+    "restaurant": "dine-in",
+    "pickup": "pickup",
+    "pick up": "pickup",
+    "pick-up": "pickup",
+    "takeout": "pickup",
+    "take out": "pickup",
+    "take-out": "pickup",
+    "to go": "pickup",
+    "delivery": "delivery",
+    "deliver": "delivery",
+    "bring to": "delivery",
+    "send to": "delivery"
+}
+
+# Answers to "dine-in, pickup, or delivery?"; looser than DELIVERY_TERMS
+# because the question gives the context
+DELIVERY_TYPE_ANSWERS = {
+    "dine": "dine-in",
+    "eat in": "dine-in",
+    "dining": "dine-in",
+    "pick": "pickup",
+    "take": "pickup",
+    "collect": "pickup",
+    "send": "delivery",
+    "bring": "delivery",
+    "ship": "delivery",
+    "transport": "delivery"
+}
+
+PAYMENT_TERMS = {
+    "credit card": "Credit Card",
+    "credit": "Credit Card",
+    "card": "Credit Card",
+    "visa": "Credit Card",
+    "mastercard": "Credit Card",
+    "debit": "Credit Card",
+    "cash": "Cash",
+    "money": "Cash",
+    "bills": "Cash",
+    "dollars": "Cash",
+    "mobile payment": "Mobile Payment",
+    "mobile": "Mobile Payment",
+    "apple pay": "Mobile Payment",
+    "google pay": "Mobile Payment",
+    "samsung pay": "Mobile Payment",
+    "phone": "Mobile Payment",
+    "venmo": "Mobile Payment",
+    "paypal": "Mobile Payment"
+}
+
+# Answers to "how would you like to pay?"
+PAYMENT_METHOD_ANSWERS = {
+    "amex": "Credit Card",
+    "american express": "Credit Card",
+    "notes": "Cash",
+    "currency": "Cash",
+    "dollar": "Cash",
+    "electronic": "Mobile Payment"
+}
+
+# Labels reported by the order matcher
+PHRASE_LISTS = {
+    "confirm": CONFIRMATION_PHRASES,
+    "finalize": FINALIZE_PHRASES,
+    "add_more": ADD_MORE_PHRASES,
+    "cancel": CANCEL_PHRASES,
+    "slot_cancel": SLOT_CANCEL_PHRASES,
+    "robot_delivery": ROBOT_DELIVERY_TERMS,
+    "delivery_type": DELIVERY_TERMS,
+    "payment_method": PAYMENT_TERMS,
+    "delivery_type_answer": DELIVERY_TYPE_ANSWERS,
+    "payment_method_answer": PAYMENT_METHOD_ANSWERS,
+    "table": ["table"]
+}
+
+def menu_item_variations(name):
+    """
+    Ways a menu item name may be written in a message
+
+    Args:
+        name (str): Menu item name
+
+    Returns:
+        list: Lowercase variations, the name itself first
+    """
+    name = name.lower()
+    return list(dict.fromkeys([name, name.replace(" ", ""), name.replace("-", ""), name.replace(" ", "-")]))
+
+def build_order_matcher(menu_items=()):
+    """
+    Compile the order phrases and menu item names into one matcher
+
+    Menu items are reported as "menu_item" when the exact name occurs and as
+    "menu_item_variant" for the spellings from menu_item_variations(), with
+    the item id as value.
+
+    Args:
+        menu_items (list): Menu item dicts with id and name
+
+    Returns:
+        PhraseMatcher: Compiled matcher
+    """
+    matcher = PhraseMatcher()
+    for label, phrases in PHRASE_LISTS.items():
+        matcher.add(label, phrases)
+    for item in menu_items:
+        name, *variations = menu_item_variations(str(item.get("name", "")))
+        matcher.add("menu_item", {name: item["id"]})
+        matcher.add("menu_item_variant", {variation: item["id"] for variation in [name] + variations})
+    return matcher.compile()
@@ -0,0 +1,166 @@
+# File: app/utils/order_slots.py
+
+"""
+Slot filling for the chatbot ordering flow
+
+An order in progress is a small state machine: its state is the slot the
+bot last asked for (``missing_field``) and the slots are the order fields
+below. Each user turn fills slots straight from the phrase matches of the
+message; the asked slot may also be answered loosely ("5" for a table,
+"collect" for pickup). Only when the asked slot cannot be parsed does the
+caller ask an LLM to extract that single value, with the prompt and reply
+parsing defined here.
+"""
+
+# Order fields collected before verification, in the order they are asked
+SLOTS = ["items", "delivery_type", "delivery_location", "payment_method"]
+
+DELIVERY_TYPES = ["dine-in", "pickup", "delivery", "robot-delivery"]
+PAYMENT_METHODS = ["Credit Card", "Cash", "Mobile Payment"]
+
+# Prompts for a slot, used when an answer could not be understood
+SLOT_PROMPTS = {
+    "items": "What would you like to order?",
+    "delivery_type": "Is this order for dine-in, pickup, or delivery?",
+    "table": "Which table number are you sitting at?",
+    "address": "What address would you like your order delivered to?",
+    "payment_method": "How would you like to pay? We accept Credit Card, Cash, or Mobile Payment."
+}
+
+# Longest number read as a table number
+MAX_TABLE_DIGITS = 3
+
+def is_dine_in(order):
+    """
+    Check whether an order is eaten at a table
+
+    Args:
+        order (dict): Order so far
+
+    Returns:
+        bool: True for dine-in orders
+    """
+    return "dine" in str(order.get("delivery_type", "")).lower()
+
+def slot_prompt(slot, order):
+    """
+    Question asking for a slot
+
+    Args:
+        slot (str): Slot name
+        order (dict): Order so far
+
+    Returns:
+        str: Prompt text
+    """
+    if slot == "delivery_location":
+        return SLOT_PROMPTS["table"] if is_dine_in(order) else SLOT_PROMPTS["address"]
+    return SLOT_PROMPTS.get(slot, "Could you tell me a bit more about your order?")
+
+def parse_slots(phrases, text, order, asked=None):
+    """
+    Fill order slots from one user message
+
+    Slots already set are only replaced when they are the asked slot. When
+    the bot asked for a delivery address the whole message is the address
+    and nothing else is read from it, since addresses contain all kinds of
+    words.
+
+    Args:
+        phrases (PhraseMatches): Order phrase matches of the message
+        text (str): The message
+        order (dict): Order so far
+        asked (str, optional): Slot the bot asked for
+
+    Returns:
+        dict: Slot values found, a subset of delivery_type, delivery_location
+            and payment_method
+    """
+    text = text.strip()
+    found = {}
+
+    if asked == "delivery_location" and not is_dine_in(order):
+        if len(text) > 3:
+            found["delivery_location"] = text
+        return found
+
+    def wanted(slot):
+        return slot == asked or not order.get(slot)
+
+    if wanted("delivery_type"):
+        if phrases.has("robot_delivery"):
+            found["delivery_type"] = "robot-delivery"
+        elif phrases.has("delivery_type"):
+            found["delivery_type"] = phrases.first("delivery_type")
+        elif asked == "delivery_type" and phrases.has("delivery_type_answer"):
+            found["delivery_type"] = phrases.first("delivery_type_answer")
+
+    if wanted("delivery_location"):
+        table_number = phrases.number_after("table")
+        if table_number:
+            found["delivery_location"] = f"Table {table_number}"
+        elif asked == "delivery_location":
+            digits = "".join(char for char in text if char.isdigit())
+            if digits and len(digits) <= MAX_TABLE_DIGITS:
+                found["delivery_location"] = f"Table {digits}"
+
+    if wanted("payment_method"):
+        if phrases.has("payment_method"):
+            found["payment_method"] = phrases.first("payment_method")
+        elif asked == "payment_method" and phrases.has("payment_method_answer"):
+            found["payment_method"] = phrases.first("payment_method_answer")
+
+    return found
+
+def llm_slot_prompt(slot, text, order):
+    """
+    Prompt asking an LLM to extract one slot value from a message
+
+    Args:
+        slot (str): Slot name
+        text (str): The message
+        order (dict): Order so far
+
+    Returns:
+        str: Prompt text
+    """
+    if slot == "delivery_type":
+        instruction = f"Reply with exactly one of: {', '.join(DELIVERY_TYPES)}."
+        question = SLOT_PROMPTS["delivery_type"]
+    elif slot == "payment_method":
+        instruction = f"Reply with exactly one of: {', '.join(PAYMENT_METHODS)}."
+        question = SLOT_PROMPTS["payment_method"]
+    elif is_dine_in(order):
+        instruction = "Reply with the table number only, digits only."
+        question = SLOT_PROMPTS["table"]
+    else:
+        instruction = "Reply with the delivery address only."
+        question = SLOT_PROMPTS["address"]
+    return (f"A cafe customer was asked: \"{question}\"\n"
+            f"They answered: \"{text}\"\n"
+            f"{instruction} If the answer does not say, reply UNKNOWN.")
+
+def parse_llm_slot(slot, reply, order):
+    """
+    Read the slot value out of an LLM reply to llm_slot_prompt()
+
+    Args:
+        slot (str): Slot name
+        reply (str): LLM reply text
+        order (dict): Order so far
+
+    Returns:
+        str: Slot value, or None if the reply gives none
+    """
+    value = str(reply or "").strip().strip('"\'.').strip()
+    if not value or "unknown" in value.lower():
+        return None
+
+    if slot == "delivery_type":
+        return next((option for option in DELIVERY_TYPES if option == value.lower()), None)
+    if slot == "payment_method":
+        return next((option for option in PAYMENT_METHODS if option.lower() == value.lower()), None)
+    if is_dine_in(order):
+        digits = "".join(char for char in value if char.isdigit())
+        return f"Table {digits}" if digits and len(digits) <= MAX_TABLE_DIGITS else None
+    return value if len(value) > 3 else None
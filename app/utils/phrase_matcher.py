@@ -0,0 +1,224 @@
+# File: app/utils/phrase_matcher.py
+
+"""
+Multi-phrase matcher compiled once, scanned in a single pass
+
+An Aho-Corasick automaton over any number of labelled phrases. Scanning a
+message walks it once, character by character, and reports every phrase
+occurrence, overlapping ones included, so each ``has(label)`` answers
+exactly what ``any(phrase in text for phrase in phrases)`` did without
+rescanning the text once per phrase.
+"""
+
+class PhraseMatches:
+    """Phrase occurrences found in one text"""
+
+    def __init__(self, text, hits):
+        """
+        Initialize PhraseMatches
+
+        Args:
+            text (str): Scanned (lowercased) text
+            hits (list): (start, end, label, value, priority) tuples in text order
+        """
+        self.text = text
+        self.hits = hits
+        self.labels = {hit[2] for hit in hits}
+
+    def has(self, label):
+        """
+        Check whether any phrase of a label occurs
+
+        Args:
+            label (str): Phrase label
+
+        Returns:
+            bool: True if the text contains one of the label's phrases
+        """
+        return label in self.labels
+
+    def has_word(self, label):
+        """
+        Check whether a phrase of a label occurs as whole words
+
+        Unlike has(), "no" does not count inside "now".
+
+        Args:
+            label (str): Phrase label
+
+        Returns:
+            bool: True if an occurrence is not part of a longer word
+        """
+        text = self.text
+        for start, end, _ in self.all(label):
+            before = text[start - 1] if start > 0 else " "
+            after = text[end] if end < len(text) else " "
+            if not (before.isalnum() or after.isalnum()):
+                return True
+        return False
+
+    def __contains__(self, label):
+        return label in self.labels
+
+    def all(self, label):
+        """
+        Occurrences of a label's phrases
+
+        Args:
+            label (str): Phrase label
+
+        Returns:
+            list: (start, end, value) tuples in text order
+        """
+        return [(start, end, value) for start, end, hit_label, value, _ in self.hits if hit_label == label]
+
+    def values(self, label):
+        """
+        Distinct values of a label's phrases, in order of first occurrence
+
+        Args:
+            label (str): Phrase label
+
+        Returns:
+            list: Values
+        """
+        return list(dict.fromkeys(value for _, _, value in self.all(label)))
+
+    def first(self, label, default=None):
+        """
+        Value of the earliest registered phrase of a label that occurs
+
+        Phrase lists are ordered by precedence, so this is the value a loop
+        over the list breaking on the first hit would have picked.
+
+        Args:
+            label (str): Phrase label
+            default (optional): Returned when no phrase occurs
+
+        Returns:
+            Value of the matching phrase, or default
+        """
+        best = None
+        for hit in self.hits:
+            if hit[2] == label and (best is None or hit[4] < best[4]):
+                best = hit
+        return best[3] if best is not None else default
+
+    def number_after(self, label):
+        """
+        Digits following an occurrence of a label's phrases, e.g. "table 12"
+
+        Args:
+            label (str): Phrase label
+
+        Returns:
+            str: First run of digits directly after a phrase (spaces allowed), or None
+        """
+        text = self.text
+        for _, end, _ in self.all(label):
+            position = end
+            while position < len(text) and text[position].isspace():
+                position += 1
+            digits_end = position
+            while digits_end < len(text) and text[digits_end].isdigit():
+                digits_end += 1
+            if digits_end > position:
+                return text[position:digits_end]
+        return None
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over labelled phrases"""
+
+    def __init__(self):
+        """Initialize an empty PhraseMatcher; add phrases, then scan"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._phrases_at = [[]]  # phrases ending exactly at each state
+        self._output = [[]]      # phrases ending at each state, via failure links too
+        self._priority = 0
+        self._compiled = False
+
+    def add(self, label, phrases):
+        """
+        Register phrases under a label
+
+        Args:
+            label (str): Label reported for these phrases
+            phrases (list or dict): Phrases in precedence order; a dict maps
+                each phrase to the value reported for it, a list reports the
+                phrase itself
+
+        Returns:
+            PhraseMatcher: self, for chaining
+        """
+        items = phrases.items() if isinstance(phrases, dict) else ((phrase, phrase) for phrase in phrases)
+        for phrase, value in items:
+            phrase = phrase.lower()
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._phrases_at.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._phrases_at[state].append((len(phrase), label, value, self._priority))
+            self._priority += 1
+        self._compiled = False
+        return self
+
+    def compile(self):
+        """
+        Compute failure links; scan() calls this after phrases were added
+
+        Returns:
+            PhraseMatcher: self
+        """
+        self._output = [list(entries) for entries in self._phrases_at]
+        queue = []
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                # A state also ends every phrase its failure state ends
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        self._compiled = True
+        return self
+
+    def scan(self, text):
+        """
+        Find every phrase occurrence in one pass
+
+        Args:
+            text (str): Text to scan; matching is case-insensitive
+
+        Returns:
+            PhraseMatches: Occurrences
+        """
+        if not self._compiled:
+            self.compile()
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for length, label, value, priority in output[state]:
+                    hits.append((end - length, end, label, value, priority))
+        hits.sort(key=lambda hit: (hit[0], hit[1], hit[4]))
+        return PhraseMatches(text, hits)
@@ -0,0 +1,262 @@
+# File: app/utils/reply_stream.py
+
+"""
+Token streaming from the chatbot agent to the chat UI
+
+The agent runs in a worker thread. StreamingCallbackHandler receives its
+LangChain callbacks there and forwards them to a ReplyStream, which hands
+them to the event loop as events: answer tokens to append to the reply and
+tool steps to show while tools run.
+
+A conversational ReAct agent also streams its reasoning ("Thought: ...
+Action: ..."), so each LLM call is held back until the final answer prefix
+("AI:") appears and only the text after it is shown.
+
+The stream records time to first token. FakeStreamingAgent drives the same
+callbacks without an LLM, so streaming works and can be tested offline.
+"""
+import re
+import time
+import uuid
+import asyncio
+import types
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+except ImportError:
+    try:
+        from langchain.callbacks.base import BaseCallbackHandler
+    except ImportError:
+        # Without LangChain only FakeStreamingAgent can drive the handler
+        BaseCallbackHandler = object
+
+# Text that starts the user-facing answer in the agent's output
+ANSWER_PREFIXES = ["AI:", "BaristaBot:", "Final Answer:"]
+
+class ReplyStream:
+    """Thread-safe queue of reply events with timing"""
+
+    def __init__(self, loop, answer_prefixes=ANSWER_PREFIXES):
+        """
+        Initialize ReplyStream
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop the events are consumed on
+            answer_prefixes (list): Text after which LLM output is the answer
+        """
+        self.loop = loop
+        self.answer_prefixes = answer_prefixes
+        self._queue = asyncio.Queue()
+        self._buffer = ""
+        self._answering = False
+        self._strip_next = False
+        self.started = time.perf_counter()
+        self.first_llm_token_at = None
+        self.first_token_at = None
+        self.finished_at = None
+        self.llm_tokens = 0
+        self.tokens = 0
+        self.steps = 0
+
+    def _emit(self, *event):
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def llm_start(self):
+        """A new LLM call starts; its output is held back until an answer prefix"""
+        self._buffer = ""
+        self._answering = False
+
+    def token(self, text):
+        """
+        Take one LLM token
+
+        Args:
+            text (str): Token text
+        """
+        self.llm_tokens += 1
+        if self.first_llm_token_at is None:
+            self.first_llm_token_at = time.perf_counter()
+
+        if not self._answering:
+            self._buffer += text
+            found = [(self._buffer.find(prefix), prefix) for prefix in self.answer_prefixes]
+            found = [(position, prefix) for position, prefix in found if position != -1]
+            if not found:
+                return
+            position, prefix = min(found)
+            self._answering = True
+            self._strip_next = True
+            text = self._buffer[position + len(prefix):]
+
+        if self._strip_next:
+            text = text.lstrip()
+            if not text:
+                return
+            self._strip_next = False
+
+        self.tokens += 1
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self._emit("token", text)
+
+    def step_start(self, run_id, name, tool_input):
+        """
+        A tool starts
+
+        Args:
+            run_id (str): Id matching the step_end() call
+            name (str): Tool name
+            tool_input (str): Tool input
+        """
+        self.steps += 1
+        self._emit("step_start", run_id, name, tool_input)
+
+    def step_end(self, run_id, output, error=None):
+        """
+        A tool finished
+
+        Args:
+            run_id (str): Id given to step_start()
+            output (str): Tool output
+            error (str, optional): Error message if the tool failed
+        """
+        self._emit("step_end", run_id, output, error)
+
+    def close(self):
+        """No more events; ends events() once the queue is drained"""
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+            self._emit(None)
+
+    async def events(self):
+        """
+        Reply events in order, until close()
+
+        Yields:
+            tuple: ("token", text), ("step_start", run_id, name, input) or
+                ("step_end", run_id, output, error)
+        """
+        while True:
+            event = await self._queue.get()
+            if event == (None,):
+                return
+            yield event
+
+    def metrics(self):
+        """
+        Get the stream timings
+
+        Returns:
+            dict: ttft_ms (first answer token), first_llm_token_ms, total_ms,
+                tokens shown, llm_tokens and tool steps; times are None if it
+                did not happen
+        """
+        def since_start(moment):
+            return (moment - self.started) * 1000 if moment is not None else None
+
+        return {
+            "ttft_ms": since_start(self.first_token_at),
+            "first_llm_token_ms": since_start(self.first_llm_token_at),
+            "total_ms": since_start(self.finished_at),
+            "tokens": self.tokens,
+            "llm_tokens": self.llm_tokens,
+            "steps": self.steps
+        }
+
+class StreamingCallbackHandler(BaseCallbackHandler):
+    """LangChain callback handler feeding a ReplyStream"""
+
+    def __init__(self, stream):
+        """
+        Initialize StreamingCallbackHandler
+
+        Args:
+            stream (ReplyStream): Stream to feed
+        """
+        super().__init__()
+        self.stream = stream
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.stream.llm_start()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.stream.llm_start()
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.stream.token(token)
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        name = (serialized or {}).get("name", "Tool")
+        self.stream.step_start(str(kwargs.get("run_id", name)), name, input_str)
+
+    def on_tool_end(self, output, **kwargs):
+        self.stream.step_end(str(kwargs.get("run_id", "")), str(output))
+
+    def on_tool_error(self, error, **kwargs):
+        self.stream.step_end(str(kwargs.get("run_id", "")), "", str(error))
+
+class FakeStreamingAgent:
+    """
+    Offline stand-in for the LangChain agent
+
+    Calls each tool with the message, then streams a ReAct-style answer
+    built from the tool outputs, token by token with fixed delays, through
+    the same callbacks the real agent uses.
+    """
+
+    def __init__(self, tools=None, first_token_delay=0.3, token_delay=0.02):
+        """
+        Initialize FakeStreamingAgent
+
+        Args:
+            tools (list): (name, function) pairs, each called with the message
+            first_token_delay (float): Seconds before the first token
+            token_delay (float): Seconds between tokens
+        """
+        self.tools = list(tools or [])
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.memory = types.SimpleNamespace(buffer=[])
+
+    def run(self, message, callbacks=None):
+        """
+        Answer a message like agent.run
+
+        Args:
+            message (str): User message
+            callbacks (list, optional): Callback handlers
+
+        Returns:
+            str: Answer
+        """
+        handlers = callbacks or []
+
+        def notify(method, *args, **kwargs):
+            for handler in handlers:
+                callback = getattr(handler, method, None)
+                if callback is not None:
+                    callback(*args, **kwargs)
+
+        observations = []
+        for name, tool in self.tools:
+            run_id = uuid.uuid4()
+            notify("on_tool_start", {"name": name}, message, run_id=run_id)
+            try:
+                output = str(tool(message))
+            except Exception as e:
+                notify("on_tool_error", e, run_id=run_id)
+                continue
+            notify("on_tool_end", output, run_id=run_id)
+            observations.append(output)
+
+        answer = "\n\n".join(observations) or f"You said: {message}"
+        output = f"Thought: Do I need to use a tool? No\nAI: {answer}"
+
+        run_id = uuid.uuid4()
+        notify("on_llm_start", {"name": type(self).__name__}, [message], run_id=run_id)
+        time.sleep(self.first_token_delay)
+        for token in re.findall(r"\S+\s*|\s+", output):
+            notify("on_llm_new_token", token, run_id=run_id)
+            time.sleep(self.token_delay)
+        notify("on_llm_end", None, run_id=run_id)
+        return answer
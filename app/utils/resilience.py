@@ -0,0 +1,402 @@
+# File: app/utils/resilience.py
+
+"""
+Retry policy for outbound calls
+
+Retries use exponential backoff with full jitter, so clients that failed
+together do not retry together. Every call has a total deadline that
+bounds the attempts plus the sleeps between them. A retry budget caps
+retries at a fraction of recent traffic, so an outage does not multiply
+the load on the service that is already failing. Hooks receive one event
+per call with the attempt count and latency.
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# Methods that are safe to send twice
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+# Gateway errors that usually mean "try again"
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+class RetryPolicy:
+    """How often and how long to retry one kind of call"""
+
+    def __init__(self, max_attempts=3, base_delay=0.2, max_delay=2.0, deadline=10.0,
+                 retry_statuses=RETRY_STATUSES):
+        """
+        Initialize RetryPolicy
+
+        Args:
+            max_attempts (int): Attempts including the first one
+            base_delay (float): Backoff ceiling for the first retry in seconds
+            max_delay (float): Largest backoff ceiling in seconds
+            deadline (float): Total seconds for all attempts and sleeps
+            retry_statuses (iterable): Response status codes worth retrying
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, retry):
+        """
+        Sleep before a retry, with full jitter
+
+        Args:
+            retry (int): 1 for the first retry, 2 for the second, ...
+
+        Returns:
+            float: Seconds to sleep
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry - 1)))
+        return random.uniform(0, ceiling)
+
+class RetryBudget:
+    """Cap retries at a fraction of the calls in a sliding window"""
+
+    def __init__(self, ratio=0.1, min_retries=3, window=10.0):
+        """
+        Initialize RetryBudget
+
+        Args:
+            ratio (float): Retries allowed per call in the window
+            min_retries (int): Retries always allowed in the window, for low traffic
+            window (float): Window length in seconds
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        """Drop entries older than the window (caller holds self._lock)"""
+        cutoff = now - self.window
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_call(self):
+        """Count a new call"""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_retry(self):
+        """
+        Take a retry from the budget
+
+        Returns:
+            bool: True if the retry may go ahead
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+                return False
+            self._retries.append(now)
+            return True
+
+class CallStats:
+    """Per-endpoint attempt counts and latencies, fed by the call hook"""
+
+    def __init__(self, samples=500):
+        """
+        Initialize CallStats
+
+        Args:
+            samples (int): Latencies kept per endpoint for percentiles
+        """
+        self.samples = samples
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        """
+        Record one call event
+
+        Args:
+            event (dict): Event passed to every hook, see call()
+        """
+        with self._lock:
+            stats = self._stats.get(event["endpoint"])
+            if stats is None:
+                stats = {
+                    "calls": 0,
+                    "attempts": 0,
+                    "failures": 0,
+                    "budget_exhausted": 0,
+                    "deadline_exceeded": 0,
+                    "latencies": deque(maxlen=self.samples)
+                }
+                self._stats[event["endpoint"]] = stats
+            stats["calls"] += 1
+            stats["attempts"] += event["attempts"]
+            if event["error"] is not None or (event["status_code"] or 0) >= 500:
+                stats["failures"] += 1
+            if event["stopped"] == "budget":
+                stats["budget_exhausted"] += 1
+            elif event["stopped"] == "deadline":
+                stats["deadline_exceeded"] += 1
+            stats["latencies"].append(event["latency"])
+
+    def snapshot(self):
+        """
+        Summarize the recorded calls
+
+        Returns:
+            dict: Endpoint -> counters and latency percentiles in ms
+        """
+        with self._lock:
+            summary = {}
+            for endpoint, stats in self._stats.items():
+                latencies = sorted(stats["latencies"])
+                summary[endpoint] = {
+                    "calls": stats["calls"],
+                    "attempts": stats["attempts"],
+                    "retries": stats["attempts"] - stats["calls"],
+                    "failures": stats["failures"],
+                    "budget_exhausted": stats["budget_exhausted"],
+                    "deadline_exceeded": stats["deadline_exceeded"],
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+                    "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else None
+                }
+            return summary
+
+# Process-wide stats, registered as the first hook
+stats = CallStats()
+_hooks = [stats]
+
+def add_hook(hook):
+    """
+    Register a callable that receives one event per call
+
+    Args:
+        hook (callable): Called with the event dict described in call()
+    """
+    _hooks.append(hook)
+
+def remove_hook(hook):
+    """
+    Unregister a hook added with add_hook()
+
+    Args:
+        hook (callable): Hook to remove
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def _notify(event):
+    """Pass an event to every hook, never letting a hook break the call"""
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception as e:
+            print(f"Error in resilience hook: {e}")
+
+def classify_requests_error(error):
+    """
+    Say how far a failed requests attempt got
+
+    Same rule as classify_httpx_error(): refused connections, failed name
+    lookups and connect timeouts never sent the request ("connect"); resets,
+    read timeouts and other transport errors may have ("transport").
+
+    Args:
+        error (Exception): Error raised by the attempt
+
+    Returns:
+        str/None: "connect" if the connection never opened, "transport" if the
+            request may have reached the server, None if not worth retrying
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return "connect"
+    if isinstance(error, requests.ConnectionError):
+        # requests wraps the urllib3 error, usually in a MaxRetryError
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, "reason", reason)
+        if isinstance(reason, (NewConnectionError, ConnectTimeoutError)):
+            return "connect"
+        return "transport"
+    if isinstance(error, requests.Timeout):
+        return "transport"
+    return None
+
+def _clip_timeout(timeout, remaining):
+    """
+    Shrink a (connect, read) timeout so it ends before the deadline
+
+    Args:
+        timeout (float/tuple): Timeout requested for the attempt
+        remaining (float): Seconds left before the deadline
+
+    Returns:
+        float/tuple: Timeout for the attempt
+    """
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) if part is not None else remaining for part in timeout)
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
+class _Call:
+    """Bookkeeping for one call and its attempts, shared by call() and call_async()"""
+
+    def __init__(self, method, endpoint, timeout, policy, budget, classify):
+        self.method = method.upper()
+        self.endpoint = endpoint or "default"
+        self.timeout = timeout
+        self.policy = policy
+        self.budget = budget
+        self.classify = classify
+        self.started = time.monotonic()
+        self.deadline = self.started + policy.deadline if policy.deadline else None
+        self.attempts = 0
+        self.stopped = None
+        self.response = None
+        self.error = None
+
+        if budget is not None:
+            budget.record_call()
+
+    def next_timeout(self):
+        """Start an attempt and get its timeout, clipped to the deadline"""
+        self.attempts += 1
+        if self.deadline is None:
+            return self.timeout
+        return _clip_timeout(self.timeout, self.deadline - time.monotonic())
+
+    def succeeded(self, response):
+        """
+        Record a response
+
+        Returns:
+            float/None: Seconds to sleep before retrying, None to stop
+        """
+        self.response, self.error = response, None
+        retry = response.status_code in self.policy.retry_statuses and self.method in IDEMPOTENT_METHODS
+        return self._next_delay() if retry else None
+
+    def failed(self, error):
+        """
+        Record an error; only idempotent methods are retried once the request
+        may have reached the server, anything else only if it never connected
+
+        Returns:
+            float/None: Seconds to sleep before retrying, None to stop
+        """
+        self.response, self.error = None, error
+        kind = self.classify(error)
+        retry = kind == "connect" or (kind == "transport" and self.method in IDEMPOTENT_METHODS)
+        return self._next_delay() if retry else None
+
+    def _next_delay(self):
+        """Backoff before the next attempt, or None if retrying is over"""
+        if self.attempts >= self.policy.max_attempts:
+            self.stopped = "attempts"
+            return None
+        delay = self.policy.backoff(self.attempts)
+        if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+            self.stopped = "deadline"
+            return None
+        if self.budget is not None and not self.budget.try_retry():
+            self.stopped = "budget"
+            return None
+        return delay
+
+    def finish(self):
+        """Notify the hooks and return the last response or raise the last error"""
+        _notify({
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "attempts": self.attempts,
+            "latency": time.monotonic() - self.started,
+            "status_code": self.response.status_code if self.response is not None else None,
+            "error": str(self.error) if self.error is not None else None,
+            "stopped": self.stopped
+        })
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+def call(send, method, endpoint, timeout, policy, budget=None, sleep=time.sleep,
+         errors=requests.RequestException, classify=classify_requests_error):
+    """
+    Run an outbound call under a retry policy
+
+    Hooks receive {"endpoint", "method", "attempts", "latency", "status_code",
+    "error", "stopped"} where stopped is None, "attempts", "budget" or
+    "deadline" and says why retrying ended early.
+
+    Args:
+        send (callable): Makes one attempt; called with the timeout to use
+        method (str): HTTP method, decides what is safe to retry
+        endpoint (str): Endpoint name for hooks and stats
+        timeout (float/tuple): Timeout for a single attempt
+        policy (RetryPolicy): Retry policy
+        budget (RetryBudget, optional): Budget retries are taken from
+        sleep (callable): Sleep function, for eventlet/gevent friendliness
+        errors (type/tuple): Exceptions that count as a failed attempt
+        classify (callable): Maps such an error to "connect", "transport" or None
+
+    Returns:
+        Response: Last response
+
+    Raises:
+        Exception: Error of the last attempt if none succeeded
+    """
+    state = _Call(method, endpoint, timeout, policy, budget, classify)
+    while True:
+        try:
+            delay = state.succeeded(send(state.next_timeout()))
+        except errors as e:
+            delay = state.failed(e)
+        if delay is None:
+            return state.finish()
+        sleep(delay)
+
+async def call_async(send, method, endpoint, timeout, policy, budget=None,
+                     errors=Exception, classify=lambda error: None):
+    """
+    Run an outbound call under a retry policy from asyncio code
+
+    Same semantics as call(); send is a coroutine function and the backoff
+    sleeps do not block the event loop.
+
+    Args:
+        send (callable): Coroutine function making one attempt with the given timeout
+        method (str): HTTP method, decides what is safe to retry
+        endpoint (str): Endpoint name for hooks and stats
+        timeout (float/tuple): Timeout for a single attempt
+        policy (RetryPolicy): Retry policy
+        budget (RetryBudget, optional): Budget retries are taken from
+        errors (type/tuple): Exceptions that count as a failed attempt
+        classify (callable): Maps such an error to "connect", "transport" or None
+
+    Returns:
+        Response: Last response
+
+    Raises:
+        Exception: Error of the last attempt if none succeeded
+    """
+    state = _Call(method, endpoint, timeout, policy, budget, classify)
+    while True:
+        try:
+            delay = state.succeeded(await send(state.next_timeout()))
+        except errors as e:
+            delay = state.failed(e)
+        if delay is None:
+            return state.finish()
+        await asyncio.sleep(delay)
@@ -0,0 +1,189 @@
+# File: app/utils/response_cache.py
+
+"""
+Cache of chatbot answers to repeated questions
+
+Answers are keyed by the normalized question text and the audience (guest
+or the signed-in user, since the agent addresses users by name). Each entry
+belongs to a version string, the menu and knowledge base the answer was
+based on. A new version empties the cache, and entries also expire after a
+TTL. The least recently used entries are evicted above a size limit.
+
+An optional near-duplicate tier looks up misses in a BM25 index over the
+cached questions. It accepts the best candidate only if the two questions
+share most of their words, so "what vegan options do you have" can reuse
+the answer to "which vegan options do you have?".
+
+Deciding which messages may be cached, e.g. nothing personal or
+order-changing, is up to the caller.
+"""
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+
+from app.utils.bm25 import BM25Retriever, tokenize
+
+# Seconds an answer is reused
+TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL', '600'))
+
+# Answers kept at most
+MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+
+# Near-duplicate tier, off unless enabled
+NEAR_DUPLICATES = os.environ.get('RESPONSE_CACHE_NEAR_DUPLICATES', '0').lower() in ('1', 'true', 'yes')
+
+# Minimum word overlap (Jaccard) for a near-duplicate hit
+NEAR_THRESHOLD = float(os.environ.get('RESPONSE_CACHE_NEAR_THRESHOLD', '0.8'))
+
+def normalize_query(text):
+    """
+    Normalize a question for use as a cache key
+
+    Args:
+        text (str): Question
+
+    Returns:
+        str: Lowercase words separated by single spaces, punctuation removed
+    """
+    return " ".join(re.sub(r"[^\w\s']", " ", str(text).lower()).replace("'", "").split())
+
+class ResponseCache:
+    """Versioned LRU cache of answers with a TTL"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS,
+                 near_duplicates=NEAR_DUPLICATES, near_threshold=NEAR_THRESHOLD):
+        """
+        Initialize ResponseCache
+
+        Args:
+            max_entries (int): Answers kept at most
+            ttl (float): Seconds an answer is reused
+            near_duplicates (bool): Also reuse answers to near-identical questions
+            near_threshold (float): Word overlap needed for a near-duplicate hit
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.near_duplicates = near_duplicates
+        self.near_threshold = near_threshold
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (audience, question) -> (response, stored_at)
+        self._version = None
+        self._near_index = None
+        self._near_keys = []
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def _check_version(self, version):
+        """Drop every entry when the version changes (caller holds self._lock)"""
+        if version != self._version:
+            self._entries.clear()
+            self._near_index = None
+            self._version = version
+
+    def _expire(self, key, now):
+        """Remove an entry if it is too old (caller holds self._lock); True if removed"""
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] > self.ttl:
+            del self._entries[key]
+            self._near_index = None
+            return True
+        return False
+
+    def _near_lookup(self, audience, question, now):
+        """Find the cached question closest to a missed one (caller holds self._lock)"""
+        if self._near_index is None:
+            self._near_keys = list(self._entries)
+            self._near_index = BM25Retriever([cached for _, cached in self._near_keys])
+        words = set(tokenize(question))
+        if not words:
+            return None
+        for document, _ in self._near_index.similarity_search_with_score(question, k=3):
+            key = self._near_keys[document.metadata["index"]]
+            if key[0] != audience or key not in self._entries or self._expire(key, now):
+                continue
+            cached_words = set(tokenize(key[1]))
+            if len(words & cached_words) / len(words | cached_words) >= self.near_threshold:
+                return key
+        return None
+
+    def get(self, text, version, audience="guest"):
+        """
+        Look up the answer to a question
+
+        Args:
+            text (str): Question
+            version (str): Current menu/knowledge base version
+            audience (str): "guest" or the signed-in user
+
+        Returns:
+            tuple: (response, "exact" or "near"), or (None, None) on a miss
+        """
+        question = normalize_query(text)
+        key = (audience, question)
+        now = time.time()
+        with self._lock:
+            self._check_version(version)
+            kind = None
+            if key in self._entries and not self._expire(key, now):
+                kind = "exact"
+            elif self.near_duplicates and self._entries:
+                key = self._near_lookup(audience, question, now)
+                kind = "near" if key is not None else None
+
+            if kind is None:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if kind == "exact":
+                self.hits += 1
+            else:
+                self.near_hits += 1
+            return self._entries[key][0], kind
+
+    def put(self, text, version, response, audience="guest"):
+        """
+        Store the answer to a question
+
+        Args:
+            text (str): Question
+            version (str): Menu/knowledge base version the answer is based on
+            response (str): Answer
+            audience (str): "guest" or the signed-in user
+        """
+        question = normalize_query(text)
+        if not question or not response:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[(audience, question)] = (response, time.time())
+            self._entries.move_to_end((audience, question))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._near_index = None
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._near_index = None
+
+    def snapshot(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: entries, version, hits, near_hits, misses and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "version": self._version,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0
+            }
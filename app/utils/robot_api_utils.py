@@ -1,12 +1,14 @@
 # File: app/utils/robot_api_utils.py
 
-import requests
 import json
 import os
 import logging
-from functools import wraps
 import time
+import threading
 from urllib.parse import urljoin
+from app.utils import http_client
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.robot_telemetry import FINAL_STATES
 
 # Configure logging
 logger = logging.getLogger('neo_cafe')
@@ -15,32 +17,101 @@ logger = logging.getLogger('neo_cafe')
 # Replace localhost with your specific IP address
 ROBOT_API_BASE_URL = os.environ.get('ROBOT_API_BASE_URL', 'http://172.29.104.124:8001/api')
 
-def retry_request(max_retries=3, backoff_factor=0.5):
+# Fail fast while the robot API is down instead of tying up Dash workers
+robot_breaker = CircuitBreaker(
+    "robot_api",
+    failure_threshold=int(os.environ.get('ROBOT_BREAKER_FAILURES', '5')),
+    reset_timeout=float(os.environ.get('ROBOT_BREAKER_RESET_SECONDS', '30'))
+)
+
+# Seconds a last good status may be served while the API is unavailable
+STATUS_CACHE_SECONDS = float(os.environ.get('ROBOT_STATUS_CACHE_SECONDS', '600'))
+
+# Last good status per (delivery_id, order_id), served while the API is unavailable;
+# entries expire after STATUS_CACHE_SECONDS and finished deliveries are dropped
+_last_good_status = {}
+_status_lock = threading.Lock()
+
+def _remember_status(key, result):
     """
-    Decorator to retry API requests with exponential backoff
-    
+    Keep a good status for _stale_status() and evict expired entries
+
+    Args:
+        key (tuple): (delivery_id, order_id)
+        result (dict): Status data from the robot API
+    """
+    now = time.time()
+    status = result.get("delivery_status", "") if isinstance(result, dict) else ""
+    finished = str(status).lower() in FINAL_STATES
+    with _status_lock:
+        expired = [k for k, (fetched_at, _) in _last_good_status.items() if now - fetched_at > STATUS_CACHE_SECONDS]
+        for k in expired:
+            del _last_good_status[k]
+        if finished:
+            # Nothing left to poll for, RobotTelemetry keeps the final snapshot
+            _last_good_status.pop(key, None)
+        else:
+            _last_good_status[key] = (now, result)
+
+def _record_response(response):
+    """
+    Report a robot API response to the circuit breaker
+
+    Server errors count as failures; anything else means the API is up,
+    even if the body turns out not to parse. Called exactly once per
+    response, transport errors are recorded by the caller instead.
+
+    Args:
+        response (requests.Response): Response from the robot API
+    """
+    if response.status_code >= 500:
+        robot_breaker.record_failure(f"HTTP {response.status_code}")
+    else:
+        robot_breaker.record_success()
+
+def _circuit_open_result(action):
+    """
+    Build the error returned while the breaker is open
+
     Args:
-        max_retries (int): Maximum number of retry attempts
-        backoff_factor (float): Backoff factor for retry timing
+        action (str): What was attempted
+
+    Returns:
+        dict: Error result
+    """
+    error_msg = f"Robot API unavailable, not trying to {action} (retry in {robot_breaker.retry_in():.0f}s)"
+    logger.warning(error_msg)
+    return {
+        "status": "error",
+        "error": error_msg,
+        "circuit_open": True
+    }
+
+def _stale_status(key, error_result):
+    """
+    Serve the last good status for a delivery instead of an error
+
+    Args:
+        key (tuple): (delivery_id, order_id)
+        error_result (dict): Result to return if nothing is cached
+
+    Returns:
+        dict: Stale status result or error_result
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            retries = 0
-            while retries < max_retries:
-                try:
-                    return func(*args, **kwargs)
-                except (requests.RequestException, ConnectionError) as e:
-                    retries += 1
-                    if retries >= max_retries:
-                        raise e
-                    # Calculate backoff time based on retry number
-                    backoff_time = backoff_factor * (2 ** (retries - 1))
-                    time.sleep(backoff_time)
-        return wrapper
-    return decorator
-
-@retry_request()
+    with _status_lock:
+        cached = _last_good_status.get(key)
+    if not cached or time.time() - cached[0] > STATUS_CACHE_SECONDS:
+        return error_result
+
+    fetched_at, data = cached
+    return {
+        "status": "success",
+        "data": data,
+        "stale": True,
+        "stale_seconds": round(time.time() - fetched_at, 1),
+        "error": error_result.get("error")
+    }
+
 def start_robot_delivery(interface_name="en7", order_id=None, delivery_location=None):
     """
     Start a robot delivery by calling the robot API
@@ -53,6 +124,10 @@ def start_robot_delivery(interface_name="en7", order_id=None, delivery_location=
     Returns:
         dict: Response from the robot API
     """
+    if not robot_breaker.allow():
+        return _circuit_open_result("start robot delivery")
+    
+    response = None
     try:
         # Construct the API endpoint URL
         endpoint = urljoin(ROBOT_API_BASE_URL, "delivery/start")
@@ -72,12 +147,13 @@ def start_robot_delivery(interface_name="en7", order_id=None, delivery_location=
         logger.info(f"Starting robot delivery: {json.dumps(payload)}")
         
         # Make the API call
-        response = requests.post(
+        response = http_client.post(
             endpoint,
+            endpoint="robot.start",
             headers={'Content-Type': 'application/json'},
-            json=payload,
-            timeout=10  # 10 second timeout
+            json=payload
         )
+        _record_response(response)
         
         # Check if the request was successful
         if response.status_code in (200, 201, 202):
@@ -99,6 +175,9 @@ def start_robot_delivery(interface_name="en7", order_id=None, delivery_location=
             }
     
     except Exception as e:
+        if response is None:
+            # Transport error; an unreadable body was already counted as an answer
+            robot_breaker.record_failure(e)
         error_msg = f"Error starting robot delivery: {str(e)}"
         logger.error(error_msg)
         return {
@@ -106,7 +185,6 @@ def start_robot_delivery(interface_name="en7", order_id=None, delivery_location=
             "error": error_msg
         }
 
-@retry_request()
 def get_robot_delivery_status(delivery_id=None, order_id=None):
     """
     Get the status of a robot delivery
@@ -118,6 +196,11 @@ def get_robot_delivery_status(delivery_id=None, order_id=None):
     Returns:
         dict: Status of the robot delivery
     """
+    key = (delivery_id, order_id)
+    if not robot_breaker.allow():
+        return _stale_status(key, _circuit_open_result("get robot delivery status"))
+    
+    response = None
     try:
         # Construct the API endpoint URL
         endpoint = urljoin(ROBOT_API_BASE_URL, "delivery/status")
@@ -133,16 +216,18 @@ def get_robot_delivery_status(delivery_id=None, order_id=None):
         logger.info(f"Getting robot delivery status: {params}")
         
         # Make the API call
-        response = requests.get(
+        response = http_client.get(
             endpoint,
-            params=params,
-            timeout=5  # 5 second timeout
+            endpoint="robot.status",
+            params=params
         )
+        _record_response(response)
         
         # Check if the request was successful
         if response.status_code == 200:
             result = response.json()
             logger.info(f"Robot delivery status retrieved: {result}")
+            _remember_status(key, result)
             return {
                 "status": "success",
                 "data": result
@@ -150,21 +235,24 @@ def get_robot_delivery_status(delivery_id=None, order_id=None):
         else:
             error_msg = f"Failed to get robot delivery status. Status code: {response.status_code}"
             logger.error(error_msg)
-            return {
+            error_result = {
                 "status": "error",
                 "error": error_msg,
                 "details": response.text
             }
+            return _stale_status(key, error_result) if response.status_code >= 500 else error_result
     
     except Exception as e:
+        if response is None:
+            # Transport error; an unreadable body was already counted as an answer
+            robot_breaker.record_failure(e)
         error_msg = f"Error getting robot delivery status: {str(e)}"
         logger.error(error_msg)
-        return {
+        return _stale_status(key, {
             "status": "error",
             "error": error_msg
-        }
+        })
 
-@retry_request()
 def cancel_robot_delivery(delivery_id=None, order_id=None):
     """
     Cancel a robot delivery
@@ -176,6 +264,10 @@ def cancel_robot_delivery(delivery_id=None, order_id=None):
     Returns:
         dict: Result of the cancellation request
     """
+    if not robot_breaker.allow():
+        return _circuit_open_result("cancel robot delivery")
+    
+    response = None
     try:
         # Construct the API endpoint URL
         endpoint = urljoin(ROBOT_API_BASE_URL, "delivery/cancel")
@@ -191,12 +283,13 @@ def cancel_robot_delivery(delivery_id=None, order_id=None):
         logger.info(f"Cancelling robot delivery: {json.dumps(payload)}")
         
         # Make the API call
-        response = requests.post(
+        response = http_client.post(
             endpoint,
+            endpoint="robot.cancel",
             headers={'Content-Type': 'application/json'},
-            json=payload,
-            timeout=5  # 5 second timeout
+            json=payload
         )
+        _record_response(response)
         
         # Check if the request was successful
         if response.status_code == 200:
@@ -217,6 +310,9 @@ def cancel_robot_delivery(delivery_id=None, order_id=None):
             }
     
     except Exception as e:
+        if response is None:
+            # Transport error; an unreadable body was already counted as an answer
+            robot_breaker.record_failure(e)
         error_msg = f"Error cancelling robot delivery: {str(e)}"
         logger.error(error_msg)
         return {
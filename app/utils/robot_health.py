@@ -0,0 +1,102 @@
+# File: app/utils/robot_health.py
+
+"""
+Process-wide robot API health for the Chainlit app
+
+One asyncio task per process checks the robot API on a fixed schedule and
+keeps the result in memory. Chat sessions read the cached status instead of
+probing the API themselves, so opening the chat widget costs no robot calls.
+"""
+import asyncio
+import os
+import time
+import logging
+
+logger = logging.getLogger('neo_cafe')
+
+# Seconds between robot API health checks
+HEALTH_INTERVAL = float(os.environ.get('ROBOT_HEALTH_INTERVAL', '30'))
+
+class RobotHealthMonitor:
+    """Scheduled robot API health check with a cached result"""
+
+    def __init__(self, check, interval=HEALTH_INTERVAL, on_change=None):
+        """
+        Initialize RobotHealthMonitor
+
+        Args:
+            check (callable): Coroutine function returning True if the API is reachable
+            interval (float): Seconds between checks
+            on_change (callable, optional): on_change(snapshot) when availability changes
+        """
+        self.check = check
+        self.interval = interval
+        self.on_change = on_change
+        self._task = None
+        self._status = {
+            "available": None,
+            "checked_at": None,
+            "changed_at": None,
+            "error": None,
+            "checks": 0
+        }
+
+    def ensure_started(self):
+        """
+        Start the background check on the running event loop if it is not running
+
+        Cheap enough to call from every chat session.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Robot health monitor started (every {self.interval:.0f}s)")
+
+    async def _run(self):
+        """Check forever, one check per interval"""
+        while True:
+            await self.check_now()
+            await asyncio.sleep(self.interval)
+
+    async def check_now(self):
+        """
+        Run one check and update the cached status
+
+        Returns:
+            dict: New status snapshot
+        """
+        try:
+            available = bool(await self.check())
+            error = None
+        except Exception as e:
+            available = False
+            error = str(e)
+
+        now = time.time()
+        changed = available != self._status["available"]
+        self._status = {
+            "available": available,
+            "checked_at": now,
+            "changed_at": now if changed else self._status["changed_at"],
+            "error": error,
+            "checks": self._status["checks"] + 1
+        }
+
+        if changed:
+            logger.info(f"Robot API is now {'available' if available else 'unavailable'}")
+            if self.on_change is not None:
+                try:
+                    self.on_change(self.snapshot())
+                except Exception as e:
+                    logger.error(f"Error in robot health change handler: {e}")
+        return self.snapshot()
+
+    def snapshot(self):
+        """
+        Get the cached status
+
+        Returns:
+            dict: available (True/False, None before the first check),
+                checked_at, changed_at, error and the number of checks so far
+        """
+        return dict(self._status)
@@ -0,0 +1,218 @@
+# File: app/utils/robot_telemetry.py
+
+"""
+Shared robot telemetry for Neo Cafe deliveries
+
+One background poller per active delivery queries the robot API at a fixed
+rate and keeps the latest snapshot in memory. Dash callbacks read the
+snapshot instead of calling the robot API themselves, and every change is
+broadcast over Socket.IO as ``robot_telemetry``, so the number of upstream
+calls does not depend on how many people are watching a delivery.
+
+State for a delivery is dropped when its poller stops for lack of viewers,
+and a finished delivery keeps its final snapshot for FINISHED_RETENTION
+seconds only, so memory does not grow with every delivery ever viewed.
+"""
+import os
+import threading
+import time
+import logging
+from app.utils.event_sequence import stamp_event
+
+logger = logging.getLogger('neo_cafe')
+
+# Seconds between robot API calls for one delivery
+POLL_INTERVAL = float(os.environ.get('ROBOT_POLL_INTERVAL', '3'))
+
+# Stop polling a delivery nobody has looked at for this many seconds
+IDLE_TIMEOUT = float(os.environ.get('ROBOT_POLL_IDLE_TIMEOUT', '60'))
+
+# Seconds a finished delivery keeps its final snapshot
+FINISHED_RETENTION = float(os.environ.get('ROBOT_TELEMETRY_RETENTION', '600'))
+
+# Delivery states after which the robot no longer moves
+FINAL_STATES = {"delivered", "completed", "cancelled", "canceled", "failed"}
+
+class RobotTelemetry:
+    """Background pollers and cached snapshots for robot deliveries"""
+
+    def __init__(self, fetch=None, interval=POLL_INTERVAL, idle_timeout=IDLE_TIMEOUT,
+                 retention=FINISHED_RETENTION):
+        """
+        Initialize RobotTelemetry
+
+        Args:
+            fetch (callable, optional): fetch(order_id) -> robot API result dict,
+                defaults to robot_api_utils.get_robot_delivery_status
+            interval (float): Seconds between polls of one delivery
+            idle_timeout (float): Seconds without viewers before a poller stops
+            retention (float): Seconds a finished delivery keeps its snapshot
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.retention = retention
+        self.socketio = None
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._last_viewed = {}
+        self._pollers = set()
+        self._finished = {}  # order_id -> monotonic time it finished
+
+    def attach(self, socketio):
+        """
+        Broadcast changes through a SocketIO instance
+
+        Args:
+            socketio (SocketIO): SocketIO instance
+        """
+        self.socketio = socketio
+
+    def snapshot(self, order_id):
+        """
+        Get the latest cached robot status for a delivery
+
+        Also marks the delivery as watched and starts its poller if needed,
+        so the first call for a delivery returns None and the data follows
+        as a robot_telemetry event.
+
+        Args:
+            order_id (str): Order ID of the delivery
+
+        Returns:
+            dict/None: {"status", "data", "fetched_at"} or None if not polled yet
+        """
+        if not order_id:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            self._evict_finished(now)
+            self._last_viewed[order_id] = now
+            start = order_id not in self._pollers and order_id not in self._finished
+            if start:
+                self._pollers.add(order_id)
+            snapshot = self._snapshots.get(order_id)
+
+        if start:
+            self._start(order_id)
+        return snapshot
+
+    def active_deliveries(self):
+        """
+        List deliveries that currently have a poller
+
+        Returns:
+            list: Order IDs
+        """
+        with self._lock:
+            return sorted(self._pollers)
+
+    def _evict_finished(self, now):
+        """Forget finished deliveries past their retention (caller holds self._lock)"""
+        expired = [oid for oid, finished_at in self._finished.items() if now - finished_at > self.retention]
+        for order_id in expired:
+            del self._finished[order_id]
+            self._snapshots.pop(order_id, None)
+            self._last_viewed.pop(order_id, None)
+
+    def _start(self, order_id):
+        """Start the poller for one delivery"""
+        if self.socketio is not None:
+            # Cooperative task under eventlet/gevent, a thread otherwise
+            self.socketio.start_background_task(self._poll, order_id)
+        else:
+            threading.Thread(target=self._poll, args=(order_id,), daemon=True,
+                             name=f"robot-telemetry-{order_id}").start()
+
+    def _sleep(self, seconds):
+        """Sleep without blocking other SocketIO tasks"""
+        if self.socketio is not None:
+            self.socketio.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _poll(self, order_id):
+        """
+        Poll one delivery until it finishes or nobody is watching
+
+        Args:
+            order_id (str): Order ID of the delivery
+        """
+        fetch = self.fetch
+        if fetch is None:
+            from app.utils.robot_api_utils import get_robot_delivery_status
+            fetch = lambda oid: get_robot_delivery_status(order_id=oid)
+
+        logger.info(f"Robot telemetry poller started for {order_id}")
+        try:
+            while True:
+                with self._lock:
+                    idle = time.monotonic() - self._last_viewed.get(order_id, 0)
+                if idle > self.idle_timeout:
+                    break
+
+                started = time.monotonic()
+                try:
+                    result = fetch(order_id)
+                except Exception as e:
+                    result = {"status": "error", "error": str(e)}
+
+                if self._store(order_id, result):
+                    with self._lock:
+                        self._finished[order_id] = time.monotonic()
+                    break
+
+                self._sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            with self._lock:
+                self._pollers.discard(order_id)
+                if order_id not in self._finished:
+                    # Stopped for lack of viewers, the next view starts afresh
+                    self._snapshots.pop(order_id, None)
+                    self._last_viewed.pop(order_id, None)
+            logger.info(f"Robot telemetry poller stopped for {order_id}")
+
+    def _store(self, order_id, result):
+        """
+        Cache a poll result and broadcast it if it changed
+
+        Args:
+            order_id (str): Order ID of the delivery
+            result (dict): Robot API result
+
+        Returns:
+            bool: True if the delivery has reached a final state
+        """
+        data = result.get("data") if result.get("status") == "success" else None
+
+        with self._lock:
+            previous = self._snapshots.get(order_id)
+            if data is None and previous is not None:
+                # Keep showing the last good data through transient errors
+                return False
+            stale = bool(result.get("stale"))
+            changed = (previous is None or previous.get("data") != data
+                       or previous.get("status") != result.get("status")
+                       or previous.get("stale") != stale)
+            snapshot = {
+                "order_id": order_id,
+                "status": result.get("status"),
+                "data": data,
+                "stale": stale,
+                "error": result.get("error"),
+                "fetched_at": time.time()
+            }
+            self._snapshots[order_id] = snapshot
+
+        if changed and self.socketio is not None:
+            try:
+                self.socketio.emit('robot_telemetry', stamp_event('robot_telemetry', snapshot))
+            except Exception as e:
+                logger.error(f"Error broadcasting robot telemetry: {e}")
+
+        status = str((data or {}).get("delivery_status", "")).lower()
+        return status in FINAL_STATES
+
+# Process-wide telemetry shared by every Dash worker thread
+telemetry = RobotTelemetry()
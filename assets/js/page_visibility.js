@@ -0,0 +1,26 @@
+/**
+ * Page visibility tracking for Neo Cafe
+ *
+ * Mirrors document.hidden into the page-visibility-store component so the
+ * clientside callbacks registered in app/layouts/__init__.py can disable the
+ * current page's polling intervals while the tab is in the background.
+ */
+
+(function() {
+    function publishVisibility() {
+        const setProps = window.dash_clientside && window.dash_clientside.set_props;
+        if (!setProps) {
+            // Dash renderer not ready yet, try again shortly
+            setTimeout(publishVisibility, 200);
+            return;
+        }
+        try {
+            setProps('page-visibility-store', {data: !document.hidden});
+        } catch (e) {
+            console.error('[PageVisibility] Error updating visibility:', e);
+        }
+    }
+
+    document.addEventListener('visibilitychange', publishVisibility);
+    document.addEventListener('DOMContentLoaded', publishVisibility);
+})();
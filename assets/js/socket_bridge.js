@@ -0,0 +1,142 @@
+/**
+ * Event-driven bridge from Socket.IO to Dash for Neo Cafe
+ *
+ * Each bridged event writes its payload into a hidden component with
+ * dash_clientside.set_props as soon as it arrives, so the server callbacks
+ * that listen to that component run once per event instead of on a timer.
+ * Payloads carry _seq/_epoch (see app/utils/event_sequence.py): duplicates are
+ * dropped, and a gap is flagged with _missed.
+ *
+ * Whenever an event may have been lost, the bridge also writes to the
+ * socket-resync store, and the listeners reload their data from the server
+ * instead of relying on the payloads. That happens on a sequence gap, and
+ * when several events for one component are coalesced into the latest.
+ * Events for a component that is not on the page yet (the robot telemetry
+ * lives on the delivery page) are held and delivered once it mounts.
+ */
+
+(function() {
+    // Socket.IO event -> hidden component whose children receive the payload
+    const BRIDGED_EVENTS = {
+        'order_update': 'socket-order-update',
+        'cart_update': 'socket-cart-update',
+        'robot_telemetry': 'socket-robot-update'
+    };
+
+    // Store bumped whenever listeners must reload in full
+    const RESYNC_TARGET = 'socket-resync';
+
+    const lastSeen = {};
+    // Target component -> {eventName, data, count} for the latest event not
+    // delivered yet and how many arrived since the last delivery
+    const pending = {};
+    let flushScheduled = false;
+
+    function accept(eventName, data) {
+        if (!data || typeof data !== 'object' || data._seq === undefined) {
+            return true;
+        }
+
+        const last = lastSeen[eventName];
+        if (last && last.epoch === data._epoch) {
+            if (data._seq <= last.seq) {
+                // Already delivered (reconnect replay or duplicate emit)
+                return false;
+            }
+            if (data._seq > last.seq + 1) {
+                console.warn(`[SocketBridge] Missed ${data._seq - last.seq - 1} ${eventName} event(s)`);
+                data._missed = true;
+            }
+        }
+
+        lastSeen[eventName] = {epoch: data._epoch, seq: data._seq};
+        return true;
+    }
+
+    function hasPending() {
+        return Object.keys(pending).length > 0;
+    }
+
+    function flush() {
+        flushScheduled = false;
+
+        const setProps = window.dash_clientside && window.dash_clientside.set_props;
+        if (!setProps) {
+            // Dash renderer not ready yet, keep the events queued
+            scheduleFlush(100);
+            return;
+        }
+
+        Object.keys(pending).forEach(function(target) {
+            if (!document.getElementById(target)) {
+                // Held until the component mounts
+                return;
+            }
+            const item = pending[target];
+            delete pending[target];
+
+            // Dash only runs the listeners for the latest value of a prop, so
+            // several queued events collapse into the last one plus a resync
+            const data = item.data;
+            if (item.count > 1 && data && typeof data === 'object') {
+                data._missed = true;
+            }
+
+            try {
+                setProps(target, {children: JSON.stringify(data)});
+                if (data && data._missed) {
+                    setProps(RESYNC_TARGET, {data: {event: item.eventName, at: Date.now()}});
+                }
+            } catch (e) {
+                console.error('[SocketBridge] Error updating', target, e);
+            }
+        });
+    }
+
+    function scheduleFlush(delay) {
+        if (!flushScheduled) {
+            flushScheduled = true;
+            setTimeout(flush, delay || 0);
+        }
+    }
+
+    function attach(socket) {
+        Object.keys(BRIDGED_EVENTS).forEach(function(eventName) {
+            socket.on(eventName, function(data) {
+                if (!accept(eventName, data)) {
+                    return;
+                }
+                const target = BRIDGED_EVENTS[eventName];
+                const previous = pending[target];
+                if (previous && previous.data && previous.data._missed && data && typeof data === 'object') {
+                    // Keep a gap flag from an event that is being replaced
+                    data._missed = true;
+                }
+                pending[target] = {eventName: eventName, data: data, count: previous ? previous.count + 1 : 1};
+                scheduleFlush();
+            });
+        });
+    }
+
+    function waitForSocket() {
+        if (window.socket) {
+            attach(window.socket);
+        } else {
+            setTimeout(waitForSocket, 200);
+        }
+    }
+
+    function watchMounts() {
+        // Deliver held events when page navigation mounts their component
+        new MutationObserver(function() {
+            if (hasPending()) {
+                scheduleFlush();
+            }
+        }).observe(document.body, {childList: true, subtree: true});
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        watchMounts();
+        waitForSocket();
+    });
+})();
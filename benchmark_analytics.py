@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# File: benchmark_analytics.py
+# Benchmark for the dashboard sales analytics (app/data/analytics.py)
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Load the analytics module directly so the benchmark does not need Dash
+spec = importlib.util.spec_from_file_location(
+    "analytics", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "data", "analytics.py")
+)
+analytics = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(analytics)
+
+CATEGORIES = ["breakfast", "coffee", "lunch", "other", "pastries", "tea"]
+
+# Parse command line arguments
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark Neo Cafe dashboard analytics')
+    parser.add_argument('--orders', type=int, default=1_000_000, help='Number of orders in the frame')
+    parser.add_argument('--lines', type=float, default=2.5, help='Average order lines per order')
+    parser.add_argument('--days', type=int, default=365, help='Days of history to spread orders over')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per aggregate')
+    parser.add_argument('--load-orders', type=int, default=100_000,
+                        help='Orders used to time building the frame from dicts (0 to skip)')
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='Target time for one chart refresh')
+    return parser.parse_args()
+
+def synthetic_frame(n_orders, lines_per_order, n_days):
+    """Build a frame with n_orders directly as arrays"""
+    rng = np.random.default_rng(42)
+    today = analytics.to_day_number(date.today())
+
+    order_day = (today - rng.integers(0, n_days, n_orders)).astype(np.int32)
+    order_channel = rng.integers(0, len(analytics.CHANNELS), n_orders).astype(np.int8)
+
+    n_lines = int(n_orders * lines_per_order)
+    line_order = rng.integers(0, n_orders, n_lines)
+    line_revenue = rng.uniform(2.5, 12.0, n_lines)
+    order_total = np.bincount(line_order, weights=line_revenue, minlength=n_orders)
+
+    return analytics.OrderFrame(
+        order_day=order_day,
+        order_total=order_total,
+        order_channel=order_channel,
+        line_day=order_day[line_order],
+        line_category=rng.integers(0, len(CATEGORIES), n_lines).astype(np.int16),
+        line_revenue=line_revenue,
+        categories=CATEGORIES
+    )
+
+def synthetic_orders(n_orders, n_days):
+    """Build order dicts shaped like the ones the dashboard and bot store"""
+    rng = random.Random(42)
+    now = datetime.now()
+    delivery_types = ["dine-in", "pickup", "standard-delivery", "robot-delivery"]
+    orders = []
+    for i in range(n_orders):
+        created = now - timedelta(days=rng.randrange(n_days), minutes=rng.randrange(1440))
+        orders.append({
+            "id": f"ORD-{i}",
+            "created_at": created.isoformat() if i % 2 else str(created),
+            "delivery_type": rng.choice(delivery_types),
+            "items": [{"item_id": rng.randint(1, 20), "quantity": rng.randint(1, 3)}
+                      for _ in range(rng.randint(1, 4))]
+        })
+    return orders
+
+def time_call(func, repeat):
+    """Return the median and max wall time of func in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+def main():
+    args = parse_args()
+
+    print(f"\n[BENCH] Building synthetic frame: {args.orders:,} orders, ~{args.lines} lines each")
+    frame = synthetic_frame(args.orders, args.lines, args.days)
+    print(f"Order lines: {len(frame.line_day):,}")
+
+    cases = [
+        ("sales_by_day_and_category(7)", lambda: frame.sales_by_day_and_category(days=7)),
+        ("sales_by_day_and_category(30)", lambda: frame.sales_by_day_and_category(days=30)),
+        ("sales_by_day(30)", lambda: frame.sales_by_day(days=30)),
+        ("orders_by_channel(all)", lambda: frame.orders_by_channel()),
+        ("orders_by_channel(7)", lambda: frame.orders_by_channel(days=7)),
+    ]
+
+    # Warm up once so first-call overheads are not counted
+    for _, func in cases:
+        func()
+
+    print(f"\n{'aggregate':32} {'median ms':>10} {'max ms':>10}")
+    for name, func in cases:
+        median, worst = time_call(func, args.repeat)
+        print(f"{name:32} {median:10.2f} {worst:10.2f}")
+
+    refresh_median, refresh_worst = time_call(
+        lambda: (frame.sales_by_day_and_category(days=7), frame.orders_by_channel()),
+        args.repeat
+    )
+    verdict = "PASS" if refresh_median <= args.budget_ms else "FAIL"
+    print(f"\nBoth dashboard charts: median {refresh_median:.2f} ms, max {refresh_worst:.2f} ms "
+          f"(budget {args.budget_ms:.0f} ms) -> {verdict}")
+
+    if args.load_orders:
+        menu = [{"id": i, "name": f"Item {i}", "price": 2.5 + i % 7,
+                 "category": CATEGORIES[i % len(CATEGORIES)]} for i in range(1, 21)]
+        orders = synthetic_orders(args.load_orders, args.days)
+        start = time.perf_counter()
+        loaded = analytics.OrderFrame.from_orders(orders, menu)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\nBuilding a frame from {len(loaded):,} order dicts: {elapsed:.0f} ms "
+              f"({elapsed * 1000 / len(loaded):.1f} us/order, a full Python pass; "
+              f"the dashboard uses the incremental rollups instead)")
+
+    return 0 if verdict == "PASS" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# File: benchmark_http_client.py
+# Benchmark for the pooled HTTP client (app/utils/http_client.py)
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Load the client module directly so the benchmark does not need Dash
+spec = importlib.util.spec_from_file_location(
+    "http_client", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "utils", "http_client.py")
+)
+http_client = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(http_client)
+
+# Parse command line arguments
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs. per-call HTTP connections')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per mode')
+    parser.add_argument('--handshake-ms', type=float, default=0.0,
+                        help='Extra delay per new connection, to emulate a remote host or TLS setup')
+    parser.add_argument('--port', type=int, default=0, help='Port for the stand-in server (0 = any free port)')
+    return parser.parse_args()
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Stand-in for the robot API status endpoint"""
+
+    # HTTP/1.1 so clients can keep the connection open, and TCP_NODELAY like
+    # production servers so headers and body are not held back by Nagle
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({"status": "idle", "battery_level": 87, "location": {"lat": 37.77, "lng": -122.41}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded server that counts connections and can delay new ones"""
+
+    daemon_threads = True
+    handshake_delay = 0.0
+    connections = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        if self.handshake_delay:
+            time.sleep(self.handshake_delay)
+        return request
+
+def run(label, call, url, count, server):
+    """Time count sequential GETs and print per-call statistics"""
+    server.connections = 0
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = call(url)
+        response.raise_for_status()
+        response.json()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{label:28} median {median:7.3f} ms   p95 {p95:7.3f} ms   new connections {server.connections}")
+    return median
+
+def main():
+    args = parse_args()
+
+    server = StandInServer(("127.0.0.1", args.port), StatusHandler)
+    server.handshake_delay = args.handshake_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/status"
+
+    print(f"\n[BENCH] {args.requests} GET requests to {url} "
+          f"(emulated handshake {args.handshake_ms:.1f} ms)\n")
+
+    client = http_client.HttpClient()
+
+    # Warm up both paths once
+    requests.get(url, timeout=5)
+    client.get(url, endpoint="robot.status")
+
+    bare = run("requests.get (new conn)", lambda u: requests.get(u, timeout=5), url, args.requests, server)
+    pooled = run("http_client (keep-alive)", lambda u: client.get(u, endpoint="robot.status"), url, args.requests, server)
+
+    print(f"\nSaved per call: {bare - pooled:.3f} ms ({(1 - pooled / bare) * 100:.0f}% of the bare call)")
+
+    client.close()
+    server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# File: benchmark_menu_search.py
+# Benchmark for the chatbot menu search index (app/utils/menu_search.py)
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+
+# Load the search module directly so the benchmark does not need Chainlit
+spec = importlib.util.spec_from_file_location(
+    "menu_search", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "utils", "menu_search.py")
+)
+menu_search = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(menu_search)
+
+BASES = {
+    "coffee": ["Espresso", "Latte", "Cappuccino", "Mocha", "Americano", "Flat White", "Cortado", "Macchiato"],
+    "tea": ["Green Tea", "Chai Latte", "Earl Grey", "Matcha", "Oolong", "Mint Tea"],
+    "pastries": ["Croissant", "Muffin", "Scone", "Danish", "Cinnamon Roll", "Brownie"],
+    "food": ["Avocado Toast", "Breakfast Sandwich", "Bagel", "Quiche", "Salad Bowl", "Panini"]
+}
+FLAVORS = ["Vanilla", "Caramel", "Hazelnut", "Blueberry", "Almond", "Pumpkin", "Honey", "Maple",
+           "Raspberry", "Coconut", "Cherry", "Lemon", "Pistachio", "Oat Milk", "Smoked", "Spiced"]
+WORDS = ["rich", "smooth", "flaky", "buttery", "fresh", "roasted", "creamy", "light", "bold",
+         "organic", "seasonal", "house", "signature", "toasted", "sweet", "savory"]
+
+QUERIES = ["latte", "vegan pastry", "gluten free", "caramel", "expresso", "drinks", "oat milk",
+           "blueberry, muffin", "breakfast", "matcha", "croissant", "food", "chai", "xyzzy"]
+
+# Parse command line arguments
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the menu search index')
+    parser.add_argument('--items', type=int, default=5000, help='Catalog size')
+    parser.add_argument('--stores', type=int, default=25, help='Stores the catalog is spread over')
+    parser.add_argument('--repeat', type=int, default=50, help='Timed runs per query')
+    parser.add_argument('--budget-ms', type=float, default=5.0, help='Target median time per query')
+    return parser.parse_args()
+
+def synthetic_catalog(n_items, n_stores):
+    """Build a multi-store catalog of n_items menu items"""
+    rng = random.Random(42)
+    items = []
+    for item_id in range(1, n_items + 1):
+        category = rng.choice(list(BASES))
+        name = f"{rng.choice(FLAVORS)} {rng.choice(BASES[category])}"
+        items.append({
+            "id": item_id,
+            "name": name,
+            "description": " ".join(rng.sample(WORDS, 5)) + f" {name.lower()}",
+            "price": round(rng.uniform(2.5, 12.0), 2),
+            "category": category,
+            "store_id": item_id % n_stores,
+            "popular": rng.random() < 0.1,
+            "vegetarian": rng.random() < 0.7,
+            "vegan": rng.random() < 0.3,
+            "gluten_free": rng.random() < 0.4
+        })
+    return items
+
+def linear_search(items, query):
+    """The name/description/category and dietary passes of the old search_menu"""
+    matching_items = []
+    for item in items:
+        for term in menu_search.parse_query(query):
+            if (term in item["name"].lower() or term in item.get("description", "").lower()
+                    or term in item["category"].lower()):
+                if item not in matching_items:
+                    matching_items.append(item)
+    for term in menu_search.parse_query(query):
+        for words, flag, _ in menu_search.DIETARY_SYNONYMS:
+            if any(word in term for word in words):
+                for item in items:
+                    if item.get(flag) and item not in matching_items:
+                        matching_items.append(item)
+    return matching_items
+
+def time_ms(func, repeat):
+    """Median milliseconds of repeat calls"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    args = parse_args()
+    items = synthetic_catalog(args.items, args.stores)
+
+    start = time.perf_counter()
+    index = menu_search.MenuSearchIndex(items)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"\n[BENCH] {args.items} items in {args.stores} stores, index built in {build_ms:.1f} ms\n")
+    print(f"{'query':20} {'results':>8} {'index ms':>10} {'store ms':>10} {'linear ms':>10}")
+
+    worst = 0.0
+    for query in QUERIES:
+        results = index.search(query, limit=10)
+        indexed = time_ms(lambda: index.search(query, limit=10), args.repeat)
+        scoped = time_ms(lambda: index.search(query, limit=10, store_id=3), args.repeat)
+        # The old quadratic passes are slow; a few runs are enough
+        linear = time_ms(lambda: linear_search(items, query), max(1, args.repeat // 25))
+        worst = max(worst, indexed)
+        top = results[0][0]["name"] if results else "-"
+        print(f"{query:20} {len(index.search(query)):>8} {indexed:>10.3f} {scoped:>10.3f} {linear:>10.1f}   top: {top}")
+
+    status = "PASS" if worst <= args.budget_ms else "FAIL"
+    print(f"\nSlowest indexed query: {worst:.3f} ms (budget {args.budget_ms:.1f} ms) {status}")
+    return 0 if status == "PASS" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,17 @@
 import os
 import sys
 import json
+import asyncio
+import re
 import time
 import uuid
 import sqlite3
+import hashlib
+import shutil
+import threading
 import traceback
 import urllib.parse
-import requests
+import httpx
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -41,8 +46,23 @@ logger = logging.getLogger('neo_cafe')
 logger.setLevel(logging.DEBUG)
 
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Put the repository root first on the path for imports: Chainlit runs this
+# file from chainlit_app/, where "app" would otherwise resolve to this script
+# instead of the app package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.ids import new_order_id
+from app.utils import http_client, async_http_client
+from app.utils.async_robot_client import AsyncRobotClient
+from app.utils.robot_health import RobotHealthMonitor
+from app.utils.embedding_cache import EmbeddingCache, CachedEmbeddings, HashingEmbeddings
+from app.utils.bm25 import BM25Retriever
+from app.utils.menu_search import MenuSearchIndex, parse_query
+from app.utils.order_phrases import build_order_matcher
+from app.utils.intent_router import IntentRouter
+from app.utils.order_slots import SLOTS, parse_slots, slot_prompt, llm_slot_prompt, parse_llm_slot
+from app.utils.response_cache import ResponseCache
+from app.utils.reply_stream import ReplyStream, StreamingCallbackHandler, FakeStreamingAgent
 
 # Add this near the top of your app.py file, right after the imports
 
@@ -76,12 +96,23 @@ print("="*80 + "\n")
 # Constants
 DASHBOARD_URL = os.environ.get('DASHBOARD_URL', 'http://localhost:8050')
 ROBOT_SIMULATOR_URL = os.environ.get('ROBOT_SIMULATOR_URL', 'http://localhost:8001')
+
+# Robot API calls made from Chainlit handlers go through the asyncio client
+robot_client = AsyncRobotClient(ROBOT_SIMULATOR_URL)
 DB_PATH = os.environ.get('DB_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'neo_cafe.db'))
 logger.debug(f"Using database at: {DB_PATH}")
 SESSION_TIMEOUT = 1800  # 30 minutes
 
+# Patterns used while handling messages, compiled once
+ORDER_ID_PATTERN = re.compile(r'(ORD-[A-Za-z0-9]+)', re.IGNORECASE)
+DELIVERY_DESTINATION_PATTERN = re.compile(r'to\s+(.+?)(?:\.|\?|$)')
+STREET_ADDRESS_PATTERN = re.compile(r'\b\d+\s+[a-zA-Z\s]+(?:street|st|avenue|ave|road|rd|lane|ln|drive|dr|circle|cir|court|ct|place|pl|boulevard|blvd)\b', re.IGNORECASE)
+LOOSE_ADDRESS_PATTERN = re.compile(r'\b\d+\s+[a-zA-Z\s]{5,30}\b')
+
 # Global variables
-menu_items = []  # Will be populated in the create_knowledge_base function
+menu_items = []  # Will be populated in the get_knowledge_base function
+_menu_index = {"signature": None, "index": None, "phrases": None}  # Indexes over menu_items, see refresh_menu_index
+_menu_index_lock = threading.Lock()
 processed_message_ids = set()  # Track processed message IDs to avoid duplicates
 is_floating_chat = False  # Flag to check if running in floating mode
 
@@ -227,15 +258,46 @@ def default_menu():
         }
     ]
 
-def create_knowledge_base():
+# Bump when the document text or index settings change, to force a rebuild
+KB_VERSION = 1
+
+# Saved FAISS indexes, one directory per knowledge base key
+KB_CACHE_DIR = os.environ.get('KB_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'knowledge_base'))
+
+# Seconds before a knowledge base that fell back to BM25 tries embedding again
+KB_RETRY_SECONDS = float(os.environ.get('KB_RETRY_SECONDS', '300'))
+
+# Process-wide knowledge base shared by every chat session; retry_at is set
+# while the store is the BM25 fallback for a failed embedding build
+_knowledge_base = {"key": None, "store": None, "retry_at": None}
+_knowledge_base_lock = threading.Lock()
+
+# "openai", or "hashing" for the deterministic offline embedder
+KB_EMBEDDINGS = os.environ.get('KB_EMBEDDINGS', 'openai')
+
+# "faiss", or "bm25" for lexical search without embeddings or network
+KB_RETRIEVER = os.environ.get('KB_RETRIEVER', 'faiss')
+
+# Document vectors by content hash, so a menu change only embeds what changed
+embedding_cache = EmbeddingCache()
+
+def get_embeddings():
     """
-    Create vector store knowledge base for menu items and other information.
+    Get the embedding model for the knowledge base, behind the embedding cache.
     Returns:
-        FAISS: Vector store.
+        CachedEmbeddings: Embedding model.
+    """
+    backend = HashingEmbeddings() if KB_EMBEDDINGS == 'hashing' else OpenAIEmbeddings()
+    return CachedEmbeddings(backend, embedding_cache)
+
+def build_knowledge_documents(menu_data):
+    """
+    Build the knowledge base documents for menu items and other information.
+    Args:
+        menu_data (list): Menu items.
+    Returns:
+        list: Document texts.
     """
-    menu_data = load_menu_data()
-    global menu_items
-    menu_items = menu_data
     documents = []
     
     for item in menu_data:
@@ -296,24 +358,146 @@ def create_knowledge_base():
     We'll be happy to remake your order or provide a refund.
     """)
     
-    embeddings = OpenAIEmbeddings()
+    return documents
+
+def knowledge_base_key(documents, embeddings):
+    """
+    Hash everything the index depends on, so it is rebuilt only when that changes.
+    Args:
+        documents (list): Document texts.
+        embeddings (Embeddings): Embedding model.
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{KB_VERSION}|{type(embeddings).__name__}|{getattr(embeddings, 'model', '')}".encode('utf-8'))
+    for doc in documents:
+        digest.update(b"\0")
+        digest.update(doc.encode('utf-8'))
+    return digest.hexdigest()
+
+def create_knowledge_base(documents, embeddings):
+    """
+    Create vector store knowledge base from documents.
+    Args:
+        documents (list): Document texts.
+        embeddings (Embeddings): Embedding model.
+    Returns:
+        FAISS: Vector store.
+    """
     try:
         vector_store = FAISS.from_texts(documents, embeddings)
         return vector_store
     except Exception as e:
         print(f"Error creating vector store: {e}")
-        # Return a simple retriever that just returns the first few documents
-        class SimpleRetriever:
-            def similarity_search(self, query, k=5):
-                class Document:
-                    def __init__(self, content):
-                        self.page_content = content
-                return [Document(doc) for doc in documents[:k]]
-            
-            def as_retriever(self, **kwargs):
-                return self
+        # Fall back to lexical search over the same documents
+        return BM25Retriever(documents)
+
+def load_saved_knowledge_base(key, embeddings):
+    """
+    Load a saved FAISS index for a knowledge base key.
+    Args:
+        key (str): Knowledge base key.
+        embeddings (Embeddings): Embedding model.
+    Returns:
+        FAISS or None: Vector store, or None if there is no usable saved index.
+    """
+    path = os.path.join(KB_CACHE_DIR, key)
+    if not os.path.isdir(path):
+        return None
+    try:
+        try:
+            # Our own index, written by save_knowledge_base
+            return FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+        except TypeError:
+            # langchain versions before the deserialization flag
+            return FAISS.load_local(path, embeddings)
+    except Exception as e:
+        print(f"Error loading saved knowledge base {key[:12]}: {e}")
+        return None
+
+def save_knowledge_base(key, vector_store):
+    """
+    Save a FAISS index for a knowledge base key and drop indexes of older keys.
+    Args:
+        key (str): Knowledge base key.
+        vector_store (FAISS): Vector store.
+    """
+    path = os.path.join(KB_CACHE_DIR, key)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(KB_CACHE_DIR, exist_ok=True)
+        vector_store.save_local(tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another process saved the same key first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        
+        for name in os.listdir(KB_CACHE_DIR):
+            if name != key and '.tmp-' not in name:
+                shutil.rmtree(os.path.join(KB_CACHE_DIR, name), ignore_errors=True)
+    except Exception as e:
+        print(f"Error saving knowledge base: {e}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+def get_knowledge_base():
+    """
+    Get the process-wide knowledge base, loading or building it only when the menu
+    or documents changed. Restarts reuse the index saved under KB_CACHE_DIR.
+    If embedding fails, the BM25 fallback is kept for the same key and the
+    embedding build is retried at most once every KB_RETRY_SECONDS.
+    Returns:
+        FAISS: Vector store.
+    """
+    menu_data = load_menu_data()
+    global menu_items
+    menu_items = menu_data
+    refresh_menu_index(menu_data)
+    documents = build_knowledge_documents(menu_data)
+    
+    if KB_RETRIEVER == 'bm25':
+        key = knowledge_base_key(documents, None)
+        with _knowledge_base_lock:
+            if _knowledge_base["key"] != key:
+                _knowledge_base["key"] = key
+                _knowledge_base["store"] = BM25Retriever(documents)
+                _knowledge_base["retry_at"] = None
+            return _knowledge_base["store"]
+    
+    embeddings = get_embeddings()
+    key = knowledge_base_key(documents, embeddings)
+    
+    with _knowledge_base_lock:
+        retry_at = _knowledge_base["retry_at"]
+        if _knowledge_base["key"] == key and (retry_at is None or time.time() < retry_at):
+            return _knowledge_base["store"]
+        
+        vector_store = load_saved_knowledge_base(key, embeddings)
+        if vector_store is not None:
+            logger.debug(f"Loaded saved knowledge base {key[:12]}")
+        else:
+            vector_store = create_knowledge_base(documents, embeddings)
+            if not isinstance(vector_store, FAISS):
+                # Embedding failed; serve the fallback until the next retry
+                _knowledge_base["key"] = key
+                _knowledge_base["store"] = vector_store
+                _knowledge_base["retry_at"] = time.time() + KB_RETRY_SECONDS
+                logger.debug(f"Knowledge base {key[:12]} uses the BM25 fallback, "
+                             f"retrying embeddings in {KB_RETRY_SECONDS:.0f}s")
+                return vector_store
+            save_knowledge_base(key, vector_store)
+            logger.debug(f"Built knowledge base {key[:12]} from {len(documents)} documents "
+                         f"({embeddings.misses} embedded, {embeddings.hits} from cache)")
+            try:
+                embedding_cache.evict(keep_keys=embeddings.keys_for(documents))
+            except Exception as e:
+                print(f"Error evicting embedding cache: {e}")
         
-        return SimpleRetriever()
+        _knowledge_base["key"] = key
+        _knowledge_base["store"] = vector_store
+        _knowledge_base["retry_at"] = None
+        return vector_store
 
 # Add this function near the top of the file, after the imports
 def log_robot_api_activity(action, order_id=None, delivery_location=None, status=None, message=None, 
@@ -369,9 +553,12 @@ def log_robot_api_activity(action, order_id=None, delivery_location=None, status
         return False
 
 
-def send_robot_delivery_request(order_id, delivery_location):
+async def send_robot_delivery_request(order_id, delivery_location):
     """
     Send a robot delivery request directly to the robot API with enhanced logging
+
+    Sync code running in a worker thread (agent tools, OrderManager) calls it
+    through cl.run_sync.
     
     Args:
         order_id (str): The order ID to deliver
@@ -438,16 +625,14 @@ def send_robot_delivery_request(order_id, delivery_location):
         }
         print(f"ROBOT API PAYLOAD: {json.dumps(payload)}")
         
-        # Try direct requests approach
+        # Call the robot API without blocking the event loop
         try:
             # Make the API call
-            import requests
             print("SENDING REQUEST TO ROBOT API...")
-            response = requests.post(
-                robot_api_url,
-                headers={'Content-Type': 'application/json'},
-                json=payload,
-                timeout=15  # Increased timeout
+            response = await robot_client.start_delivery(
+                order_id,
+                delivery_location,
+                timeout=(3.05, 15)  # Increased timeout
             )
             
             # Log the complete response
@@ -503,7 +688,7 @@ def send_robot_delivery_request(order_id, delivery_location):
                     "response": response.text if hasattr(response, 'text') else "No response body",
                     "timestamp": datetime.now().isoformat()
                 }
-        except requests.exceptions.ConnectionError as conn_err:
+        except (httpx.ConnectError, httpx.ConnectTimeout) as conn_err:
             # Log connection error
             log_robot_api_activity(
                 action="delivery_request_connection_error",
@@ -520,106 +705,15 @@ def send_robot_delivery_request(order_id, delivery_location):
             print("This is likely because you're on a different network or the robot service is down.")
             print("The system will fall back to manual delivery.")
             print("="*80 + "\n")
-            
-            # FALLBACK: Try alternative direct approach
-            try:
-                print("TRYING FALLBACK DIRECT METHOD...")
-                import urllib.request
-                import json as json_lib
-                
-                # Log fallback attempt
-                log_robot_api_activity(
-                    action="delivery_request_fallback_attempt",
-                    order_id=order_id,
-                    delivery_location=delivery_location,
-                    status="attempt",
-                    message="Trying fallback urllib method after connection error",
-                    call_chain=call_chain
-                )
-                
-                # Prepare request
-                data = json_lib.dumps(payload).encode('utf-8')
-                req = urllib.request.Request(
-                    robot_api_url,
-                    data=data,
-                    headers={'Content-Type': 'application/json'},
-                    method='POST'
-                )
-                
-                # Send request
-                with urllib.request.urlopen(req, timeout=15) as response:
-                    status_code = response.getcode()
-                    response_body = response.read().decode('utf-8')
-                    
-                    print(f"FALLBACK RESPONSE STATUS: {status_code}")
-                    print(f"FALLBACK RESPONSE BODY: {response_body[:500]}")
-                    
-                    if status_code in (200, 201, 202):
-                        # Log fallback success
-                        log_robot_api_activity(
-                            action="delivery_request_fallback_success",
-                            order_id=order_id,
-                            delivery_location=delivery_location,
-                            status="success",
-                            message=f"Robot delivery successfully started for order {order_id} (fallback method)",
-                            call_chain=call_chain,
-                            response={
-                                "status_code": status_code,
-                                "body": response_body
-                            }
-                        )
-                        
-                        print("FALLBACK ROBOT DELIVERY REQUEST SUCCESSFUL!")
-                        print("="*80 + "\n")
-                        return {
-                            "status": "success",
-                            "message": f"Robot delivery successfully started for order {order_id} (fallback method)",
-                            "response": response_body,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                    else:
-                        # Log fallback error
-                        log_robot_api_activity(
-                            action="delivery_request_fallback_failed",
-                            order_id=order_id,
-                            delivery_location=delivery_location,
-                            status="error",
-                            message=f"Fallback robot API returned non-success code: {status_code}",
-                            call_chain=call_chain,
-                            response={
-                                "status_code": status_code,
-                                "body": response_body
-                            }
-                        )
-                        
-                        print(f"FALLBACK ROBOT DELIVERY REQUEST FAILED! Status code: {status_code}")
-                        print("="*80 + "\n")
-                        return {
-                            "status": "error",
-                            "message": f"Fallback robot API returned non-success code: {status_code}",
-                            "response": response_body,
-                            "timestamp": datetime.now().isoformat()
-                        }
-            except Exception as fallback_err:
-                # Log fallback error
-                log_robot_api_activity(
-                    action="delivery_request_fallback_error",
-                    order_id=order_id,
-                    delivery_location=delivery_location,
-                    status="error",
-                    message="Fallback method also failed",
-                    call_chain=call_chain,
-                    exception=fallback_err
-                )
-                
-                print(f"FALLBACK METHOD ALSO FAILED: {str(fallback_err)}")
-                return {
-                    "status": "error",
-                    "message": "Connection error: Could not reach robot delivery service (both methods failed)",
-                    "error_type": "connection_error",
-                    "error_details": f"{str(conn_err)} | Fallback: {str(fallback_err)}",
-                    "timestamp": datetime.now().isoformat()
-                }
+
+            # call_async already retried the connect failure within its budget
+            return {
+                "status": "error",
+                "message": "Connection error: Could not reach robot delivery service",
+                "error_type": "connection_error",
+                "error_details": str(conn_err),
+                "timestamp": datetime.now().isoformat()
+            }
     except Exception as e:
         # Log unexpected error
         log_robot_api_activity(
@@ -645,159 +739,51 @@ def send_robot_delivery_request(order_id, delivery_location):
             "timestamp": datetime.now().isoformat()
         }
 
-def check_robot_api_connection():
+async def check_robot_api_connection():
     """
-    Check if the robot API is accessible with improved logging
-    
+    Check if the robot API is accessible
+
+    Runs on the health monitor's schedule, so it only logs at debug level;
+    availability changes are logged once by log_robot_health_change().
+    Any answer below 500 (e.g. 404 without a status route) means the API is
+    up. Never probe by dispatching the robot.
+
     Returns:
         bool: True if accessible, False otherwise
     """
-    # Get call chain information
-    import traceback
-    call_stack = traceback.extract_stack()
-    caller = call_stack[-2]
-    call_chain = f"{caller.filename.split('/')[-1]}:{caller.lineno} in {caller.name}"
-    
-    # Start activity log
-    log_robot_api_activity(
-        action="connection_check_start",
-        status="initiated",
-        message="Starting robot API connection check",
-        call_chain=call_chain
+    # First try the status endpoint, then the base URL
+    probes = (
+        ("status endpoint", lambda: robot_client.get_status(endpoint="robot.ping")),
+        ("base URL", robot_client.ping)
     )
-    
-    print("\n" + "="*80)
-    print("ROBOT API CONNECTION CHECK STARTED")
-    print(f"TIMESTAMP: {datetime.now().isoformat()}")
-    print(f"ROBOT_SIMULATOR_URL: {ROBOT_SIMULATOR_URL}")
-    print("="*80)
-    
-    try:
-        # Try to connect to the robot API
-        import requests
+    for name, probe in probes:
         try:
-            # First try the status endpoint
-            print("Attempting to connect to robot API status endpoint...")
-            response = requests.get(
-                f"{ROBOT_SIMULATOR_URL}/api/status",
-                timeout=5
-            )
-            print(f"Robot API status endpoint response: {response.status_code}")
-            if response.status_code == 200:
-                # Log success
-                log_robot_api_activity(
-                    action="connection_check_success",
-                    status="success",
-                    message="Robot API is accessible via status endpoint",
-                    call_chain=call_chain,
-                    response={"status_code": response.status_code}
-                )
-                
-                print("Robot API is accessible via status endpoint")
-                print("="*80 + "\n")
-                return True
+            response = await probe()
         except Exception as e:
-            # Log status endpoint error
-            log_robot_api_activity(
-                action="connection_check_status_endpoint_error",
-                status="error",
-                message=f"Status endpoint error: {str(e)}",
-                call_chain=call_chain,
-                exception=e
-            )
-            
-            print(f"Status endpoint error: {str(e)}")
-            
-        # If status endpoint fails, try the main URL
-        try:
-            print("Status endpoint failed, trying base URL...")
-            response = requests.get(
-                ROBOT_SIMULATOR_URL,
-                timeout=5
-            )
-            print(f"Robot API base URL response: {response.status_code}")
-            if response.status_code == 200:
-                # Log base URL success
-                log_robot_api_activity(
-                    action="connection_check_base_url_success",
-                    status="success",
-                    message="Robot API base URL is accessible",
-                    call_chain=call_chain,
-                    response={"status_code": response.status_code}
-                )
-                
-                print("Robot API base URL is accessible")
-                print("="*80 + "\n")
-                return True
-        except Exception as e:
-            # Log base URL error
-            log_robot_api_activity(
-                action="connection_check_base_url_error",
-                status="error",
-                message=f"Base URL error: {str(e)}",
-                call_chain=call_chain,
-                exception=e
-            )
-            
-            print(f"Base URL error: {str(e)}")
-            
-        # If both fail, try a test delivery request
-        try:
-            print("Both status and base URL failed, trying a test delivery request...")
-            test_payload = {
-                "interface_name": "en7",
-                "order_id": "TEST-CONNECTION",
-                "delivery_location": "API Test"
-            }
-            response = requests.post(
-                f"{ROBOT_SIMULATOR_URL}/api/delivery/start",
-                headers={'Content-Type': 'application/json'},
-                json=test_payload,
-                timeout=5
-            )
-            print(f"Robot API test delivery response: {response.status_code}")
-            
-            result = response.status_code in (200, 201, 202, 400, 422)  # 400/422 could mean invalid data but API is up
-            
-            # Log test delivery result
-            log_robot_api_activity(
-                action="connection_check_test_delivery",
-                status="success" if result else "error",
-                message=f"Robot API connection via test delivery: {'SUCCESS' if result else 'FAILED'}",
-                call_chain=call_chain,
-                response={"status_code": response.status_code}
-            )
-            
-            print(f"Robot API connection result: {'SUCCESS' if result else 'FAILED'}")
-            print("="*80 + "\n")
-            return result
-        except Exception as e:
-            # Log test delivery error
-            log_robot_api_activity(
-                action="connection_check_test_delivery_error",
-                status="error",
-                message=f"Test delivery error: {str(e)}",
-                call_chain=call_chain,
-                exception=e
-            )
-            
-            print(f"Test delivery error: {str(e)}")
-            print("="*80 + "\n")
-            return False
-            
-    except Exception as e:
-        # Log unexpected error
-        log_robot_api_activity(
-            action="connection_check_unexpected_error",
-            status="error",
-            message=f"Robot API connection check failed: {str(e)}",
-            call_chain=call_chain,
-            exception=e
-        )
-        
-        print(f"Robot API connection check failed: {str(e)}")
-        print("="*80 + "\n")
-        return False
+            logger.debug(f"Robot API {name} error: {e}")
+            continue
+        logger.debug(f"Robot API {name} response: {response.status_code}")
+        if response.status_code < 500:
+            return True
+    return False
+
+def log_robot_health_change(snapshot):
+    """
+    Log robot API availability changes seen by the health monitor
+    
+    Args:
+        snapshot (dict): Health monitor status
+    """
+    available = snapshot.get("available")
+    log_robot_api_activity(
+        action="robot_system_available" if available else "robot_system_unavailable",
+        status="success" if available else "error",
+        message=f"Robot API is {'accessible' if available else 'not accessible'}",
+        call_chain="robot_health_monitor"
+    )
+
+# One scheduled health check per process, read by every chat session
+robot_health = RobotHealthMonitor(check_robot_api_connection, on_change=log_robot_health_change)
     
 # ----- Order Management System -----
 
@@ -818,16 +804,8 @@ class OrderManager:
             # Check for confirmation messages
             if isinstance(order_data, str):
                 # Check for confirmation phrases
-                confirmation_phrases = [
-                    "that's all", "thats all", "nothing else", "finalize", "place order",
-                    "confirm", "that is all", "looks good", "proceed", "yes", "complete",
-                    "finish", "done", "good to go", "fine", "perfect", "correct", "ok", 
-                    "okay", "sure", "yeah", "yep", "sounds good", "just that", "that's it",
-                    "that will be it", "finalize it", "that's correct"
-                ]
-                
                 order_data_lower = order_data.lower().strip()
-                if any(phrase == order_data_lower or phrase in order_data_lower for phrase in confirmation_phrases) and len(order_data_lower.split()) <= 6:
+                if scan_order_phrases(order_data_lower).has("confirm") and len(order_data_lower.split()) <= 6:
                     print("Detected confirmation message, returning verification status")
                     return {
                         "status": "confirmation_only",
@@ -1086,7 +1064,7 @@ class OrderManager:
             if not order_data.get("verification_complete", False):
                 # Generate order ID during verification if not present
                 if "id" not in order_data:
-                    order_id = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+                    order_id = new_order_id()
                     order_data["id"] = order_id
                     print(f"Generated order ID for verification: {order_id}")
                 
@@ -1152,7 +1130,7 @@ class OrderManager:
                     }
                     
                     # Use the updated helper function to update the UI with the total
-                    update_chat_ui_with_order(order_data)
+                    cl.run_sync(update_chat_ui_with_order(order_data))
                 except Exception as cart_err:
                     print(f"Error updating cart during verification: {cart_err}")
                 
@@ -1166,7 +1144,7 @@ class OrderManager:
             
             # Generate order ID if not present
             if "id" not in order_data:
-                order_data["id"] = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+                order_data["id"] = new_order_id()
             
             # Add context data
             context = cl.user_session.get("context", {})
@@ -1279,13 +1257,14 @@ class OrderManager:
                 # METHOD 3: REST API approach
                 if not success:
                     try:
-                        order_response = requests.post(
-                            f"{DASHBOARD_URL}/api/place-order", 
-                            json=order_data,
-                            timeout=5
+                        order_response = http_client.post(
+                            f"{DASHBOARD_URL}/api/place-order",
+                            endpoint="dashboard.api",
+                            json=order_data
                         )
-                        cart_response = requests.post(
-                            f"{DASHBOARD_URL}/api/update-cart", 
+                        cart_response = http_client.post(
+                            f"{DASHBOARD_URL}/api/update-cart",
+                            endpoint="dashboard.api",
                             json={
                                 "type": "cart_update",
                                 "items": [
@@ -1300,8 +1279,7 @@ class OrderManager:
                                 ],
                                 "order_id": order_data["id"],
                                 "total": order_data.get("total", 0)
-                            },
-                            timeout=5
+                            }
                         )
                         if order_response.status_code == 200 or cart_response.status_code == 200:
                             print(f"Order API response: {order_response.status_code}, Cart API response: {cart_response.status_code}")
@@ -1400,10 +1378,10 @@ class OrderManager:
                         print(f"Attempting robot delivery for order {order_data['id']} to {order_data.get('delivery_location', '')}")
                         
                         # Call our robot delivery function
-                        delivery_result = send_robot_delivery_request(
+                        delivery_result = cl.run_sync(send_robot_delivery_request(
                             order_id=order_data["id"],
                             delivery_location=order_data.get("delivery_location", "")
-                        )
+                        ))
                         
                         print(f"Robot delivery attempt complete. Result: {delivery_result.get('status', 'unknown')}")
                         
@@ -1479,10 +1457,10 @@ class OrderManager:
                     try:
                         # Call robot delivery and update UI accordingly
                         print(f"Attempting robot delivery for standard delivery order {order_data['id']}")
-                        delivery_result = send_robot_delivery_request(
+                        delivery_result = cl.run_sync(send_robot_delivery_request(
                             order_id=order_data["id"],
                             delivery_location=order_data.get("delivery_location", "")
-                        )
+                        ))
                         
                         print(f"Robot API call for standard delivery: {delivery_result.get('status', 'unknown')}")
                         
@@ -1625,10 +1603,10 @@ class OrderManager:
                 
                 # Robot delivery logic (fallback)
                 if "delivery" in order_data.get("delivery_type", "").lower():
-                    delivery_result = send_robot_delivery_request(
+                    delivery_result = cl.run_sync(send_robot_delivery_request(
                         order_id=order_data["id"],
                         delivery_location=order_data.get("delivery_location", "")
-                    )
+                    ))
                     if delivery_result.get("status") == "success":
                         order_data["delivery_status"] = "in_progress"
                         order_data["robot_delivery"] = True
@@ -1888,10 +1866,10 @@ class OrderManager:
                 print(f"Error sending update via cl.send_to_parent: {e}")
                 
             try:
-                response = requests.put(
+                response = http_client.put(
                     f"{DASHBOARD_URL}/api/orders/{order_id}",
-                    json={"status": new_status, "items": items},
-                    timeout=5
+                    endpoint="dashboard.api",
+                    json={"status": new_status, "items": items}
                 )
                 print(f"Update order API response: {response.status_code}")
             except Exception as e:
@@ -1935,10 +1913,10 @@ def navigate_to_page(destination):
             
         # Method 2: Call API endpoint
         try:
-            response = requests.post(
-                f"{DASHBOARD_URL}/api/navigate", 
-                json={"destination": destination}, 
-                timeout=3
+            response = http_client.post(
+                f"{DASHBOARD_URL}/api/navigate",
+                endpoint="dashboard.api",
+                json={"destination": destination}
             )
             print(f"Navigation API response: {response.status_code}")
         except Exception as e:
@@ -1959,158 +1937,63 @@ def list_menu_items(query:str = "") -> str:
         result += f"ID: {item['id']} - {item['name']} (${item['price']:.2f})\n"
     return result
 
+def refresh_menu_index(menu_data):
+    """
+    Rebuild the menu search index and order phrase matcher if the menu changed.
+    Args:
+        menu_data (list): Menu items.
+    Returns:
+        MenuSearchIndex: Index for this menu.
+    """
+    signature = hashlib.sha256(json.dumps(menu_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    with _menu_index_lock:
+        if _menu_index["signature"] != signature:
+            _menu_index["index"] = MenuSearchIndex(menu_data)
+            _menu_index["phrases"] = build_order_matcher(menu_data)
+            _menu_index["signature"] = signature
+            logger.debug(f"Built menu search index for {len(menu_data)} items")
+        return _menu_index["index"]
+
+def scan_order_phrases(text):
+    """
+    Find order intents, delivery and payment terms, table numbers and menu items in a message.
+    Args:
+        text (str): User message.
+    Returns:
+        PhraseMatches: Phrase occurrences, see app/utils/order_phrases.py for the labels.
+    """
+    if _menu_index["phrases"] is None:
+        refresh_menu_index(menu_items)
+    return _menu_index["phrases"].scan(text)
+
 def search_menu(query):
     """
-    Search menu items based on query with improved matching.
+    Search menu items through the precomputed menu index.
     Args:
         query (str): Search query.
     Returns:
-        str: Search results.
+        str: Search results, best matches first.
     """
     try:
         if not query or not isinstance(query, str):
             return "Please provide a search term"
-            
-        print(f"Searching menu for: '{query}'")
-        print(f"Available menu items: {[item['name'] for item in menu_items]}")
         
         # If menu is empty, return a helpful message
         if not menu_items:
             return "Our menu is currently being updated. Please check back soon."
-            
-        query_lower = query.lower().strip()
-        query_terms = []
-        
-        # Handle multiple search terms separated by commas
-        if ',' in query_lower:
-            query_terms = [term.strip() for term in query_lower.split(',')]
-        else:
-            # Handle space-separated terms, but intelligently
-            # For example "gluten free" should be one term, not two
-            common_phrases = ["gluten free", "dairy free", "sugar free", 
-                             "almond milk", "soy milk", "oat milk",
-                             "avocado toast", "ice coffee", "iced coffee"]
-            
-            # Check if any common phrases are in the query
-            remaining_query = query_lower
-            for phrase in common_phrases:
-                if phrase in remaining_query:
-                    query_terms.append(phrase)
-                    remaining_query = remaining_query.replace(phrase, "")
-            
-            # Add remaining individual words
-            remaining_terms = [term.strip() for term in remaining_query.split() if term.strip()]
-            query_terms.extend(remaining_terms)
-        
-        print(f"Parsed search terms: {query_terms}")
-        
-        # Search for matching items
-        matching_items = []
-        match_reasons = {}  # Store why each item matched
         
-        # First pass: Look for exact matches in name, description, category
-        for item in menu_items:
-            item_name = item["name"].lower()
-            item_desc = item.get("description", "").lower()
-            item_category = item["category"].lower()
-            
-            # Check each query term separately
-            for term in query_terms:
-                if term in item_name:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = f"Name contains '{term}'"
-                        print(f"Name match: {item['name']} matched '{term}'")
-                elif term in item_desc:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = f"Description mentions '{term}'"
-                        print(f"Description match: {item['name']} matched '{term}'")
-                elif term in item_category:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = f"Category matches '{term}'"
-                        print(f"Category match: {item['name']} matched '{term}'")
-                        
-        # Second pass: Look for dietary matches
-        for term in query_terms:
-            if any(word in term for word in ["vegetarian", "vegetable", "veggie"]):
-                vegetarian_items = [item for item in menu_items if item.get("vegetarian")]
-                for item in vegetarian_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Vegetarian option"
-                        print(f"Dietary match: {item['name']} is vegetarian")
-                        
-            if any(word in term for word in ["vegan", "plant", "dairy-free"]):
-                vegan_items = [item for item in menu_items if item.get("vegan")]
-                for item in vegan_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Vegan option"
-                        print(f"Dietary match: {item['name']} is vegan")
-                        
-            if any(word in term for word in ["gluten", "gluten-free", "gluten free", "gf"]):
-                gf_items = [item for item in menu_items if item.get("gluten_free")]
-                for item in gf_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Gluten-free option"
-                        print(f"Dietary match: {item['name']} is gluten-free")
-                        
-            # Check for category matches
-            if any(term == cat for cat in ["coffee", "drink", "drinks", "beverage", "beverages"]):
-                coffee_items = [item for item in menu_items if item["category"].lower() == "coffee"]
-                for item in coffee_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Coffee beverage"
-                        
-            if any(term == cat for cat in ["food", "eat", "meal", "snack"]):
-                food_items = [item for item in menu_items if item["category"].lower() in ["food", "pastries"]]
-                for item in food_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Food item"
-                        
-            if any(term == cat for cat in ["pastry", "pastries", "bakery", "baked"]):
-                pastry_items = [item for item in menu_items if item["category"].lower() == "pastries"]
-                for item in pastry_items:
-                    if item not in matching_items:
-                        matching_items.append(item)
-                        match_reasons[item["id"]] = "Pastry item"
-        
-        # Third pass: Look for fuzzy matches if we didn't find anything yet
-        if not matching_items:
-            print("No exact matches, trying fuzzy matching")
-            for item in menu_items:
-                item_name = item["name"].lower()
-                item_parts = item_name.split()
-                
-                for term in query_terms:
-                    # Check if term is similar to any part of the item name
-                    term_parts = term.split()
-                    for term_part in term_parts:
-                        if len(term_part) <= 3:  # Skip short words like "the", "and"
-                            continue
-                            
-                        for item_part in item_parts:
-                            # Simple fuzzy match - if term part is contained in item part
-                            if len(term_part) > 3 and term_part in item_part:
-                                if item not in matching_items:
-                                    matching_items.append(item)
-                                    match_reasons[item["id"]] = f"Similar to '{term}'"
-                                    print(f"Fuzzy match: {item['name']} similar to '{term}'")
-                                    break
+        index = _menu_index["index"] or refresh_menu_index(menu_items)
+        matches = index.search(query)
+        logger.debug(f"Menu search for '{query}': {len(matches)} matches")
         
-        # If still no matches but the query contains legitimate words, suggest popular items
-        if not matching_items and any(len(term) > 3 for term in query_terms):
-            popular_items = [item for item in menu_items if item.get("popular")]
+        # If no matches but the query contains legitimate words, suggest popular items
+        if not matches and any(len(term) > 3 for term in parse_query(query)):
+            popular_items = index.popular_items(5)
             
             # If we have popular items, suggest them instead
             if popular_items:
                 results = "We didn't find an exact match for your search. Here are some of our popular items:\n\n"
-                for item in popular_items[:5]:  # Show up to 5 popular items
+                for item in popular_items:
                     results += f"• **{item['name']}** - ${item['price']:.2f}\n"
                     if "description" in item:
                         results += f"  {item['description']}\n"
@@ -2118,7 +2001,7 @@ def search_menu(query):
                 return results
         
         # If STILL no matches or query too vague, show menu categories
-        if not matching_items:
+        if not matches:
             categories = set(item["category"] for item in menu_items)
             results = "I couldn't find specific items matching your query. Here are our menu categories:\n\n"
             for category in categories:
@@ -2126,19 +2009,14 @@ def search_menu(query):
             results += "\nYou can search for items in a specific category or ask to see all items."
             return results
             
-        # Format results
-        if not matching_items:
-            print("No matches found after all attempts.")
-            return "No menu items found matching your query."
-            
-        results = f"Found {len(matching_items)} menu items matching your query:\n\n"
+        results = f"Found {len(matches)} menu items matching your query:\n\n"
         
-        for item in matching_items:
+        for item, score, reasons in matches:
             results += f"• **{item['name']}** (ID: {item['id']}) - ${item['price']:.2f}\n"
             
-            # Add match reason if available
-            if item["id"] in match_reasons:
-                results += f"  *{match_reasons[item['id']]}*\n"
+            # Add match reasons
+            if reasons:
+                results += f"  *{'; '.join(reasons)}*\n"
                 
             if "description" in item and item["description"]:
                 results += f"  {item['description']}\n"
@@ -2175,6 +2053,141 @@ Phone: (555) 123-4567
 Email: info@neocafe.com
 """
 
+def show_menu():
+    """
+    Format the whole menu by category.
+    Returns:
+        str: Menu listing.
+    """
+    if not menu_items:
+        return "Our menu is currently being updated. Please check back soon."
+    
+    categories = {}
+    for item in menu_items:
+        categories.setdefault(item["category"], []).append(item)
+    
+    results = "**Neo Cafe Menu:**\n"
+    for category, items in categories.items():
+        results += f"\n**{category.title()}**\n"
+        for item in items:
+            results += f"• {item['name']} - ${item['price']:.2f}\n"
+    results += "\nAsk me about any item, or tell me what you'd like to order."
+    return results
+
+# ----- Fast path: questions answered without the agent -----
+
+GREETING_PATTERN = re.compile(
+    r"^\s*(hi|hello|hey|greetings|good (morning|afternoon|evening)|morning|afternoon)"
+    r"(\s+(there|neo cafe|everyone|all))?\s*[!.]*\s*$", re.IGNORECASE)
+# Store hours and order status only answer messages that start as such a
+# question, so "a latte for pickup in 2 hours" or "have the robot deliver
+# ORD-... when it's ready" go on to the order and delivery handling
+STORE_HOURS_PATTERN = re.compile(
+    r"^\s*(?:(?:hi|hello|hey)[,!.]?\s+)?(?:(?:so|and|also|please)\s+)?(?:"
+    r"(?:what(?:'s| is| are|'re) )?(?:your |the )?(?:opening |store |business )?(?:hours|opening times?)(?: of operation)?"
+    r"|(?:when|what time) (?:are|do|does) (?:you|neo cafe|the (?:cafe|store|shop)) (?:open|close)"
+    r"|(?:are|is) (?:you|neo cafe|the (?:cafe|store|shop)) (?:still )?(?:open|closed)"
+    r"|where are you(?: located)?|what(?:'s| is) your (?:address|location|phone number))\b", re.IGNORECASE)
+MENU_OVERVIEW_PATTERN = re.compile(
+    r"^\s*(please\s+)?((can|could) (i|you|we)\s+)?((show|see|view|get|give|display|list)\s+)?(me\s+|us\s+)?"
+    r"((the|your|full|whole|entire)\s+)*menu(\s+please)?\s*[?!.]*\s*$"
+    r"|^\s*what(?:'s| is) on (the|your) menu( today)?\s*[?!.]*\s*$", re.IGNORECASE)
+MENU_SEARCH_PATTERN = re.compile(
+    r"^\s*(?:do you (?:have|serve|sell|offer|carry)|have you got|search (?:the |your )?menu for)"
+    r"\s+(?:any\s+|a\s+|an\s+|some\s+)?(?P<query>[\w' ,-]+?)\s*(?:on (?:the|your) menu|options)?\s*[?!.]*\s*$"
+    r"|^\s*what (?P<diet>vegan|vegetarian|gluten[- ]free|dairy[- ]free) (?:options|items|drinks|food|things)"
+    r"(?: do you have)?\s*[?!.]*\s*$"
+    r"|^\s*how much (?:is|are|does|do|for)\s+(?:a\s+|an\s+|the\s+|one\s+|your\s+)?(?P<price>[\w' -]+?)"
+    r"(?:\s+cost)?\s*[?!.]*\s*$", re.IGNORECASE)
+ORDER_STATUS_PATTERN = re.compile(
+    r"^\s*(?:(?:can|could) you\s+)?(?:please\s+)?"
+    r"(?:what(?:'s| is) the status|status|where(?:'s| is)|track|check|is|has|how(?:'s| is))\b"
+    r"|\bstatus\s*[?!.]*\s*$", re.IGNORECASE)
+
+# Longest message the store hours route answers; longer ones are open-ended
+STORE_HOURS_MAX_WORDS = 12
+
+def match_greeting(text):
+    """Route plain greetings."""
+    return {} if GREETING_PATTERN.match(text) else None
+
+def match_store_hours(text):
+    """Route short questions about opening hours or the store location, unless they also order something."""
+    if len(text.split()) > STORE_HOURS_MAX_WORDS or not STORE_HOURS_PATTERN.search(text):
+        return None
+    phrases = scan_order_phrases(text.lower())
+    if phrases.has("menu_item") or phrases.has("robot_delivery") or phrases.has("delivery_type"):
+        return None
+    return {}
+
+def match_menu_overview(text):
+    """Route requests for the whole menu."""
+    return {} if MENU_OVERVIEW_PATTERN.match(text) else None
+
+def match_menu_search(text):
+    """Route "do you have X" / "how much is X" questions that the menu index can answer."""
+    match = MENU_SEARCH_PATTERN.match(text)
+    if not match or not menu_items:
+        return None
+    query = next(group for group in match.group("query", "diet", "price") if group)
+    index = _menu_index["index"] or refresh_menu_index(menu_items)
+    # Leave questions about things that are not on the menu to the agent
+    if not index.search(query, limit=1):
+        return None
+    return {"query": query}
+
+def match_order_status(text):
+    """Route status questions that name an order ID."""
+    match = ORDER_ID_PATTERN.search(text)
+    if not match:
+        return None
+    # A robot dispatch with a destination is for the direct delivery handling
+    text_lower = text.lower()
+    if "deliver" in text_lower and "robot" in text_lower and DELIVERY_DESTINATION_PATTERN.search(text):
+        return None
+    if ORDER_STATUS_PATTERN.search(text) or text.strip().upper() == match.group(0).upper():
+        return {"order_id": match.group(0).upper()}
+    return None
+
+intent_router = IntentRouter()
+intent_router.add("greeting", match_greeting, lambda: "Hello! Welcome to Neo Cafe. How can I help you today?")
+intent_router.add("store_hours", match_store_hours, get_store_hours)
+intent_router.add("order_status", match_order_status, lambda order_id: OrderManager.get_order_status(order_id))
+intent_router.add("menu_overview", match_menu_overview, show_menu)
+intent_router.add("menu_search", match_menu_search, lambda query: search_menu(query))
+
+# ----- Response cache: agent answers to repeated questions -----
+
+# Answers that depend on who asks, on the conversation so far, or that change an order
+UNCACHEABLE_PATTERN = re.compile(
+    r"\b(i|im|i'm|ive|i've|i'd|i'll|me|my|mine|we|our|us|you said"
+    r"|order|orders|buy|purchase|cancel|add|remove|change|update|deliver|delivery|robot|pay|payment|checkout"
+    r"|it|that|those|them|this|these|again|else)\b", re.IGNORECASE)
+
+response_cache = ResponseCache()
+
+def is_cacheable_question(message):
+    """
+    Check whether the agent's answer to a message may be reused for other sessions.
+    Args:
+        message (str): User message.
+    Returns:
+        bool: False for personal, order-changing or context-dependent messages.
+    """
+    return not UNCACHEABLE_PATTERN.search(message) and not ORDER_ID_PATTERN.search(message)
+
+def response_cache_scope(context):
+    """
+    Get the response cache version and audience for a session.
+    Args:
+        context (dict): Session context.
+    Returns:
+        tuple: (menu and knowledge base version, "guest" or the signed-in username)
+    """
+    version = f"{_menu_index['signature']}:{_knowledge_base['key']}"
+    audience = context.get("username", "guest") if context.get("is_authenticated") else "guest"
+    return version, audience
+
 # Enhanced parse_order_text function to better detect robot delivery requests
 def parse_order_text(text):
     """
@@ -2187,17 +2200,10 @@ def parse_order_text(text):
     try:
         # Quick check if this is just a confirmation message, not a new order
         text_lower = text.lower().strip()
-        confirmation_phrases = [
-            "that's all", "thats all", "nothing else", "finalize", "place order",
-            "confirm", "that is all", "looks good", "proceed", "yes", "complete",
-            "finish", "done", "good to go", "fine", "perfect", "correct", "ok", 
-            "okay", "sure", "yeah", "yep", "sounds good", "just that", "that's it",
-            "that looks right", "place my order", "go ahead", "that's correct",
-            "that will be it", "that will be all", "finalize it", "that'll be it"
-        ]
+        phrases = scan_order_phrases(text_lower)
         
         # If this is just a confirmation message with no menu items, raise a special error
-        if any(phrase == text_lower or phrase in text_lower for phrase in confirmation_phrases) and len(text_lower.split()) <= 5:
+        if phrases.has("confirm") and len(text_lower.split()) <= 5:
             return {
                 "is_confirmation": True,
                 "items": []  # Empty items list
@@ -2218,61 +2224,23 @@ def parse_order_text(text):
         delivery_type = ""  # Empty to trigger follow-up question
         
         # First explicitly check for robot delivery with expanded terms
-        robot_delivery_terms = [
-            "robot", "robot delivery", "delivery robot", "automated delivery", 
-            "robot courier", "robotic delivery", "drone", "automated", "autonomous delivery",
-            "robot bring", "robot send", "send robot", "deliver with robot", "deliver by robot",
-            "robot-delivery", "delivery-robot", "robot delivery service", "autonomous",
-            "robo delivery", "robo", "ai delivery", "have a robot", "send a robot",
-            # Adding more terms to increase detection
-            "automatic", "automatic delivery", "auto delivery", "robotic", "bot",
-            "delivery bot", "smart delivery", "tech delivery", "high tech"
-        ]
-        
-        # Check if any robot delivery term is in the text
-        for term in robot_delivery_terms:
-            if term in text_lower:
-                print(f"Detected robot delivery term: '{term}' in text")
-                delivery_type = "robot-delivery"
-                break
+        robot_term = phrases.first("robot_delivery")
+        if robot_term:
+            print(f"Detected robot delivery term: '{robot_term}' in text")
+            delivery_type = "robot-delivery"
         
         # If no explicit robot delivery term found, check for other delivery types
         if not delivery_type:
-            delivery_terms = {
-                "dine in": "dine-in",
-                "dine-in": "dine-in", 
-                "dinein": "dine-in",
-                "table": "dine-in",
-                "sit": "dine-in",
-                "restaurant": "dine-in",
-                "pickup": "pickup",
-                "pick up": "pickup",
-                "pick-up": "pickup",
-                "takeout": "pickup",
-                "take out": "pickup",
-                "take-out": "pickup",
-                "to go": "pickup",
-                "delivery": "delivery",
-                "deliver": "delivery", 
-                "bring to": "delivery",
-                "send to": "delivery"
-            }
-            
-            for term, dtype in delivery_terms.items():
-                if term in text_lower:
-                    delivery_type = dtype
-                    break
+            delivery_type = phrases.first("delivery_type", "")
         
         # Extract delivery location
         delivery_location = ""
         
         # IMPROVED TABLE EXTRACTION for dine-in
-        if "table" in text_lower:
-            # Use regex to find table numbers more reliably
-            import re
-            table_matches = re.findall(r'table\s*(\d+)', text_lower)
-            if table_matches:
-                delivery_location = f"Table {table_matches[0]}"
+        if phrases.has("table"):
+            table_number = phrases.number_after("table")
+            if table_number:
+                delivery_location = f"Table {table_number}"
                 print(f"Extracted table number from text: {delivery_location}")
             elif any(part.isdigit() for part in text_lower.split()):
                 for i, part in enumerate(text_lower.split()):
@@ -2315,45 +2283,19 @@ def parse_order_text(text):
             # Fallback address extraction - look for common address patterns
             if not delivery_location:
                 # Look for numeric addresses (e.g. "123 Main St")
-                import re
-                address_match = re.search(r'\b\d+\s+[a-zA-Z\s]+(?:street|st|avenue|ave|road|rd|lane|ln|drive|dr|circle|cir|court|ct|place|pl|boulevard|blvd)\b', text_lower, re.IGNORECASE)
+                address_match = STREET_ADDRESS_PATTERN.search(text_lower)
                 if address_match:
                     delivery_location = address_match.group().capitalize()
                     print(f"Found address with street number: {delivery_location}")
                 else:
                     # Try simpler pattern - just a number followed by words
-                    address_match = re.search(r'\b\d+\s+[a-zA-Z\s]{5,30}\b', text_lower)
+                    address_match = LOOSE_ADDRESS_PATTERN.search(text_lower)
                     if address_match:
                         delivery_location = address_match.group().capitalize()
                         print(f"Found potential address: {delivery_location}")
         
         # Extract payment method with improved detection
-        payment_method = ""
-        payment_terms = {
-            "credit card": "Credit Card",
-            "credit": "Credit Card",
-            "card": "Credit Card",
-            "visa": "Credit Card",
-            "mastercard": "Credit Card",
-            "debit": "Credit Card",
-            "cash": "Cash",
-            "money": "Cash",
-            "bills": "Cash",
-            "dollars": "Cash",
-            "mobile payment": "Mobile Payment",
-            "mobile": "Mobile Payment",
-            "apple pay": "Mobile Payment",
-            "google pay": "Mobile Payment",
-            "samsung pay": "Mobile Payment",
-            "phone": "Mobile Payment",
-            "venmo": "Mobile Payment",
-            "paypal": "Mobile Payment"
-        }
-        
-        for term, method in payment_terms.items():
-            if term in text_lower:
-                payment_method = method
-                break
+        payment_method = phrases.first("payment_method", "")
         
         # Special handling for "classic latte" case
         if "classic latte" in text_lower or "classic" in text_lower and "latte" in text_lower:
@@ -2370,6 +2312,7 @@ def parse_order_text(text):
         # If we haven't found a "classic latte", continue with regular parsing
         if not order_items:
             # Process menu items with improved matching for other items
+            mentioned_ids = set(phrases.values("menu_item_variant"))
             for item in menu_items:
                 item_name_lower = item["name"].lower()
                 
@@ -2377,21 +2320,8 @@ def parse_order_text(text):
                 if item_name_lower == "latte" and any(item["item_id"] == item_id for item_id in [i["item_id"] for i in order_items]):
                     continue
                 
-                # Try different ways the item might appear in text
-                variations = [
-                    item_name_lower,
-                    item_name_lower.replace(" ", ""),  # No spaces
-                    item_name_lower.replace("-", ""),  # No hyphens
-                    item_name_lower.replace(" ", "-"),  # Spaces as hyphens
-                ]
-                
-                found = False
-                for variation in variations:
-                    if variation in text_lower:
-                        found = True
-                        break
-                        
-                if found:
+                # The name, or it without spaces/hyphens, appears in the text
+                if item["id"] in mentioned_ids:
                     # Try to find quantity before item name
                     quantity = 1
                     # Look for numeric quantities
@@ -2489,6 +2419,186 @@ def parse_order_text(text):
         print(f"Parse order error details: {e}")
         raise ValueError(f"Could not parse order text: {str(e)}")
         
+# Model that reads single order details the slot parser could not
+ORDER_SLOT_LLM_MODEL = os.environ.get('ORDER_SLOT_LLM_MODEL', 'gpt-3.5-turbo')
+# Seconds the slot LLM may take before the question is asked again
+ORDER_SLOT_LLM_TIMEOUT = float(os.environ.get('ORDER_SLOT_LLM_TIMEOUT', '8'))
+# Times an unanswered slot is asked again before messages go to the agent
+ORDER_SLOT_MAX_REPROMPTS = int(os.environ.get('ORDER_SLOT_MAX_REPROMPTS', '2'))
+_slot_llm = {"llm": None}
+
+def get_slot_llm():
+    """
+    Get the process-wide LLM used for order details the parser missed.
+    Returns:
+        ChatOpenAI: Chat model at temperature 0, or None if it cannot be created.
+    """
+    if _slot_llm["llm"] is None:
+        try:
+            _slot_llm["llm"] = ChatOpenAI(temperature=0, model=ORDER_SLOT_LLM_MODEL,
+                                          timeout=ORDER_SLOT_LLM_TIMEOUT, max_retries=0)
+        except Exception as e:
+            print(f"Error initializing order slot LLM: {e}")
+            return None
+    return _slot_llm["llm"]
+
+def extract_slot_with_llm(slot, text, order):
+    """
+    Ask the LLM for one order detail the slot parser could not read.
+    Args:
+        slot (str): Slot the user was asked for.
+        text (str): User message.
+        order (dict): Order so far.
+    Returns:
+        str: Slot value, or None.
+    """
+    llm = get_slot_llm()
+    if llm is None:
+        return None
+    try:
+        reply = llm.invoke(llm_slot_prompt(slot, text, order))
+        return parse_llm_slot(slot, getattr(reply, "content", reply), order)
+    except Exception as e:
+        print(f"Order slot LLM error: {e}")
+        return None
+
+def record_order_turn(path, slot, filled, timings):
+    """
+    Count and log one slot-filling turn.
+    Args:
+        path (str): "order_slots", "order_slots_llm" or "order_slots_reprompt".
+        slot (str): Slot the user was asked for.
+        filled (dict): Slots filled this turn.
+        timings (dict): Seconds per step.
+    """
+    total = sum(timings.values())
+    intent_router.record(path, total)
+    steps = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items())
+    logger.info(f"Order turn [{slot}] filled {sorted(filled) or 'nothing'} via {path} "
+                f"in {total * 1000:.1f} ms ({steps})")
+
+async def handle_order_slot_turn(order_in_progress, message):
+    """
+    Advance an incomplete order with the user's answer.
+    Slots are filled from the parsed message. The LLM is asked for the asked slot
+    only when parsing finds nothing, and if that fails too the question is asked again,
+    at most ORDER_SLOT_MAX_REPROMPTS times. Cancelling ends the order; questions that
+    the fast path answers, and anything after the last re-prompt, go on to the router
+    and the agent with the order kept in progress.
+    Args:
+        order_in_progress (dict): Incomplete order response from place_order.
+        message (str): User message.
+    Returns:
+        bool: True if the turn was handled, False to leave the message to the agent.
+    """
+    asked = order_in_progress.get("missing_field", "")
+    if asked not in SLOTS:
+        return False
+    order_so_far = dict(order_in_progress.get("order_so_far") or {})
+    timings = {}
+    path = "order_slots"
+    
+    phrases = scan_order_phrases(message.lower())
+    start = time.perf_counter()
+    if asked == "items":
+        try:
+            parsed = parse_order_text(message)
+        except ValueError:
+            parsed = {}
+        filled = {}
+        if parsed.get("items") and not parsed.get("is_confirmation"):
+            filled["items"] = parsed["items"]
+            for slot in SLOTS[1:]:
+                if parsed.get(slot) and not order_so_far.get(slot):
+                    filled[slot] = parsed[slot]
+    else:
+        filled = parse_slots(phrases, message, order_so_far, asked)
+    timings["parse"] = time.perf_counter() - start
+    
+    # Only a message that answers nothing is a cancellation. An address is
+    # read from the whole message, so it only counts when it has a number
+    answered = {slot: value for slot, value in filled.items()
+                if not (slot == "delivery_location" and value == message.strip()
+                        and not any(char.isdigit() for char in value))}
+    if not answered and phrases.has_word("slot_cancel"):
+        cl.user_session.set("order_in_progress", None)
+        record_order_turn("order_slots_cancel", asked, {}, timings)
+        user_message = "I've canceled your order. Is there anything else I can help you with?"
+        track_message(user_message, is_user=False)
+        await cl.Message(content=user_message).send()
+        return True
+    
+    if asked == "items" and not filled:
+        # Not a list of items; the agent can work out what the user wants
+        return False
+    
+    reprompts = order_in_progress.get("reprompts", 0)
+    if asked not in filled:
+        if reprompts >= ORDER_SLOT_MAX_REPROMPTS or intent_router.match(message):
+            # Not an answer to the question; keep the order for a later answer
+            if filled:
+                cl.user_session.set("order_in_progress", dict(order_in_progress, order_so_far={**order_so_far, **filled}))
+            return False
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(
+                cl.make_async(extract_slot_with_llm)(asked, message, order_so_far),
+                timeout=ORDER_SLOT_LLM_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            print(f"Order slot LLM timed out after {ORDER_SLOT_LLM_TIMEOUT:g}s")
+            value = None
+        timings["llm"] = time.perf_counter() - start
+        path = "order_slots_llm"
+        if value:
+            filled[asked] = value
+    
+    order_so_far.update(filled)
+    
+    if asked not in filled:
+        # Keep what was understood and ask again
+        record_order_turn("order_slots_reprompt", asked, filled, timings)
+        cl.user_session.set("order_in_progress", dict(order_in_progress, order_so_far=order_so_far,
+                                                      reprompts=reprompts + 1))
+        user_message = f"Sorry, I didn't catch that. {slot_prompt(asked, order_so_far)}"
+        track_message(user_message, is_user=False)
+        await cl.Message(content=user_message).send()
+        return True
+    
+    start = time.perf_counter()
+    response = await cl.make_async(OrderManager.place_order)(order_so_far)
+    timings["place_order"] = time.perf_counter() - start
+    record_order_turn(path, asked, filled, timings)
+    
+    # Stay in the flow while fields are missing or the order awaits verification
+    if response.get("status") in ("incomplete", "verification"):
+        cl.user_session.set("order_in_progress", response)
+    else:
+        cl.user_session.set("order_in_progress", None)
+    
+    user_message = OrderManager.handle_order_response(response)
+    track_message(user_message, is_user=False)
+    await cl.Message(content=user_message).send()
+    return True
+
+def place_order_tool(order_data):
+    """
+    PlaceOrderTool entry point for the agent.
+    An incomplete order is kept in the session, so the user's next answers are
+    handled by the slot filler instead of another agent call.
+    Args:
+        order_data (str or dict): Order from the agent.
+    Returns:
+        str: Message for the agent to relay.
+    """
+    response = OrderManager.place_order(order_data)
+    if isinstance(response, dict) and response.get("status") in ("incomplete", "verification"):
+        try:
+            cl.user_session.set("order_in_progress", response)
+        except Exception as e:
+            print(f"Error saving order in progress: {e}")
+    return OrderManager.handle_order_response(response)
+
 def query_knowledge_base(query):
     """
     Query the vector store for relevant information.
@@ -2699,6 +2809,91 @@ def save_conversation_message(session_id, content, is_user=False):
 
 # ----- LangChain Agent Setup -----
 
+# "langchain", or "fake" for an offline agent that streams canned answers
+CHAT_AGENT = os.environ.get('CHAT_AGENT', 'langchain')
+
+def fake_agent():
+    """
+    Offline agent answering from the menu search, streamed like the real one
+
+    Returns:
+        FakeStreamingAgent: The agent
+    """
+    return FakeStreamingAgent(tools=[("SearchMenuTool", search_menu)])
+
+async def run_agent_streaming(agent, message, timeout=30):
+    """
+    Run the agent and stream its answer into a chat message as it is generated
+
+    Tool calls are shown as steps while they run. Time to first token is
+    logged with the other stream timings. If the agent fails or times out,
+    the partial reply is removed and open steps are closed before the error
+    is raised, so the caller's fallback message is the only answer shown.
+
+    Args:
+        agent (object): LangChain agent or FakeStreamingAgent
+        message (str): User message
+        timeout (float): Seconds to wait for the agent
+
+    Returns:
+        str: The agent's response
+    """
+    stream = ReplyStream(asyncio.get_running_loop())
+    handler = StreamingCallbackHandler(stream)
+    reply = cl.Message(content="")
+    steps = {}
+
+    async def pump():
+        async for event in stream.events():
+            try:
+                if event[0] == "token":
+                    await reply.stream_token(event[1])
+                elif event[0] == "step_start":
+                    _, run_id, name, tool_input = event
+                    step = cl.Step(name=name, type="tool")
+                    step.input = tool_input
+                    steps[run_id] = step
+                    await step.send()
+                elif event[0] == "step_end":
+                    _, run_id, output, error = event
+                    step = steps.pop(run_id, None)
+                    if step is not None:
+                        step.output = f"Error: {error}" if error else output
+                        await step.update()
+            except Exception as e:
+                logger.error(f"Error streaming reply event {event[0]}: {e}")
+
+    pump_task = asyncio.create_task(pump())
+    completed = False
+    try:
+        response = await asyncio.wait_for(
+            cl.make_async(agent.run)(message, callbacks=[handler]),
+            timeout=timeout
+        )
+        completed = True
+    finally:
+        stream.close()
+        await pump_task
+        if not completed:
+            try:
+                for step in steps.values():
+                    step.output = "Stopped"
+                    await step.update()
+                if stream.tokens:
+                    await reply.remove()
+            except Exception as e:
+                logger.error(f"Error discarding partial reply: {e}")
+        metrics = stream.metrics()
+        ttft = f"{metrics['ttft_ms']:.0f} ms" if metrics["ttft_ms"] is not None else "none"
+        total = f"{metrics['total_ms']:.0f} ms" if metrics["total_ms"] is not None else "none"
+        logger.info(f"Agent stream: TTFT {ttft}, total {total}, "
+                    f"{metrics['tokens']}/{metrics['llm_tokens']} tokens shown, {metrics['steps']} tool steps")
+
+    # The final message text is the agent's parsed answer
+    reply.content = response
+    await reply.send()
+    return response
+
 def initialize_agent_safely(context):
     """
     Initialize the LangChain agent with better error handling
@@ -2709,13 +2904,16 @@ def initialize_agent_safely(context):
     Returns:
         object or None: The initialized agent or None if initialization failed
     """
+    if CHAT_AGENT == "fake":
+        return fake_agent()
+
     try:
         logger.debug("Starting agent initialization")
         
-        # Create knowledge base
-        vector_store = create_knowledge_base()
+        # Shared knowledge base, built once per process
+        vector_store = get_knowledge_base()
         cl.user_session.set("vector_store", vector_store)
-        logger.debug("Knowledge base created successfully")
+        logger.debug("Knowledge base ready")
         
         # Initialize memory
         memory = ConversationBufferMemory(
@@ -2752,7 +2950,7 @@ def initialize_agent_safely(context):
             ),
             Tool(
                 name="PlaceOrderTool",
-                func=lambda x: OrderManager.handle_order_response(OrderManager.place_order(x)),
+                func=place_order_tool,
                 description="""Place an order with Neo Cafe. Expects either a JSON string or natural language order description.
                             IMPORTANT: You must gather all the required details before placing an order:
                             1. Items to order (what food/drinks)
@@ -2821,13 +3019,13 @@ If in floating chat mode, keep responses brief and focused."""
         
         # Initialize LLM with error handling
         try:
-            llm = ChatOpenAI(temperature=0.7, model="gpt-4o")
+            llm = ChatOpenAI(temperature=0.7, model="gpt-4o", streaming=True)
             logger.debug("LLM initialized successfully")
         except Exception as llm_err:
             logger.error(f"Error initializing LLM: {llm_err}")
             # Fallback to older model or simpler configuration
             try:
-                llm = ChatOpenAI(temperature=0.7, model="gpt-3.5-turbo")
+                llm = ChatOpenAI(temperature=0.7, model="gpt-3.5-turbo", streaming=True)
                 logger.debug("Fallback LLM initialized")
             except Exception as fallback_err:
                 logger.error(f"Fallback LLM also failed: {fallback_err}")
@@ -2869,9 +3067,12 @@ def setup_langchain_agent(context):
     Returns:
         object: Initialized LangChain agent.
     """
+    if CHAT_AGENT == "fake":
+        return fake_agent()
+
     try:
-        # Create knowledge base
-        vector_store = create_knowledge_base()
+        # Shared knowledge base, built once per process
+        vector_store = get_knowledge_base()
         cl.user_session.set("vector_store", vector_store)
         
         # Initialize memory
@@ -2908,7 +3109,7 @@ def setup_langchain_agent(context):
             ),
             Tool(
                 name="PlaceOrderTool",
-                func=lambda x: OrderManager.handle_order_response(OrderManager.place_order(x)),
+                func=place_order_tool,
                 description="""Place an order with Neo Cafe. Expects either a JSON string or natural language order description.
                             IMPORTANT: You must gather all the required details before placing an order:
                             1. Items to order (what food/drinks)
@@ -2992,7 +3193,7 @@ If in floating chat mode, keep responses brief and focused."""
         custom_prefix = system_message
         
         # Initialize LLM
-        llm = ChatOpenAI(temperature=0.7, model="gpt-4o")
+        llm = ChatOpenAI(temperature=0.7, model="gpt-4o", streaming=True)
         memory = ConversationBufferMemory(
             memory_key="chat_history",
             return_messages=True,
@@ -3052,84 +3253,9 @@ def get_personalized_welcome(context):
 @cl.on_chat_start
 async def start():
     """Initialize chat session with persistent user data"""
-    # Check robot API connection
-    # Add this to the @cl.on_chat_start function, where the robot API is initialized
-
-    # Check robot API connection
-    try:
-        print("\n" + "="*80)
-        print("INITIALIZING ROBOT DELIVERY SYSTEM")
-        print(f"TIMESTAMP: {datetime.now().isoformat()}")
-        print("="*80)
-        
-        # Log startup check
-        log_robot_api_activity(
-            action="robot_system_initialization",
-            status="initiated",
-            message="Starting robot delivery system initialization at chat start",
-            call_chain="on_chat_start"
-        )
-        
-        robot_api_available = check_robot_api_connection()
-        if robot_api_available:
-            logger.debug("Robot API is accessible")
-            
-            # Log available status
-            log_robot_api_activity(
-                action="robot_system_available",
-                status="success",
-                message="Robot API is accessible during startup",
-                call_chain="on_chat_start"
-            )
-            
-            # Try a test API call
-            test_result = send_robot_delivery_request(
-                order_id="STARTUP-TEST",
-                delivery_location="API Verification Test"
-            )
-            logger.debug(f"Robot API test call result: {test_result.get('status', 'unknown')}")
-            print(f"ROBOT API INITIALIZATION RESULT: {'SUCCESS' if test_result.get('status') == 'success' else 'FAILED'}")
-            print(f"ROBOT API STATUS: {test_result.get('status', 'unknown')}")
-            print(f"ROBOT API MESSAGE: {test_result.get('message', 'None')}")
-            
-            # Log test result
-            log_robot_api_activity(
-                action="robot_system_test_call",
-                order_id="STARTUP-TEST",
-                delivery_location="API Verification Test",
-                status=test_result.get('status', 'unknown'),
-                message=f"Startup test call result: {test_result.get('message', 'None')}",
-                call_chain="on_chat_start",
-                response=test_result
-            )
-        else:
-            logger.warning("Warning: Robot API is not accessible")
-            print("ROBOT API INITIALIZATION: FAILED - API not accessible")
-            
-            # Log not available status
-            log_robot_api_activity(
-                action="robot_system_unavailable",
-                status="error",
-                message="Robot API is not accessible during startup",
-                call_chain="on_chat_start"
-            )
-        
-        print("="*80 + "\n")
-    except Exception as e:
-        logger.error(f"Error checking robot API connection: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        print(f"ROBOT API INITIALIZATION ERROR: {str(e)}")
-        print("="*80 + "\n")
-        
-        # Log initialization error
-        log_robot_api_activity(
-            action="robot_system_initialization_error",
-            status="error",
-            message=f"Error during robot system initialization: {str(e)}",
-            call_chain="on_chat_start",
-            exception=e
-        )
+    # Robot API availability comes from the process-wide health monitor,
+    # sessions never probe the API themselves
+    robot_health.ensure_started()
     
     # Get URL query parameters
     try:
@@ -3299,35 +3425,10 @@ async def process_message(message, message_id=None, source=None):
             print("Processing verification response for order")
             order_so_far = order_in_progress.get("order_so_far", {})
             msg_lower = message.lower()
-
-            # Enhanced list of confirmation phrases for better recognition
-            finalize_phrases = [
-                "that's all", "thats all", "nothing else", "finalize", "place order",
-                "confirm", "that is all", "looks good", "proceed", "yes", "complete",
-                "finish", "done", "good to go", "fine", "perfect", "correct", "ok", 
-                "okay", "sure", "yeah", "yep", "sounds good", "just that", "that's it",
-                "that looks right", "place my order", "go ahead", "that's correct",
-                "that will be it", "that will be all", "finalize it", "that'll be it",
-                "confirm it", "confirmation", "order it", "submit", "send it", "order now"
-            ]
-            
-            # Phrases indicating the user wants to add more items
-            add_more_phrases = [
-                "add", "also", "more", "another", "additional", "extra", "include", 
-                "plus", "and", "with", "get", "want", "like", "would like", "i'd like",
-                "include", "put in", "throw in", "add on", "as well"
-            ]
-            
-            # Phrases indicating the user wants to cancel the order
-            cancel_phrases = [
-                "cancel", "never mind", "nevermind", "stop", "forget it", "don't want",
-                "dont want", "remove", "delete", "clear", "no", "nope", "cancel order",
-                "abandon", "scrap", "discard", "start over", "start again", "reset"
-            ]
+            phrases = scan_order_phrases(msg_lower)
 
             # Check if user wants to cancel the order
-            if any(phrase in msg_lower for phrase in cancel_phrases) and not any(
-                phrase in msg_lower for phrase in add_more_phrases + finalize_phrases):
+            if phrases.has("cancel") and not (phrases.has("add_more") or phrases.has("finalize")):
                 # Clear order in progress
                 cl.user_session.set("order_in_progress", None)
                 
@@ -3336,7 +3437,7 @@ async def process_message(message, message_id=None, source=None):
                 return
 
             # Check if user is confirming the order without additions
-            if any(phrase in msg_lower for phrase in finalize_phrases) and not any(phrase in msg_lower for phrase in add_more_phrases):
+            if phrases.has("finalize") and not phrases.has("add_more"):
                 # Mark order as verified before finalizing
                 order_so_far["verification_complete"] = True
                 
@@ -3345,10 +3446,10 @@ async def process_message(message, message_id=None, source=None):
                     await cl.Message(content="Processing your order...").send()
                     
                     # Ensure the total is properly calculated and update UI
-                    update_chat_ui_with_order(order_so_far)
+                    await update_chat_ui_with_order(order_so_far)
                     
                     # Process the finalized order
-                    response = OrderManager.place_order(order_so_far)
+                    response = await cl.make_async(OrderManager.place_order)(order_so_far)
                     cl.user_session.set("order_in_progress", None)
                     user_message = OrderManager.handle_order_response(response)
                     track_message(user_message, is_user=False)
@@ -3370,7 +3471,7 @@ async def process_message(message, message_id=None, source=None):
                             "verification_complete": True
                         }
                         # Process this simpler order
-                        response = OrderManager.place_order(simple_order)
+                        response = await cl.make_async(OrderManager.place_order)(simple_order)
                         cl.user_session.set("order_in_progress", None)
                         user_message = OrderManager.handle_order_response(response)
                         track_message(user_message, is_user=False)
@@ -3381,14 +3482,15 @@ async def process_message(message, message_id=None, source=None):
                     return
 
             # Check if user wants to add more items
-            elif any(phrase in msg_lower for phrase in add_more_phrases):
+            elif phrases.has("add_more"):
                 try:
                     # Find additional items
                     additional_items = []
+                    mentioned_ids = set(phrases.values("menu_item"))
                     
                     for menu_item in menu_items:
                         item_name_lower = menu_item["name"].lower()
-                        if item_name_lower in msg_lower:
+                        if menu_item["id"] in mentioned_ids:
                             quantity = 1
                             for i in range(1, 10):
                                 if f"{i} {item_name_lower}" in msg_lower or f"{i}{item_name_lower}" in msg_lower:
@@ -3404,7 +3506,7 @@ async def process_message(message, message_id=None, source=None):
                     if additional_items:
                         # Add items to the order
                         order_so_far["items"].extend(additional_items)
-                        updated_response = OrderManager.place_order(order_so_far)
+                        updated_response = await cl.make_async(OrderManager.place_order)(order_so_far)
                         cl.user_session.set("order_in_progress", updated_response)
                         user_message = OrderManager.handle_order_response(updated_response)
                         track_message(user_message, is_user=False)
@@ -3422,121 +3524,31 @@ async def process_message(message, message_id=None, source=None):
                 await cl.Message(content="I'm not sure what you'd like to do. Would you like to add more items to your order, confirm it as is, or cancel the order?").send()
                 return
         
-        # Handle other missing fields
-        missing_field = order_in_progress.get("missing_field", "")
-        order_so_far = order_in_progress.get("order_so_far", {})
-
-        if missing_field == "delivery_type":
-            # Update the delivery type based on user response
-            delivery_type = ""
-            msg_lower = message.lower()
-            
-            # Enhanced detection of delivery type
-            if any(term in msg_lower for term in ["dine", "dine in", "dine-in", "eat in", "table", "sit", "dining", "restaurant"]):
-                delivery_type = "dine-in"
-            elif any(term in msg_lower for term in ["pickup", "pick up", "pick-up", "take out", "takeout", "take-out", "collect", "to go"]):
-                delivery_type = "pickup"
-            elif any(term in msg_lower for term in ["delivery", "deliver", "send", "bring", "ship", "transport"]):
-                delivery_type = "delivery"
-
-            if delivery_type:
-                order_so_far["delivery_type"] = delivery_type
-                response = OrderManager.place_order(order_so_far)
-                if response.get("status") == "incomplete":
-                    cl.user_session.set("order_in_progress", response)
-                else:
-                    cl.user_session.set("order_in_progress", None)
-                user_message = OrderManager.handle_order_response(response)
-                track_message(user_message, is_user=False)
-                await cl.Message(content=user_message).send()
-                return
-
-        elif missing_field == "delivery_location":
-            # Update the delivery location based on user response
-            if order_so_far.get("delivery_type") == "delivery":
-                order_so_far["delivery_location"] = message.strip()
-                print(f"Set delivery address: {message.strip()}")
-            else:
-                # For dine-in: Better table number extraction
-                if "table" in message.lower():
-                    table_parts = message.lower().split("table")
-                    if len(table_parts) > 1:
-                        # Extract the first number after "table"
-                        import re
-                        number_match = re.search(r'\d+', table_parts[1])
-                        if number_match:
-                            table_number = number_match.group()
-                            order_so_far["delivery_location"] = f"Table {table_number}"
-                            print(f"Extracted table number from message: {order_so_far['delivery_location']}")
-                        else:
-                            # Use raw message if extraction fails
-                            order_so_far["delivery_location"] = message.strip()
-                    else:
-                        # Use raw message if no table parts
-                        order_so_far["delivery_location"] = message.strip()
-                else:
-                    # Better handling of numeric input
-                    # First check if the message contains only digits
-                    digits_only = ''.join(c for c in message if c.isdigit())
-                    if digits_only and len(digits_only) <= 3:  # Reasonable table number
-                        order_so_far["delivery_location"] = f"Table {digits_only}"
-                        print(f"Interpreted as table number: {order_so_far['delivery_location']}")
-                    else:
-                        order_so_far["delivery_location"] = message.strip()
-
-            # Try to continue the order processing
-            response = OrderManager.place_order(order_so_far)
-            
-            # Update order state based on response
-            if response.get("status") == "incomplete":
-                cl.user_session.set("order_in_progress", response)
-            else:
-                # Clear order progress if completed or error
-                cl.user_session.set("order_in_progress", None)
-            
-            # Prepare and send response message
-            user_message = OrderManager.handle_order_response(response)
-            track_message(user_message, is_user=False)
-            await cl.Message(content=user_message).send()
-            return
-            
-        elif missing_field == "payment_method":
-            # Update the payment method based on user response - improved detection
-            payment_method = ""
-            msg_lower = message.lower()
-            
-            if any(term in msg_lower for term in ["credit", "card", "visa", "mastercard", "credit card", "debit", "amex", "american express"]):
-                payment_method = "Credit Card"
-            elif any(term in msg_lower for term in ["cash", "money", "notes", "bills", "currency", "dollar", "pay with cash"]):
-                payment_method = "Cash"
-            elif any(term in msg_lower for term in ["mobile", "phone", "apple pay", "google pay", "mobile payment", "venmo", "paypal", "electronic"]):
-                payment_method = "Mobile Payment"
-            else:
-                # Default to Credit Card for unrecognized payment methods
-                payment_method = "Credit Card"
-                print(f"Unrecognized payment method '{message}', defaulting to Credit Card")
-            
-            # Update the order
-            order_so_far["payment_method"] = payment_method
-            
-            # Try to complete the order
-            response = OrderManager.place_order(order_so_far)
-            
-            # Check if order is actually complete now
-            if response.get("status") == "incomplete":
-                # Order still has missing fields
-                cl.user_session.set("order_in_progress", response)
-            else:
-                # Order is complete or there was an error - either way, end the order flow
-                cl.user_session.set("order_in_progress", None)
-            
-            # Send the response
-            user_message = OrderManager.handle_order_response(response)
-            track_message(user_message, is_user=False)
-            await cl.Message(content=user_message).send()
+        # Fill the missing fields from the answer; the LLM is only asked if parsing fails
+        if await handle_order_slot_turn(order_in_progress, message):
             return
     
     # If we got here, either there's no order in progress or we didn't handle it directly
+    # Answer simple questions locally before involving the agent
+    route, fast_response = intent_router.route(message)
+    if route:
+        print(f"Fast path '{route}' answered the message")
+        track_message(fast_response, is_user=False)
+        await cl.Message(content=fast_response).send()
+        return
+    
+    # Reuse the agent's answer to a question asked before, for the same menu and knowledge base
+    cacheable = is_cacheable_question(message)
+    if cacheable:
+        cache_start = time.perf_counter()
+        cache_version, cache_audience = response_cache_scope(context)
+        cached_response, cache_kind = response_cache.get(message, cache_version, cache_audience)
+        if cached_response:
+            intent_router.record(f"response_cache_{cache_kind}", time.perf_counter() - cache_start)
+            track_message(cached_response, is_user=False)
+            await cl.Message(content=cached_response).send()
+            return
+    
     # Get the agent, if available
     agent = cl.user_session.get("agent")
     
@@ -3549,6 +3561,7 @@ async def process_message(message, message_id=None, source=None):
             print("Agent successfully reinitialized")
         else:
             print("Could not initialize agent, using fallback response")
+            intent_router.record("agent_unavailable")
             await cl.Message(content="I'm having trouble connecting to my knowledge base. Let me try to answer your question more directly.").send()
             
             # Provide a simple fallback response
@@ -3590,51 +3603,36 @@ async def process_message(message, message_id=None, source=None):
                 "items": order_items,
                 "delivery_type": delivery_type
             }
-            response = OrderManager.place_order(order_data)
+            response = await cl.make_async(OrderManager.place_order)(order_data)
             cl.user_session.set("order_in_progress", response)
             response_msg = OrderManager.handle_order_response(response)
             track_message(response_msg, is_user=False)
             await cl.Message(content=response_msg).send()
+            intent_router.record("direct_order")
             return
         except Exception as direct_err:
             print(f"Direct order handling failed: {direct_err}")
             # Fall through to agent processing
     
-    # Direct tool access for common patterns
-    if "status" in message.lower() and "order" in message.lower():
-        # Try to extract an order ID and directly call GetOrderStatusTool
-        import re
-        order_id_match = re.search(r'(ORD-[A-Za-z0-9]+)', message, re.IGNORECASE)
-        if order_id_match:
-            order_id = order_id_match.group(0).upper()
-            print(f"Directly calling GetOrderStatusTool with order_id: {order_id}")
-            try:
-                status_result = OrderManager.get_order_status(order_id)
-                await cl.Message(content=status_result).send()
-                track_message(status_result, is_user=False)
-                return
-            except Exception as tool_err:
-                print(f"Direct tool call error: {tool_err}")
-                # Fall through to normal agent flow
-    
+    # Direct tool access for common patterns (order status is on the fast path)
     if "deliver" in message.lower() and "robot" in message.lower():
         # Try to extract order ID for robot delivery
-        import re
-        order_id_match = re.search(r'(ORD-[A-Za-z0-9]+)', message, re.IGNORECASE)
+        order_id_match = ORDER_ID_PATTERN.search(message)
         if order_id_match:
             order_id = order_id_match.group(0).upper()
             # Try to extract delivery location
-            location_match = re.search(r'to\s+(.+?)(?:\.|\?|$)', message)
+            location_match = DELIVERY_DESTINATION_PATTERN.search(message)
             if location_match:
                 delivery_location = location_match.group(1).strip()
                 print(f"Directly calling RobotDeliveryTool with order_id: {order_id}, location: {delivery_location}")
                 try:
-                    delivery_result = send_robot_delivery_request(
+                    delivery_result = await send_robot_delivery_request(
                         order_id=order_id,
                         delivery_location=delivery_location
                     )
                     await cl.Message(content=f"🤖 Robot delivery has been dispatched for order {order_id} to {delivery_location}. The robot is on its way!").send()
                     track_message(f"Robot delivery dispatched for order {order_id}.", is_user=False)
+                    intent_router.record("direct_robot_delivery")
                     return
                 except Exception as tool_err:
                     print(f"Direct tool call error: {tool_err}")
@@ -3643,69 +3641,22 @@ async def process_message(message, message_id=None, source=None):
     try:
         # Use the agent to process the message
         from concurrent.futures import TimeoutError
-        import asyncio
         
         try:
-            # Try to get a response with a timeout - Use the original approach from the first code
+            # Stream the response as it is generated, with a timeout
             print(f"Processing message with agent.run, input: {message}")
-            response = await asyncio.wait_for(
-                cl.make_async(agent.run)(message),
-                timeout=30  # 30 second timeout
-            )
+            agent_start = time.perf_counter()
+            try:
+                response = await run_agent_streaming(agent, message, timeout=30)
+            finally:
+                intent_router.record("agent", time.perf_counter() - agent_start)
             
-            # Check if this is an order response
-            if "incomplete" in response.lower() and any(phrase in response.lower() for phrase in 
-                ["dine-in, pickup, or delivery", "table number", "delivery address", "payment method"]):
-                
-                # Try to extract order info
-                order_in_progress = None
-                
-                if "dine-in, pickup, or delivery" in response.lower():
-                    order_in_progress = {
-                        "status": "incomplete",
-                        "missing_field": "delivery_type",
-                        "order_so_far": {"items": parse_items_from_response(response)}
-                    }
-                elif "table number" in response.lower():
-                    order_in_progress = {
-                        "status": "incomplete",
-                        "missing_field": "delivery_location",
-                        "order_so_far": {
-                            "items": parse_items_from_response(response),
-                            "delivery_type": "dine-in"
-                        }
-                    }
-                elif "delivery address" in response.lower():
-                    order_in_progress = {
-                        "status": "incomplete",
-                        "missing_field": "delivery_location",
-                        "order_so_far": {
-                            "items": parse_items_from_response(response),
-                            "delivery_type": "delivery"
-                        }
-                    }
-                elif "payment method" in response.lower():
-                    # Extract order details from response
-                    items = parse_items_from_response(response)
-                    delivery_type = parse_delivery_type(response)
-                    delivery_location = parse_delivery_location(response)
-                    
-                    order_in_progress = {
-                        "status": "incomplete",
-                        "missing_field": "payment_method",
-                        "order_so_far": {
-                            "items": items,
-                            "delivery_type": delivery_type,
-                            "delivery_location": delivery_location
-                        }
-                    }
-                
-                if order_in_progress:
-                    cl.user_session.set("order_in_progress", order_in_progress)
+            # Cache the answer unless the agent started an order on the way
+            if cacheable and not cl.user_session.get("order_in_progress") and "Agent stopped" not in response:
+                response_cache.put(message, cache_version, response, cache_audience)
             
-            # Track and send the response
+            # Track the response, already sent while streaming
             track_message(response, is_user=False)
-            await cl.Message(content=response).send()
             
         except TimeoutError:
             print("Agent response timed out")
@@ -3743,7 +3694,7 @@ async def process_message(message, message_id=None, source=None):
                 
                 if order_items:
                     # Process order
-                    response = OrderManager.place_order({"items": order_items})
+                    response = await cl.make_async(OrderManager.place_order)({"items": order_items})
                     response_msg = OrderManager.handle_order_response(response)
                     cl.user_session.set("order_in_progress", response)
                     track_message(response_msg, is_user=False)
@@ -4361,188 +4312,6 @@ def update_user_session_field(user_id, field, value):
         return False
     
 
-def parse_items_from_response(response):
-    """
-    Extract order items mentioned in a response with improved recognition.
-    
-    Args:
-        response (str): The agent's response text
-        
-    Returns:
-        list: List of item dictionaries
-    """
-    items = []
-    
-    # Convert response to lowercase for case-insensitive matching
-    response_lower = response.lower()
-    
-    # First, handle the special case of "classic latte" (or other classic items)
-    if "classic" in response_lower:
-        for menu_item in menu_items:
-            item_name_lower = menu_item["name"].lower()
-            if "latte" == item_name_lower and "classic latte" in response_lower:
-                # Found a classic latte reference
-                items.append({
-                    "item_id": menu_item["id"],
-                    "quantity": 1,
-                    "special_instructions": "Classic style"
-                })
-                print(f"Found classic version of: {menu_item['name']}")
-                # Continue searching for other items
-    
-    # Now do the regular item search for any items not handled by the classic case
-    for menu_item in menu_items:
-        item_name_lower = menu_item["name"].lower()
-        
-        # Skip if we already added this item as a "classic" version
-        if item_name_lower == "latte" and any(item["item_id"] == menu_item["id"] for item in items):
-            continue
-            
-        # Try different variations of the item name
-        variations = [
-            item_name_lower,
-            item_name_lower.replace(" ", ""),
-            item_name_lower + "s",  # plural form
-        ]
-        
-        found = False
-        for variation in variations:
-            if variation in response_lower:
-                found = True
-                break
-                
-        if found:
-            # Try to extract quantity
-            quantity = 1
-            
-            # Look for numeric quantities near the item name
-            import re
-            quantity_matches = re.findall(r'(\d+)\s*(?:x\s*)?(?:' + re.escape(item_name_lower) + r')', response_lower)
-            if quantity_matches:
-                try:
-                    quantity = int(quantity_matches[0])
-                except:
-                    pass
-            
-            # Add the item
-            items.append({
-                "item_id": menu_item["id"],
-                "quantity": quantity,
-                "special_instructions": ""
-            })
-            print(f"Extracted item from response: {menu_item['name']}, quantity: {quantity}")
-    
-    if not items:
-        # Default item if we couldn't find any
-        print("No items found in response, using default item")
-        if menu_items and len(menu_items) > 0:
-            # Try to find a latte as default if mentioned
-            if "latte" in response_lower:
-                for menu_item in menu_items:
-                    if menu_item["name"].lower() == "latte":
-                        items.append({
-                            "item_id": menu_item["id"],
-                            "quantity": 1,
-                            "special_instructions": ""
-                        })
-                        break
-            # Otherwise use first menu item
-            if not items:
-                items.append({
-                    "item_id": menu_items[0]["id"],
-                    "quantity": 1,
-                    "special_instructions": ""
-                })
-        else:
-            # Fallback if menu_items is empty
-            items.append({
-                "item_id": 1,  # Assuming ID 1 is a valid item
-                "quantity": 1,
-                "special_instructions": ""
-            })
-    
-    return items
-
-def parse_delivery_type(response):
-    """
-    Extract delivery type from a response with improved recognition.
-    
-    Args:
-        response (str): The agent's response text
-        
-    Returns:
-        str: Detected delivery type
-    """
-    response_lower = response.lower()
-    
-    # Enhanced dictionary of delivery type keywords
-    delivery_types = {
-        "dine-in": ["dine-in", "dine in", "dining", "table", "sit", "restaurant", "eating in"],
-        "pickup": ["pickup", "pick up", "pick-up", "takeout", "take out", "take-out", "to go", "collect"],
-        "delivery": ["delivery", "deliver", "delivered", "bringing", "send to", "bring to", "bringing to"]
-    }
-    
-    # Check for each type
-    for dtype, keywords in delivery_types.items():
-        if any(keyword in response_lower for keyword in keywords):
-            return dtype
-    
-    # Look for strong indicators through context
-    if "table number" in response_lower or "which table" in response_lower:
-        return "dine-in"
-    elif "pickup counter" in response_lower or "counter" in response_lower:
-        return "pickup"
-    elif "address" in response_lower or "location" in response_lower:
-        return "delivery"
-    
-    return "dine-in"  # Default
-
-def parse_delivery_location(response):
-    """
-    Extract delivery location from a response with improved extraction.
-    
-    Args:
-        response (str): The agent's response text
-        
-    Returns:
-        str: Detected delivery location
-    """
-    response_lower = response.lower()
-    
-    # Check if this is a dine-in order
-    if "table" in response_lower:
-        # Try to extract table number using regex
-        import re
-        table_matches = re.findall(r'table\s*(\d+)', response_lower)
-        if table_matches:
-            return f"Table {table_matches[0]}"
-        
-        # Try to find any number after "table"
-        words = response_lower.split()
-        for i, word in enumerate(words):
-            if word == "table" and i+1 < len(words) and words[i+1].isdigit():
-                return f"Table {words[i+1]}"
-    
-    # Check if this is a delivery order
-    elif "address" in response_lower or "deliver to" in response_lower:
-        # Try to extract an address
-        import re
-        # Look for common address patterns
-        address_pattern = r'(\d+\s+[a-zA-Z\s]+(?:street|st|avenue|ave|road|rd|drive|dr|lane|ln|place|pl|blvd))'
-        address_matches = re.findall(address_pattern, response_lower, re.IGNORECASE)
-        if address_matches:
-            return address_matches[0].capitalize()
-    
-    # Default values based on likely order type
-    if "dine-in" in response_lower or "table" in response_lower:
-        return "Table 1"  # Default table
-    elif "delivery" in response_lower:
-        return "Address needed"  # Placeholder for delivery
-    elif "pickup" in response_lower or "take" in response_lower:
-        return "Pickup Counter"  # Default for pickup
-    
-    return "Table 1"  # Default
-
 def validate_menu_data(data: list):
     """Updated validation for menu items"""
     required = ['id', 'name', 'price', 'category']
@@ -4658,10 +4427,28 @@ def get_persisted_auth():
     return str(uuid.uuid4()), "guest", {}, False
 
 
-def update_chat_ui_with_order(order_data):
+def emit_order_via_socketio(order_data, cart_update):
+    """
+    Send an order update and a cart update to the dashboard over Socket.IO
+    
+    Args:
+        order_data (dict): Order data
+        cart_update (dict): Cart update for the dashboard cart
+    """
+    import socketio
+    sio = socketio.Client()
+    sio.connect(DASHBOARD_URL)
+    # Send both general order update and specific cart update
+    print(f"Sending via Socket.IO. order_data total: {order_data.get('total')}")
+    sio.emit('order_update', order_data)
+    sio.emit('cart_update', cart_update)
+    sio.disconnect()
+
+async def update_chat_ui_with_order(order_data):
     """
     Helper function to update the chat UI with current order data.
-    Uses the exact structure from the original code.
+    Uses the exact structure from the original code. Sync code running in a
+    worker thread calls it through cl.run_sync.
     
     Args:
         order_data (dict): Order data to display
@@ -4709,14 +4496,8 @@ def update_chat_ui_with_order(order_data):
         
         # METHOD 1: Try Socket.IO first
         try:
-            import socketio
-            sio = socketio.Client()
-            sio.connect(DASHBOARD_URL)
-            # Send both general order update and specific cart update
-            print(f"Sending via Socket.IO. order_data total: {order_data.get('total')}")
-            sio.emit('order_update', order_data)
-            sio.emit('cart_update', cart_update)
-            sio.disconnect()
+            # The Socket.IO client blocks, so run it off the event loop
+            await cl.make_async(emit_order_via_socketio)(order_data, cart_update)
             print("Order sent via Socket.IO")
         except Exception as e:
             print(f"Error sending order via Socket.IO: {e}")
@@ -4745,17 +4526,17 @@ def update_chat_ui_with_order(order_data):
         # METHOD 3: Try REST API approach as a fallback
         try:
             # Call the place-order API endpoint
-            order_response = requests.post(
-                f"{DASHBOARD_URL}/api/place-order", 
-                json=order_data,
-                timeout=5
+            order_response = await async_http_client.post(
+                f"{DASHBOARD_URL}/api/place-order",
+                endpoint="dashboard.api",
+                json=order_data
             )
             
             # Call the update-cart API endpoint
-            cart_response = requests.post(
-                f"{DASHBOARD_URL}/api/update-cart", 
-                json=cart_update,
-                timeout=5
+            cart_response = await async_http_client.post(
+                f"{DASHBOARD_URL}/api/update-cart",
+                endpoint="dashboard.api",
+                json=cart_update
             )
             
             if order_response.status_code == 200 or cart_response.status_code == 200:
@@ -4929,7 +4710,7 @@ def handle_robot_delivery_request(order_info_str):
         
         # Call the robot delivery API
         print(f"Calling robot delivery API for order {order_id} to {delivery_location}")
-        result = send_robot_delivery_request(order_id, delivery_location)
+        result = cl.run_sync(send_robot_delivery_request(order_id, delivery_location))
         print(f"Robot API call result: {result}")
         
         if result.get("status") == "success":
@@ -5118,7 +4899,7 @@ def request_robot_delivery(order_info_str):
             
         # Call our consolidated robot delivery function
         print(f"Calling robot delivery API for order {order_id} to {delivery_location}")
-        result = send_robot_delivery_request(order_id, delivery_location)
+        result = cl.run_sync(send_robot_delivery_request(order_id, delivery_location))
         print(f"Robot API call result: {result}")
         
         # Process results and update status...
@@ -5310,7 +5091,7 @@ def request_robot_delivery(order_info_str):
             
         # Call our consolidated robot delivery function
         print(f"Calling robot delivery API for order {order_id} to {delivery_location}")
-        result = send_robot_delivery_request(order_id, delivery_location)
+        result = cl.run_sync(send_robot_delivery_request(order_id, delivery_location))
         print(f"Robot API call result: {result}")
         
         if result.get("status") == "success":
@@ -5392,4 +5173,9 @@ async def set_starters():
             description="Check store schedule"
         )
 
-    ]
\ No newline at end of file
+    ]
+# Load or build the shared knowledge base at startup instead of on the first chat
+try:
+    get_knowledge_base()
+except Exception as e:
+    print(f"Error preparing knowledge base: {e}")
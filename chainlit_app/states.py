@@ -3,13 +3,20 @@
 """
 State management classes for Neo Cafe chatbot
 """
-import time
-import requests
+import sys
 from datetime import datetime
 import os
 import uuid
 from typing import List, Dict, Optional, Any
 
+# Repository root first on the path, so "app" is the app package and not
+# chainlit_app/app.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.ids import new_order_id
+from app.utils import http_client
+from app.utils.async_robot_client import AsyncRobotClient
+
 # Import voice processing libraries if available
 try:
     import speech_recognition as sr
@@ -201,18 +208,17 @@ class OrderState:
             return "Your order is empty. Please add items before confirming."
         
         # Generate order ID
-        timestamp = int(time.time())
-        self.order_id = f"ORD-{timestamp}"
+        self.order_id = new_order_id()
         self.order_confirmed = True
         
         # Try to send order to main app
         try:
             order_data = self.get_order_data()
             
-            response = requests.post(
+            response = http_client.post(
                 f"{DASHBOARD_URL}/api/place-order",
-                json=order_data,
-                timeout=5
+                endpoint="dashboard.api",
+                json=order_data
             )
             
             if response.status_code == 200:
@@ -271,8 +277,9 @@ class RobotState:
         self.status = "idle"  # idle, busy, maintenance
         self.battery_level = 100
         self.location = {"lat": 0, "lng": 0}
+        self.robot_client = AsyncRobotClient(ROBOT_SIMULATOR_URL)
     
-    def get_status(self, order_id=None):
+    async def get_status(self, order_id=None):
         """
         Get robot status for an order or general status
         
@@ -285,19 +292,13 @@ class RobotState:
         # Try to get status from robot simulator
         try:
             if order_id:
-                response = requests.get(
-                    f"{ROBOT_SIMULATOR_URL}/api/delivery/{order_id}",
-                    timeout=3
-                )
+                response = await self.robot_client.get_delivery(order_id)
                 
                 if response.status_code == 200:
                     return response.json()
             
             # Get general robot status
-            response = requests.get(
-                f"{ROBOT_SIMULATOR_URL}/api/status",
-                timeout=3
-            )
+            response = await self.robot_client.get_status()
             
             if response.status_code == 200:
                 robot_data = response.json()
@@ -321,7 +322,7 @@ class RobotState:
             "active_deliveries": len(self.active_deliveries)
         }
     
-    def format_status_message(self, order_id=None):
+    async def format_status_message(self, order_id=None):
         """
         Format robot status message
         
@@ -331,7 +332,7 @@ class RobotState:
         Returns:
             str: Formatted status message
         """
-        status_data = self.get_status(order_id)
+        status_data = await self.get_status(order_id)
         
         if order_id:
             # Order-specific status
@@ -4,10 +4,11 @@ import uuid
 from flask import Flask, render_template, redirect, session, request, jsonify
 from datetime import datetime
 import time
-import requests
 import os
 from flask_socketio import SocketIO, emit
 import json
+from app.utils.event_sequence import stamp_event, strip_event_stamp
+from app.utils import http_client
 
 # Error handler for Socket.IO
 def handle_socketio_error(e):
@@ -106,16 +107,22 @@ def configure_server(server, socketio):
             
             # Check if the request was successful
             if result.get('status') == 'success':
-                return jsonify({
+                response = {
                     'status': 'success',
                     'data': result.get('data', {})
-                })
+                }
+                if result.get('stale'):
+                    # Robot API is unavailable, this is the last good status
+                    response['stale'] = True
+                    response['stale_seconds'] = result.get('stale_seconds')
+                return jsonify(response)
             else:
                 return jsonify({
                     'status': 'error',
                     'message': result.get('error', 'Unknown error'),
-                    'details': result.get('details', '')
-                }), 500
+                    'details': result.get('details', ''),
+                    'circuit_open': result.get('circuit_open', False)
+                }), 503 if result.get('circuit_open') else 500
         
         except Exception as e:
             print(f"Error in robot delivery status API: {str(e)}")
@@ -201,7 +208,7 @@ def configure_server(server, socketio):
                 print(f"Delivery type from Chainlit: {data['delivery_type']}")
             
             # Broadcast the cart update to all clients
-            socketio.emit('cart_update', data)
+            socketio.emit('cart_update', stamp_event('cart_update', data))
             
             # Return success
             return {"status": "success", "message": "Cart update broadcast successfully"}
@@ -215,7 +222,7 @@ def configure_server(server, socketio):
         try:
             # Try to ping the chainlit server
             chainlit_url = os.environ.get('CHAINLIT_URL', 'http://localhost:8000')
-            response = requests.get(f"{chainlit_url}/ping", timeout=2)
+            response = http_client.get(f"{chainlit_url}/ping", endpoint="chainlit.ping")
             
             if response.ok:
                 return jsonify({
@@ -266,6 +273,30 @@ def configure_server(server, socketio):
             'time': str(datetime.now())
         })
     
+    @server.route('/api/circuit-breakers', methods=['GET'])
+    def api_circuit_breakers():
+        """API endpoint to inspect the circuit breakers around external services"""
+        # Import the robot API utility so its breaker is registered
+        import app.utils.robot_api_utils
+        from app.utils.circuit_breaker import all_breakers
+        
+        return jsonify({
+            'status': 'success',
+            'breakers': all_breakers(),
+            'time': str(datetime.now())
+        })
+    
+    @server.route('/api/outbound-stats', methods=['GET'])
+    def api_outbound_stats():
+        """API endpoint with attempt counts and latencies of outbound HTTP calls"""
+        from app.utils.resilience import stats
+        
+        return jsonify({
+            'status': 'success',
+            'endpoints': stats.snapshot(),
+            'time': str(datetime.now())
+        })
+    
     # New API endpoints for Chainlit to call back
     
     @server.route('/api/navigate', methods=['POST'])
@@ -304,11 +335,11 @@ def configure_server(server, socketio):
             
             # Generate order ID if not provided
             if 'id' not in order_data:
-                timestamp = int(time.time())
-                order_data['id'] = f"ORD-{timestamp}"
+                from app.utils.ids import new_order_id
+                order_data['id'] = new_order_id()
             
             # Emit socket event with order data
-            socketio.emit('order_update', order_data)
+            socketio.emit('order_update', stamp_event('order_update', order_data))
             
             return jsonify({
                 'status': 'success', 
@@ -559,12 +590,16 @@ def configure_server(server, socketio):
                 print(f"Invalid order data format: {type(data)}")
                 return {"status": "error", "message": "Invalid data format"}
                 
+            # Drop the sequence stamp if a client echoed a broadcast back
+            data = strip_event_stamp(data)
+            
             # Make sure there's an order ID
             if 'id' not in data:
                 print("Order update missing ID")
                 return {"status": "error", "message": "Order ID is required"}
             
             # Store the order in the database if it's a new order or update an existing one
+            # (create_order/update_order also fold the change into the dashboard rollups)
             try:
                 from app.data.database import create_order, update_order
                 
@@ -584,7 +619,7 @@ def configure_server(server, socketio):
                 print(f"Database error: {db_error}")
             
             # Broadcast the order update to all clients
-            socketio.emit('order_update', data)
+            socketio.emit('order_update', stamp_event('order_update', data))
             
             # Also update the hidden div for compatibility with Dash callbacks
             socketio.emit('update_order_status', json.dumps(data))